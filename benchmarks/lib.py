@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    benchmarks/lib.py: Benchmark support library
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+TESTDATA_FLD = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+RESULTS_VERSION = 1
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CORPUS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def get_feeds(data_fld=TESTDATA_FLD):
+    "Names and contents of all plugins.xml feeds, sorted by size"
+
+    fns = sorted(
+        (
+            os.path.join(data_fld, fn)
+            for fn in os.listdir(data_fld)
+            if fn.startswith("plugins_") and fn.endswith(".xml")
+        ),
+        key=os.path.getsize,
+    )
+
+    for fn in fns:
+        with open(fn, "r") as f:
+            yield os.path.basename(fn), f.read()
+
+
+def get_txts(data_fld=TESTDATA_FLD):
+    "Plugin ids and contents of all metadata.txt files"
+
+    for fn in sorted(os.listdir(data_fld)):
+        if not (fn.startswith("metadata_") and fn.endswith(".txt")):
+            continue
+        with open(os.path.join(data_fld, fn), "r") as f:
+            yield fn.split("_", 1)[1].rsplit("_", 1)[0], f.read()
+
+
+def select_feeds(feeds, all_feeds=False):
+    "Smallest, median and largest feed unless all are requested"
+
+    feeds = list(feeds)
+
+    if all_feeds or len(feeds) <= 3:
+        return feeds
+
+    return [feeds[0], feeds[len(feeds) // 2], feeds[-1]]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TIMING
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def measure(func, repeat=5, min_time=0.2):
+    "Times `func`, returns per-call seconds (min, median) and loop count"
+
+    timer = timeit.Timer(func)
+
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# RESULTS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def make_results(results):
+
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "date": datetime.datetime.now().isoformat(),
+            "python": sys.version.split(" ")[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def save_results(fn, results):
+
+    with open(fn, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(fn):
+
+    with open(fn, "r") as f:
+        results = json.load(f)
+
+    if results.get("version", None) != RESULTS_VERSION:
+        raise ValueError(f'"{fn:s}" has an unknown results format')
+
+    return results
+
+
+def compare_results(baseline, current, threshold, key="min"):
+    """
+    Compares per-call minimum times (or other `key`) of cases present in both results
+
+    Returns rows of case name, baseline, current, ratio and regression flag.
+    """
+
+    rows = []
+
+    for name in sorted(current["results"].keys()):
+        if name not in baseline["results"].keys():
+            continue
+        old = baseline["results"][name][key]
+        new = current["results"][name][key]
+        ratio = new / old if old > 0 else float("inf")
+        rows.append((name, old, new, ratio, ratio > 1.0 + threshold))
+
+    return rows
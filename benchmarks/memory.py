@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    benchmarks/memory.py: Memory footprint report over the tests/data corpus
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import argparse
+import sys
+
+from .lib import (
+    TESTDATA_FLD,
+    compare_results,
+    get_feeds,
+    get_txts,
+    load_results,
+    make_results,
+    save_results,
+    select_feeds,
+)
+
+from qgspluginmeta import QgsPluginMetadata, get_footprint, import_xml
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CASES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _txt_metas(data_fld):
+
+    for plugin_id, txt in get_txts(data_fld):
+        try:
+            yield QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+        except ValueError:
+            continue
+
+
+def get_footprints(all_feeds=False, data_fld=TESTDATA_FLD):
+    "Yields tuples of case name and footprint"
+
+    for name, xml in select_feeds(get_feeds(data_fld), all_feeds=all_feeds):
+        yield f"import_xml[{name:s}]", get_footprint(import_xml(xml))
+
+    yield "from_metadatatxt", get_footprint(list(_txt_metas(data_fld)))
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ENTRY POINT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Memory footprint over tests/data")
+    parser.add_argument("-o", "--output", help="write results to JSON file")
+    parser.add_argument("-b", "--baseline", help="compare against results JSON file")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="relative growth flagged as regression (default: 0.05)",
+    )
+    parser.add_argument("-n", "--top", type=int, default=5, help="fields to list")
+    parser.add_argument("--all-feeds", action="store_true", help="not only 3 feeds")
+    parser.add_argument(
+        "-d", "--data", default=TESTDATA_FLD, help="corpus folder (default: tests/data)"
+    )
+    args = parser.parse_args()
+
+    results = {}
+
+    for name, footprint in get_footprints(all_feeds=args.all_feeds, data_fld=args.data):
+        footprint["per_release"] = footprint["total"] / max(footprint["releases"], 1)
+        results[name] = footprint
+        print(
+            f'{name:s}: {footprint["total"] / 2 ** 20:.2f} MiB'
+            f' ({footprint["per_release"]:.0f} bytes/release, {footprint["releases"]:d} releases)'
+        )
+        print(
+            "    "
+            + ", ".join(
+                f"{category:s} {size / footprint['total'] * 100:.0f}%"
+                for category, size in footprint["categories"].items()
+            )
+        )
+        print(
+            "    "
+            + ", ".join(
+                f"{field:s} {size / max(footprint['releases'], 1):.0f}"
+                for field, size in list(footprint["fields"].items())[: args.top]
+            )
+        )
+
+    results = make_results(results)
+
+    if args.output is not None:
+        save_results(args.output, results)
+
+    if args.baseline is None:
+        return
+
+    rows = compare_results(
+        load_results(args.baseline), results, args.threshold, key="per_release"
+    )
+    for name, old, new, ratio, regression in rows:
+        print(
+            f'{"REGRESSION " if regression else "":s}{name:s}: '
+            f"{old:.0f} -> {new:.0f} bytes/release ({ratio:.2f}x)"
+        )
+
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    main()
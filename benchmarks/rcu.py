@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    benchmarks/rcu.py: Stress test: reader threads during repository updates
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import argparse
+import sys
+import threading
+import time
+
+from .lib import (
+    TESTDATA_FLD,
+    compare_results,
+    get_feeds,
+    load_results,
+    make_results,
+    save_results,
+)
+
+from qgspluginmeta import (
+    QgsPluginLatestView,
+    QgsPluginRepository,
+    QgsPluginSharedRepository,
+    import_xml,
+)
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CASES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class _Locked:
+    "Baseline: one lock around reads and the whole rebuild of the repository"
+
+    def __init__(self):
+
+        self._lock = threading.Lock()
+        self._repository = QgsPluginRepository()
+        self._latest = QgsPluginLatestView()
+
+    def read(self, plugin_ids, counts):
+
+        with self._lock:
+            return _check(
+                len(self._repository),
+                counts,
+                [
+                    (
+                        self._repository.releases(plugin_id),
+                        self._latest.latest(plugin_id),
+                    )
+                    for plugin_id in plugin_ids
+                ],
+            )
+
+    def update_xml(self, xml):
+
+        with self._lock:
+            repository = QgsPluginRepository(import_xml(xml))
+            self._latest = repository.attach(QgsPluginLatestView())
+            self._repository = repository
+
+
+class _Shared:
+    "Read-copy-update: readers take the current snapshot, no lock"
+
+    def __init__(self):
+
+        self._shared = QgsPluginSharedRepository()
+        self.update_xml = self._shared.update_xml
+
+    def read(self, plugin_ids, counts):
+
+        snapshot = self._shared.snapshot()
+
+        return _check(
+            len(snapshot),
+            counts,
+            [
+                (snapshot.releases(plugin_id), snapshot.latest(plugin_id))
+                for plugin_id in plugin_ids
+            ],
+        )
+
+
+def _check(size, counts, groups):
+    "Is a read consistent: a known number of releases, latest release among the releases"
+
+    if size not in counts:
+        return False
+
+    return all(latest is None or latest in releases for releases, latest in groups)
+
+
+def _reader(store, plugin_ids, counts, stop, tallies):
+
+    reads = inconsistent = 0
+    while not stop.is_set():
+        if not store.read(plugin_ids, counts):
+            inconsistent += 1
+        reads += 1
+
+    tallies.append((reads, inconsistent))
+
+
+def run(store, feeds, readers, duration):
+    "Readers loop while a writer re-imports the feeds in turn, returns a result dict"
+
+    counts = {0} | {len(import_xml(xml)) for xml in feeds}
+    store.update_xml(feeds[0])
+    plugin_ids = sorted({release["id"].value for release in import_xml(feeds[0])})[:10]
+
+    stop = threading.Event()
+    tallies = []
+    threads = [
+        threading.Thread(
+            target=_reader, args=(store, plugin_ids, counts, stop, tallies)
+        )
+        for _ in range(readers)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    updates = 0
+    while time.perf_counter() - start < duration:
+        store.update_xml(feeds[(updates + 1) % len(feeds)])
+        updates += 1
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    reads = sum(reads for reads, _ in tallies)
+
+    return {
+        "readers": readers,
+        "reads_per_s": reads / elapsed,
+        "per_read": elapsed / max(reads, 1),
+        "updates_per_s": updates / elapsed,
+        "inconsistent": sum(inconsistent for _, inconsistent in tallies),
+    }
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ENTRY POINT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Reader threads while a writer re-imports plugins.xml feeds"
+    )
+    parser.add_argument("-o", "--output", help="write results to JSON file")
+    parser.add_argument("-b", "--baseline", help="compare against results JSON file")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slow-down per read flagged as regression (default: 0.1)",
+    )
+    parser.add_argument("-n", "--readers", type=int, default=8)
+    parser.add_argument("-s", "--seconds", type=float, default=5.0)
+    parser.add_argument(
+        "-d", "--data", default=TESTDATA_FLD, help="corpus folder (default: tests/data)"
+    )
+    args = parser.parse_args()
+
+    feeds = [xml for _, xml in list(get_feeds(args.data))[-2:]]  # two largest
+    results = {}
+
+    for name, store in (("locked", _Locked()), ("rcu", _Shared())):
+        result = run(store, feeds, args.readers, args.seconds)
+        results[name] = result
+        print(
+            f'{name:s}: {result["reads_per_s"]:.0f} reads/s'
+            f' ({args.readers:d} readers), {result["updates_per_s"]:.2f} updates/s,'
+            f' {result["inconsistent"]:d} inconsistent reads'
+        )
+
+    results = make_results(results)
+
+    if args.output is not None:
+        save_results(args.output, results)
+
+    if any(result["inconsistent"] > 0 for result in results["results"].values()):
+        sys.exit(1)
+
+    if args.baseline is None:
+        return
+
+    rows = compare_results(
+        load_results(args.baseline), results, args.threshold, key="per_read"
+    )
+    for name, old, new, ratio, regression in rows:
+        print(
+            f'{"REGRESSION " if regression else "":s}{name:s}: '
+            f"{old * 1e6:.1f} us -> {new * 1e6:.1f} us per read ({ratio:.2f}x)"
+        )
+
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    main()
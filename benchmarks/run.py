@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    benchmarks/run.py: Benchmark runner over the tests/data corpus
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import argparse
+from functools import partial
+import random
+import sys
+
+from .lib import (
+    TESTDATA_FLD,
+    compare_results,
+    get_feeds,
+    get_txts,
+    load_results,
+    make_results,
+    measure,
+    save_results,
+    select_feeds,
+)
+
+from qgspluginmeta import (
+    QgsPluginDependencyResolver,
+    QgsPluginFacets,
+    QgsPluginLatestView,
+    QgsPluginMetadata,
+    QgsPluginReleaseHistory,
+    QgsPluginRepository,
+    QgsPluginSearchIndex,
+    QgsPluginSnapshotStore,
+    QgsVersion,
+    _split_xml,
+    export_xml,
+    import_xml,
+    merge,
+)
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+FIELDS = ("id", "version", "qgisMinimumVersion", "qgisMaximumVersion")
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CASES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _split(xml):
+
+    return list(_split_xml(xml))
+
+
+def _from_xmldicts(release_dicts):
+
+    return [
+        QgsPluginMetadata.from_xmldict(release_dict) for release_dict in release_dicts
+    ]
+
+
+def _as_xmldicts(releases):
+
+    return [release.as_xmldict() for release in releases]
+
+
+def _from_metadatatxts(txts):
+
+    return [
+        QgsPluginMetadata.from_metadatatxt(plugin_id, txt) for plugin_id, txt in txts
+    ]
+
+
+def _as_metadatatxts(metas):
+
+    return [meta.as_metadatatxt() for meta in metas]
+
+
+def _freeze(releases):
+
+    return [release.freeze() for release in releases]
+
+
+def _thaw(snapshots):
+
+    return [snapshot.thaw() for snapshot in snapshots]
+
+
+def _copy_fields(releases):
+    "Per-field copy, for comparison with freeze / thaw"
+
+    return [[release[key].copy() for key in release.keys()] for release in releases]
+
+
+def _merge(releases, txt_records, sorted_input):
+
+    return list(merge(releases, txt_records, sorted_input=sorted_input))
+
+
+def _parse_versions(version_strs):
+
+    return [QgsVersion.from_pluginversion(version_str) for version_str in version_strs]
+
+
+def _compare_versions(versions):
+
+    return [a < b for a, b in zip(versions[:-1], versions[1:])]
+
+
+def _search(index, queries, prefix):
+
+    return [index.search(query, prefix=prefix) for query in queries]
+
+
+def _facet_queries(facets, tags):
+
+    return [
+        facets.count(tags=tag, deprecated=False, qgis_version="3.28") for tag in tags
+    ]
+
+
+def _latest_max(releases):
+    "Grouping plus max, for comparison with QgsPluginLatestView"
+
+    groups = {}
+    for release in releases:
+        groups.setdefault(release["id"].value, []).append(release)
+
+    return [
+        max(group, key=lambda release: release["version"].value)
+        for group in groups.values()
+    ]
+
+
+def _history_releases(release, count):
+    "Versions of one corpus release with a changelog growing at the top, like real histories"
+
+    fields = release.as_dict()
+    changelog = fields.get("changelog", "")
+    releases = []
+
+    for index in range(count):
+        changelog = f"{index:d}.0: fixed issue #{index:d}\n{changelog:s}"
+        fields.update(version=f"{index:d}.0", changelog=changelog)
+        releases.append(QgsPluginMetadata(**fields))
+
+    return releases
+
+
+def _history_release_all(history):
+
+    return [history.release(index) for index in range(len(history))]
+
+
+def _dependency_releases(releases):
+    "Corpus releases depending on up to three earlier plugins each (by id), seeded"
+
+    rng = random.Random(0)
+    plugin_ids = []
+    dependency_releases = []
+
+    for release in releases:
+        fields = release.as_dict()
+        fields["plugin_dependencies"] = ",".join(
+            rng.sample(plugin_ids[-50:], min(len(plugin_ids), rng.randint(0, 3)))
+        )
+        plugin_ids.append(fields["id"])
+        dependency_releases.append(QgsPluginMetadata(**fields))
+
+    return dependency_releases
+
+
+def _resolve_all(releases):
+
+    return QgsPluginDependencyResolver(releases).resolve_all()
+
+
+def _parsable_txts(data_fld):
+
+    for plugin_id, txt in get_txts(data_fld):
+        try:
+            QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+        except ValueError:
+            continue
+        yield plugin_id, txt
+
+
+def get_cases(all_feeds=False, data_fld=TESTDATA_FLD):
+    "Yields tuples of case name, callable and number of items processed per call"
+
+    feeds = list(get_feeds(data_fld))
+
+    for name, xml in select_feeds(feeds, all_feeds=all_feeds):
+        releases = import_xml(xml)
+        yield f"import_xml[{name:s}]", partial(import_xml, xml), len(releases)
+        yield f"import_xml_fields[{name:s}]", partial(
+            import_xml, xml, fields=FIELDS
+        ), len(releases)
+        yield f"export_xml[{name:s}]", partial(export_xml, releases), len(releases)
+        yield f"split_xml[{name:s}]", partial(_split, xml), len(releases)
+        yield f"split_xml_bytes[{name:s}]", partial(_split, xml.encode("utf-8")), len(
+            releases
+        )
+
+    if len(feeds) > 0:
+        _, xml = feeds[-1]
+        release_dicts = list(_split_xml(xml))
+        releases = _from_xmldicts(release_dicts)
+        yield "from_xmldict", partial(_from_xmldicts, release_dicts), len(releases)
+        yield "as_xmldict", partial(_as_xmldicts, releases), len(releases)
+        snapshots = _freeze(releases)
+        yield "freeze", partial(_freeze, releases), len(releases)
+        yield "thaw", partial(_thaw, snapshots), len(releases)
+        yield "copy_fields", partial(_copy_fields, releases), len(releases)
+
+        txt_records = _thaw(snapshots)
+        ordered = sorted(releases, key=QgsPluginRepository.key)
+        yield "merge", partial(_merge, releases, txt_records, False), len(releases)
+        yield "merge_sorted", partial(_merge, ordered, ordered, True), len(releases)
+
+        version_strs = [release["version"].value.original for release in releases]
+        versions = _parse_versions(version_strs)
+        yield "version_parse", partial(_parse_versions, version_strs), len(versions)
+        yield "version_compare", partial(_compare_versions, versions), len(versions)
+        yield "version_sort", partial(sorted, versions), len(versions)
+
+        index = QgsPluginSearchIndex(releases)
+        queries = [release["name"].value[:3] for release in releases]
+        yield "search_index", partial(QgsPluginSearchIndex, releases), len(releases)
+        yield "search", partial(_search, index, queries, False), len(queries)
+        yield "search_prefix", partial(_search, index, queries, True), len(queries)
+
+        facets = QgsPluginFacets(releases)
+        tags = list(facets.counts("tags").keys())
+        yield "facets", partial(QgsPluginFacets, releases), len(releases)
+        yield "facet_queries", partial(_facet_queries, facets, tags), len(tags)
+
+        yield "latest_view", partial(QgsPluginLatestView, releases), len(releases)
+        yield "latest_max", partial(_latest_max, releases), len(releases)
+
+        store = QgsPluginSnapshotStore()
+        store.add_xml("feed", xml)
+        yield "snapshot_add_seen", partial(store.add_xml, "copy", xml), len(releases)
+
+        history_releases = _history_releases(releases[0], 256)
+        history = QgsPluginReleaseHistory(history_releases)
+        yield "history_build", partial(
+            QgsPluginReleaseHistory, history_releases
+        ), len(history_releases)
+        yield "history_iter", partial(list, history), len(history)
+        yield "history_release", partial(_history_release_all, history), len(history)
+
+        dependency_releases = _dependency_releases(releases)
+        yield "dependencies_build", partial(
+            QgsPluginDependencyResolver, dependency_releases
+        ), len(dependency_releases)
+        yield "dependencies_resolve_all", partial(
+            _resolve_all, dependency_releases
+        ), len(dependency_releases)
+
+    txts = list(_parsable_txts(data_fld))
+    metas = _from_metadatatxts(txts)
+    yield "from_metadatatxt", partial(_from_metadatatxts, txts), len(txts)
+    yield "as_metadatatxt", partial(_as_metadatatxts, metas), len(metas)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ENTRY POINT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Benchmarks over tests/data")
+    parser.add_argument("-o", "--output", help="write results to JSON file")
+    parser.add_argument("-b", "--baseline", help="compare against results JSON file")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slow-down flagged as regression (default: 0.1)",
+    )
+    parser.add_argument("-k", "--filter", default="", help="only run matching cases")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--all-feeds", action="store_true", help="not only 3 feeds")
+    parser.add_argument(
+        "-d", "--data", default=TESTDATA_FLD, help="corpus folder (default: tests/data)"
+    )
+    args = parser.parse_args()
+
+    results = {}
+
+    for name, func, items in get_cases(all_feeds=args.all_feeds, data_fld=args.data):
+        if args.filter not in name:
+            continue
+        result = measure(func, repeat=args.repeat)
+        result["items"] = items
+        results[name] = result
+        print(
+            f'{name:s}: {result["min"] * 1e3:.3f} ms'
+            f' ({result["min"] / max(items, 1) * 1e6:.2f} us/item, {items:d} items)'
+        )
+
+    results = make_results(results)
+
+    if args.output is not None:
+        save_results(args.output, results)
+
+    if args.baseline is None:
+        return
+
+    rows = compare_results(load_results(args.baseline), results, args.threshold)
+    for name, old, new, ratio, regression in rows:
+        print(
+            f'{"REGRESSION " if regression else "":s}{name:s}: '
+            f"{old * 1e3:.3f} ms -> {new * 1e3:.3f} ms ({ratio:.2f}x)"
+        )
+
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    main()
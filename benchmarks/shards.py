@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    benchmarks/shards.py: Throughput of the sharded repository against a single process
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import argparse
+from functools import partial
+import os
+import sys
+
+from .lib import (
+    TESTDATA_FLD,
+    compare_results,
+    get_feeds,
+    load_results,
+    make_results,
+    measure,
+    save_results,
+)
+
+from qgspluginmeta import (
+    QgsPluginFacets,
+    QgsPluginLatestView,
+    QgsPluginRepository,
+    QgsPluginSearchIndex,
+    QgsPluginShardedRepository,
+    import_xml,
+)
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CASES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _single_ingest(repository, xml):
+
+    for release in import_xml(xml):
+        repository.add(release)
+
+
+def _single_search(index, queries):
+
+    return [index.search(query, prefix=True, limit=10) for query in queries]
+
+
+def _single_get(repository, keys):
+
+    return [repository[key] for key in keys]
+
+
+def _single_compatible(facets, qgis_version):
+
+    return facets.releases(facets.select(qgis_version=qgis_version))
+
+
+def _sharded_search(sharded, queries):
+
+    return [sharded.search(query, prefix=True, limit=10) for query in queries]
+
+
+def get_cases(xml, shard_counts, qgis_version):
+    "Yields tuples of shard count (0: single process), case name, callable and number of items"
+
+    releases = import_xml(xml)
+    keys = [QgsPluginRepository.key(release) for release in releases]
+    queries = [release["name"].value[:3] for release in releases[:100]]
+
+    repository = QgsPluginRepository()
+    index = repository.attach(QgsPluginSearchIndex())
+    repository.attach(QgsPluginLatestView())
+    facets = repository.attach(QgsPluginFacets())
+
+    yield 0, "ingest", partial(_single_ingest, repository, xml), len(releases)
+    yield 0, "search", partial(_single_search, index, queries), len(queries)
+    yield 0, "get_many", partial(_single_get, repository, keys), len(keys)
+    yield 0, "compatible", partial(_single_compatible, facets, qgis_version), len(
+        releases
+    )
+
+    for shards in shard_counts:
+        with QgsPluginShardedRepository(shards) as sharded:
+            yield shards, "ingest", partial(sharded.add_xml, xml), len(releases)
+            yield shards, "search", partial(_sharded_search, sharded, queries), len(
+                queries
+            )
+            yield shards, "get_many", partial(sharded.get_many, keys), len(keys)
+            yield shards, "compatible", partial(sharded.compatible, qgis_version), len(
+                releases
+            )
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ENTRY POINT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Sharded repository throughput against a single process"
+    )
+    parser.add_argument("-o", "--output", help="write results to JSON file")
+    parser.add_argument("-b", "--baseline", help="compare against results JSON file")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slow-down flagged as regression (default: 0.1)",
+    )
+    parser.add_argument(
+        "-s",
+        "--shards",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, os.cpu_count() or 1}),
+        help="shard counts (default: 1, 2 and the number of CPUs)",
+    )
+    parser.add_argument("-q", "--qgis-version", default="3.16")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument(
+        "-d", "--data", default=TESTDATA_FLD, help="corpus folder (default: tests/data)"
+    )
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()!s} CPUs")
+
+    _, xml = list(get_feeds(args.data))[-1]  # largest feed
+    results = {}
+    single = {}
+
+    for shards, case, func, items in get_cases(xml, args.shards, args.qgis_version):
+        result = measure(func, repeat=args.repeat)
+        result["items"] = items
+        result["throughput"] = items / result["min"]
+        if shards == 0:
+            name = f"{case:s}[single]"
+            single[case] = result["throughput"]
+            speedup = ""
+        else:
+            name = f"{case:s}[shards={shards:d}]"
+            speedup = f", {result['throughput'] / single[case]:.2f}x single"
+        results[name] = result
+        print(f'{name:s}: {result["throughput"]:.0f} items/s{speedup:s}')
+
+    results = make_results(results)
+
+    if args.output is not None:
+        save_results(args.output, results)
+
+    if args.baseline is None:
+        return
+
+    rows = compare_results(load_results(args.baseline), results, args.threshold)
+    for name, old, new, ratio, regression in rows:
+        print(
+            f'{"REGRESSION " if regression else "":s}{name:s}: '
+            f"{old * 1e3:.3f} ms -> {new * 1e3:.3f} ms ({ratio:.2f}x)"
+        )
+
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    benchmarks/startup.py: Import time of the package, based on python -X importtime
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from .lib import compare_results, load_results, make_results, save_results
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+CASES = {
+    "package": "import qgspluginmeta",
+    "version": "from qgspluginmeta import QgsVersion",
+    "metadata": "from qgspluginmeta import QgsPluginMetadata",
+    "import_xml": "from qgspluginmeta import import_xml",
+    "export_xml": "from qgspluginmeta import export_xml; export_xml([])",
+    "everything": "from qgspluginmeta import *",
+    "cli": "from qgspluginmeta._core.cli import main",
+}
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CASES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def importtime(statement):
+    "Runs `statement` in a fresh interpreter, returns cumulative import time in seconds by top-level module"
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")]
+        + ([env["PYTHONPATH"]] if len(env.get("PYTHONPATH", "")) > 0 else [])
+    )
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    modules = {}
+
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.startswith("  "):  # imported by another module, counted there
+            continue
+        modules[name.strip()] = int(cumulative) * 1e-6
+
+    return modules
+
+
+def measure_import(statement, repeat=5):
+    "Import time of `statement` (min, median) and the top-level modules of the fastest run"
+
+    runs = [importtime(statement) for _ in range(repeat)]
+    totals = [sum(modules.values()) for modules in runs]
+    fastest = runs[totals.index(min(totals))]
+
+    return {
+        "min": min(totals),
+        "median": statistics.median(totals),
+        "repeat": repeat,
+        "modules": dict(sorted(fastest.items(), key=lambda item: -item[1])),
+    }
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ENTRY POINT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Import time of qgspluginmeta")
+    parser.add_argument("-o", "--output", help="write results to JSON file")
+    parser.add_argument("-b", "--baseline", help="compare against results JSON file")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slow-down flagged as regression (default: 0.2)",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-n", "--top", type=int, default=3, help="modules to list")
+    args = parser.parse_args()
+
+    results = {}
+
+    for name, statement in CASES.items():
+        result = measure_import(statement, repeat=args.repeat)
+        results[name] = result
+        print(f'{name:s}: {result["min"] * 1e3:.1f} ms ({statement:s})')
+        print(
+            "    "
+            + ", ".join(
+                f"{module:s} {seconds * 1e3:.1f} ms"
+                for module, seconds in list(result["modules"].items())[: args.top]
+            )
+        )
+
+    results = make_results(results)
+
+    if args.output is not None:
+        save_results(args.output, results)
+
+    if args.baseline is None:
+        return
+
+    rows = compare_results(load_results(args.baseline), results, args.threshold)
+    for name, old, new, ratio, regression in rows:
+        print(
+            f'{"REGRESSION " if regression else "":s}{name:s}: '
+            f"{old * 1e3:.1f} ms -> {new * 1e3:.1f} ms ({ratio:.2f}x)"
+        )
+
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,591 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    benchmarks/synth.py: Seeded synthetic plugins.xml / metadata.txt corpus generator
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import argparse
+import bisect
+from collections import Counter, defaultdict
+import configparser
+import itertools
+import json
+import os
+import random
+import re
+from xml.sax.saxutils import escape, quoteattr
+
+from .lib import TESTDATA_FLD, get_feeds, get_txts
+
+from qgspluginmeta import _split_xml
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+PROFILE_VERSION = 1
+CATEGORICAL_MAX = (
+    32  # keys with at most this many distinct values are sampled as categories
+)
+LENGTH_SAMPLES = 101  # quantiles kept per text key
+
+XML_ATTRIBUTES = ("@name", "@version", "@plugin_id")
+XML_DERIVED = ("@version", "version", "file_name", "download_url", "@plugin_id")
+TXT_DERIVED = ("version",)
+
+WORDS = (
+    "layer vector raster map tool plugin data export import processing analysis "
+    "geometry network route point line polygon style label attribute table query "
+    "database web service tile cadastral survey grid height terrain elevation flood "
+    "water land cover satellite imagery sentinel landsat field form print atlas time "
+    "temporal animation graph chart report spatial index join merge split buffer"
+).split(" ")
+
+DEFAULT_PROFILE = {
+    "version": PROFILE_VERSION,
+    "releases_per_plugin": {"1": 95, "2": 5},
+    "version_shapes": {
+        "0.0.0": 55,
+        "0.0": 30,
+        "0.0.0 beta": 5,
+        "v0.0": 4,
+        "0.0.0.0": 3,
+        "0.0 rc0": 3,
+    },
+    "ampersand_rate": 0.01,
+    "xml": {
+        "presence": {
+            "@name": 1.0,
+            "@plugin_id": 1.0,
+            "@version": 1.0,
+            "about": 0.97,
+            "author_name": 1.0,
+            "average_vote": 1.0,
+            "create_date": 1.0,
+            "deprecated": 1.0,
+            "description": 1.0,
+            "download_url": 1.0,
+            "downloads": 1.0,
+            "experimental": 1.0,
+            "external_dependencies": 1.0,
+            "file_name": 1.0,
+            "homepage": 0.9,
+            "icon": 0.9,
+            "qgis_maximum_version": 1.0,
+            "qgis_minimum_version": 1.0,
+            "rating_votes": 1.0,
+            "repository": 0.95,
+            "server": 1.0,
+            "tags": 0.85,
+            "tracker": 0.9,
+            "trusted": 1.0,
+            "update_date": 1.0,
+            "uploaded_by": 1.0,
+            "version": 1.0,
+        },
+        "categories": {
+            "deprecated": {"False": 99, "True": 1},
+            "experimental": {"False": 85, "True": 15},
+            "server": {"False": 97, "True": 3},
+            "trusted": {"False": 80, "True": 20},
+            "qgis_minimum_version": {
+                "3.0": 40,
+                "3.4": 15,
+                "3.10": 15,
+                "3.16": 10,
+                "2.0": 10,
+                "2.14": 10,
+            },
+            "qgis_maximum_version": {"3.99": 85, "2.99": 15},
+            "external_dependencies": {"": 95, "numpy": 3, "pandas": 2},
+        },
+        "lengths": {
+            "@name": [8, 12, 16, 20, 28, 40],
+            "about": [40, 120, 250, 500, 1000, 3000],
+            "author_name": [8, 12, 16, 24],
+            "description": [20, 40, 60, 90, 150, 300],
+            "tags": [10, 30, 50, 80, 150],
+            "homepage": [25, 40, 60],
+            "repository": [25, 40, 60],
+            "tracker": [30, 50, 70],
+            "icon": [15, 25, 40],
+            "uploaded_by": [5, 8, 12],
+            "downloads": [2, 3, 4, 5, 6],
+            "average_vote": [3, 4, 17],
+            "rating_votes": [1, 2, 3],
+        },
+        "numeric": ["downloads", "rating_votes", "average_vote", "@plugin_id"],
+        "dates": ["create_date", "update_date"],
+    },
+    "txt": {
+        "presence": {
+            "name": 1.0,
+            "qgisMinimumVersion": 1.0,
+            "description": 1.0,
+            "about": 0.9,
+            "version": 1.0,
+            "author": 1.0,
+            "email": 1.0,
+            "repository": 0.9,
+            "tracker": 0.85,
+            "homepage": 0.85,
+            "tags": 0.8,
+            "category": 0.6,
+            "icon": 0.95,
+            "experimental": 0.9,
+            "deprecated": 0.7,
+            "changelog": 0.6,
+            "qgisMaximumVersion": 0.2,
+            "hasProcessingProvider": 0.1,
+            "server": 0.05,
+            "plugin_dependencies": 0.02,
+        },
+        "categories": {
+            "experimental": {"False": 80, "True": 15, "false": 4, "maybe": 1},
+            "deprecated": {"False": 99, "True": 1},
+            "category": {
+                "Vector": 30,
+                "Raster": 20,
+                "Web": 15,
+                "Database": 10,
+                "Plugins": 25,
+            },
+            "qgisMinimumVersion": {
+                "3.0": 50,
+                "3.4": 15,
+                "3.10": 15,
+                "2.0": 10,
+                "2.14": 10,
+            },
+            "qgisMaximumVersion": {"3.99": 80, "2.99": 20},
+            "hasProcessingProvider": {"yes": 50, "no": 50},
+            "server": {"False": 90, "True": 10},
+        },
+        "lengths": {
+            "name": [8, 12, 16, 24, 36],
+            "description": [20, 40, 60, 90, 150],
+            "about": [40, 120, 250, 500, 1000],
+            "author": [8, 12, 20],
+            "email": [12, 18, 25],
+            "repository": [25, 40, 60],
+            "tracker": [30, 50, 70],
+            "homepage": [25, 40, 60],
+            "tags": [10, 30, 50, 80],
+            "icon": [8, 12, 20],
+            "changelog": [50, 200, 800, 3000, 12000],
+            "plugin_dependencies": [8, 16, 30],
+        },
+        "multiline": ["about", "changelog"],
+    },
+}
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# PROFILE
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _version_shape(version_str):
+    "Replaces digit runs with 0, keeps words and delimiters"
+
+    return re.sub(r"[0-9]+", "0", version_str)
+
+
+def _quantiles(values):
+
+    values = sorted(values)
+
+    if len(values) == 0:
+        return [0]
+
+    return sorted(
+        {
+            values[min(len(values) - 1, index * len(values) // (LENGTH_SAMPLES - 1))]
+            for index in range(LENGTH_SAMPLES)
+        }
+    )
+
+
+def _profile_items(items, derived):
+
+    counts = Counter()
+    values = defaultdict(list)
+
+    for item in items:
+        for key, value in item.items():
+            if value is None:
+                value = ""
+            if not isinstance(value, str):  # nested elements are not reproduced
+                continue
+            counts[key] += 1
+            values[key].append(value)
+
+    total = max(len(items), 1)
+    profile = {
+        "presence": {},
+        "categories": {},
+        "lengths": {},
+        "numeric": [],
+        "dates": [],
+    }
+
+    for key in sorted(counts.keys()):
+        profile["presence"][key] = counts[key] / total
+        if key in derived:
+            continue
+        distinct = Counter(values[key])
+        if len(distinct) <= CATEGORICAL_MAX:
+            profile["categories"][key] = dict(distinct)
+        elif all(re.fullmatch(r"[0-9.]+", value) for value in values[key]):
+            profile["numeric"].append(key)
+            profile["lengths"][key] = _quantiles(len(value) for value in values[key])
+        elif all(
+            re.fullmatch(r"[0-9]{4}-[0-9]{2}-[0-9]{2}T.*", value)
+            for value in values[key]
+        ):
+            profile["dates"].append(key)
+        else:
+            profile["lengths"][key] = _quantiles(len(value) for value in values[key])
+
+    return profile
+
+
+def make_profile(data_fld=TESTDATA_FLD):
+    "Derives value distributions from a corpus of plugins.xml and metadata.txt files"
+
+    feeds = list(get_feeds(data_fld))
+    if len(feeds) == 0:
+        raise ValueError(f'no plugins.xml in "{data_fld:s}"')
+
+    _, xml = feeds[-1]  # largest feed
+    release_dicts = list(_split_xml(xml))
+
+    txt_dicts = []
+    for _, txt in get_txts(data_fld):
+        cp = configparser.ConfigParser(interpolation=None, strict=False)
+        cp.optionxform = str
+        try:
+            cp.read_string(txt)
+            txt_dicts.append(dict(cp["general"]))
+        except Exception:
+            continue
+
+    texts = [
+        value
+        for item in itertools.chain(release_dicts, txt_dicts)
+        for value in item.values()
+        if isinstance(value, str) and " " in value
+    ]
+    ids = Counter(
+        release_dict["file_name"].rsplit(".", 1)[0][: -len(release_dict["version"]) - 1]
+        for release_dict in release_dicts
+    )
+
+    profile = {
+        "version": PROFILE_VERSION,
+        "releases_per_plugin": {
+            str(count): number for count, number in Counter(ids.values()).items()
+        },
+        "version_shapes": dict(
+            Counter(
+                _version_shape(release_dict["version"])
+                for release_dict in release_dicts
+            )
+            + Counter(
+                _version_shape(txt_dict["version"])
+                for txt_dict in txt_dicts
+                if "version" in txt_dict
+            )
+        ),
+        "ampersand_rate": sum("& " in text for text in texts) / max(len(texts), 1),
+        "xml": _profile_items(release_dicts, XML_DERIVED),
+        "txt": _profile_items(txt_dicts, TXT_DERIVED),
+    }
+    profile["txt"]["multiline"] = sorted(
+        key
+        for key in profile["txt"]["lengths"].keys()
+        if any("\n" in txt_dict.get(key, "") for txt_dict in txt_dicts)
+    )
+
+    return profile
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# GENERATOR
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class _Sampler:
+    "Draws values following a profile, deterministic for a given seed"
+
+    def __init__(self, profile, seed):
+
+        self._profile = profile
+        self._random = random.Random(seed)
+
+        self._shapes, self._shape_weights = self._weights(profile["version_shapes"])
+        counts, weights = self._weights(profile["releases_per_plugin"])
+        self._releases_per_plugin = [int(count) for count in counts], weights
+
+    @staticmethod
+    def _weights(counter):
+
+        keys = sorted(counter.keys())
+
+        return keys, list(itertools.accumulate(counter[key] for key in keys))
+
+    def choice(self, keys, cum_weights):
+
+        return keys[bisect.bisect(cum_weights, self._random.random() * cum_weights[-1])]
+
+    def category(self, counter):
+
+        return self.choice(*self._weights(counter))
+
+    def present(self, probability):
+
+        return self._random.random() < probability
+
+    def releases(self):
+
+        return self.choice(*self._releases_per_plugin)
+
+    def version(self):
+
+        shape = self.choice(self._shapes, self._shape_weights)
+
+        return re.sub("0", lambda _: str(self._random.randint(0, 12)), shape)
+
+    def length(self, quantiles):
+
+        return max(1, self._random.choice(quantiles))
+
+    def number(self, length):
+
+        return str(self._random.randint(0, 10 ** min(length, 9) - 1))
+
+    def date(self):
+
+        return (
+            f"{self._random.randint(2010, 2020):04d}-{self._random.randint(1, 12):02d}-"
+            f"{self._random.randint(1, 28):02d}T{self._random.randint(0, 23):02d}:"
+            f"{self._random.randint(0, 59):02d}:{self._random.randint(0, 59):02d}.000000"
+        )
+
+    def text(self, length, multiline=False):
+
+        words, size = [], 0
+
+        while size < length:
+            word = self._random.choice(WORDS)
+            if multiline and len(words) > 0 and self._random.random() < 0.08:
+                word = f"\n{self._random.randint(0, 9):d}.{self._random.randint(0, 20):d} {word:s}"
+            words.append(word)
+            size += len(word) + 1
+
+        return " ".join(words)[:length].strip() or "x"
+
+    def ampersand(self, text):
+        "Inserts a lonely ampersand (as found in real feeds) with the profile's rate"
+
+        if " " not in text or not self.present(self._profile["ampersand_rate"]):
+            return text, False
+
+        head, tail = text.split(" ", 1)
+
+        return f"{head:s} & {tail:s}", True
+
+    def plugin_id(self, index):
+
+        return (
+            f"{self._random.choice(WORDS):s}_{self._random.choice(WORDS):s}_{index:d}"
+        )
+
+
+def _xml_release(sampler, section, plugin_id, plugin_index, version):
+
+    items = []
+
+    for key in sorted(section["presence"].keys()):
+        if key not in XML_DERIVED and not sampler.present(section["presence"][key]):
+            continue
+        raw = False
+        if key in ("@version", "version"):
+            value = version
+        elif key == "file_name":
+            value = f"{plugin_id:s}.{version:s}.zip"
+        elif key == "download_url":
+            value = f"https://plugins.qgis.org/plugins/{plugin_id:s}/version/{version:s}/download/"
+        elif key == "@plugin_id":
+            value = str(plugin_index)
+        elif key in section["categories"].keys():
+            value = sampler.category(section["categories"][key])
+        elif key in section["dates"]:
+            value = sampler.date()
+        elif key in section["numeric"]:
+            value = sampler.number(sampler.length(section["lengths"][key]))
+        else:
+            value, raw = sampler.ampersand(
+                sampler.text(sampler.length(section["lengths"].get(key, [16])))
+            )
+        items.append((key, value, raw))
+
+    attributes = " ".join(
+        f"{key[1:]:s}={quoteattr(value):s}"
+        for key, value, _ in items
+        if key.startswith("@")
+    )
+    elements = "".join(
+        (
+            f"    <{key:s}>{escape(value).replace(' &amp; ', ' & ') if raw else escape(value):s}</{key:s}>\n"
+            if len(value) > 0
+            else f"    <{key:s}></{key:s}>\n"
+        )
+        for key, value, raw in items
+        if not key.startswith("@")
+    )
+
+    return f"  <pyqgis_plugin {attributes:s}>\n{elements:s}  </pyqgis_plugin>\n"
+
+
+def _txt(sampler, section, version):
+
+    lines = ["[general]"]
+
+    for key in sorted(section["presence"].keys()):
+        if key not in TXT_DERIVED and not sampler.present(section["presence"][key]):
+            continue
+        if key == "version":
+            value = version
+        elif key in section["categories"].keys():
+            value = sampler.category(section["categories"][key])
+        else:
+            value, _ = sampler.ampersand(
+                sampler.text(
+                    sampler.length(section["lengths"].get(key, [16])),
+                    multiline=key in section.get("multiline", []),
+                )
+            )
+        lines.append(f"{key:s}={value.replace(chr(10), chr(10) + '    '):s}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _releases(sampler, releases):
+
+    plugin_index = 0
+
+    while releases > 0:
+        plugin_id = sampler.plugin_id(plugin_index)
+        for _ in range(min(sampler.releases(), releases)):
+            yield plugin_index, plugin_id, sampler.version()
+            releases -= 1
+        plugin_index += 1
+
+
+def generate_xml(f, releases, profile=DEFAULT_PROFILE, seed=0):
+    "Streams a plugins.xml document with `releases` releases into file object `f`"
+
+    sampler = _Sampler(profile, seed)
+
+    f.write('<?xml version = "1.0" encoding = "UTF-8"?>\n<plugins>\n')
+    for plugin_index, plugin_id, version in _releases(sampler, releases):
+        f.write(_xml_release(sampler, profile["xml"], plugin_id, plugin_index, version))
+    f.write("</plugins>\n")
+
+
+def generate_txts(data_fld, releases, profile=DEFAULT_PROFILE, seed=0):
+    "Writes `releases` metadata.txt files into `data_fld`, one at a time"
+
+    sampler = _Sampler(profile, seed)
+
+    for _, plugin_id, version in _releases(sampler, releases):
+        fn = os.path.join(
+            data_fld, f"metadata_{plugin_id:s}_{version.replace(' ', '_'):s}.txt"
+        )
+        with open(fn, "w", encoding="utf-8") as f:
+            f.write(_txt(sampler, profile["txt"], version))
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ENTRY POINT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Synthetic plugins.xml / metadata.txt corpus"
+    )
+    parser.add_argument("output", help="target folder")
+    parser.add_argument(
+        "-n", "--releases", type=int, default=10000, help="releases per feed"
+    )
+    parser.add_argument(
+        "-f", "--feeds", type=int, default=1, help="number of plugins.xml feeds"
+    )
+    parser.add_argument(
+        "-m", "--txts", type=int, default=0, help="number of metadata.txt files"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument(
+        "-p", "--profile", help="profile JSON (default: derived from tests/data)"
+    )
+    parser.add_argument(
+        "--save-profile", help="write derived profile to JSON file and exit"
+    )
+    args = parser.parse_args()
+
+    if args.profile is not None:
+        with open(args.profile, "r") as f:
+            profile = json.load(f)
+    else:
+        try:
+            profile = make_profile()
+        except (OSError, ValueError):
+            profile = DEFAULT_PROFILE
+
+    if args.save_profile is not None:
+        with open(args.save_profile, "w") as f:
+            json.dump(profile, f, indent=2, sort_keys=True)
+        return
+
+    os.makedirs(args.output, exist_ok=True)
+
+    for index in range(args.feeds):
+        with open(
+            os.path.join(args.output, f"plugins_synth-{index:02d}.xml"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            generate_xml(f, args.releases, profile=profile, seed=args.seed + index)
+
+    generate_txts(args.output, args.txts, profile=profile, seed=args.seed)
+
+
+if __name__ == "__main__":
+
+    main()
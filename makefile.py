@@ -28,15 +28,14 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-import io
-import zipfile
+import asyncio
 import os
 import sys
 import xml
 
-import requests
 from tqdm import tqdm
-import xmltodict
+
+from qgspluginmeta import QgsPluginSync, import_xml
 
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -45,7 +44,7 @@ import xmltodict
 
 TESTS_FLD = "tests"
 TESTDATA_FLD = os.path.join(TESTS_FLD, "data")
-REPO_DEFAULT_URL = "https://plugins.qgis.org/plugins/plugins.xml"
+SYNC_STATE_FN = "sync_state.json"
 
 VERSIONS = {
     1: [8],
@@ -60,76 +59,72 @@ VERSIONS = {
 
 def make_testdata():
 
-    for major, minors in VERSIONS.items():
-        for minor in minors:
-            print(f'-> QGIS {major:d}.{minor:d}')
-            _fetch_data(major, minor)
+    asyncio.run(_fetch_data())
 
 
-def _fetch_data(major, minor):
+async def _fetch_data():
 
-    r = requests.get(f"{REPO_DEFAULT_URL:s}?qgis={major:d}.{minor:d}")
-    data = r.text
+    feeds = {
+        f"{major:d}.{minor:d}": os.path.join(TESTDATA_FLD, f"plugins_{major:d}-{minor:02d}.xml")
+        for major, minors in VERSIONS.items()
+        for minor in minors
+    }
+    releases = {}
 
-    data_fixed = data.replace(
-        "& ", "&amp; "
-    )  # From plugin installer: Fix lonely ampersands in metadata
+    async with QgsPluginSync(os.path.join(TESTDATA_FLD, SYNC_STATE_FN)) as sync:
 
-    try:
-        tree = xmltodict.parse(data_fixed)
-    except xml.parsers.expat.ExpatError:
-        print('XML broken')
-        return
+        async for qgis_version, fn, changed in sync.sync_xml(feeds):
 
-    with open(os.path.join(TESTDATA_FLD, f"plugins_{major:d}-{minor:02d}.xml"), "w") as f:
-        f.write(data)
+            print(f'-> QGIS {qgis_version:s}{"" if changed else " (not modified)":s}')
 
-    for node in tqdm(tree["plugins"]["pyqgis_plugin"]):
+            with open(fn, "r") as f:
+                data = f.read()
 
-        assert node["version"] == node["@version"]
-        assert node["file_name"].endswith(".zip")
-        assert node["version"] in node["file_name"]
+            try:
+                feed = import_xml(data, fields=("version", "download_url"))
+            except xml.parsers.expat.ExpatError:
+                print('XML broken')
+                os.remove(fn)
+                continue
 
-        node_id = node["file_name"][
-            : -1 * (len(".zip") + len(node["version"]) + len("."))
-        ]
+            for release in feed:
+                releases.setdefault(_meta_fn(release), release)
 
-        meta_fn = os.path.join(
-            TESTDATA_FLD, f"metadata_{node_id:s}_{node['version']:s}.txt"
-        )
-        if os.path.exists(meta_fn):
-            continue
+        with tqdm(total=len(releases)) as progress:
+            async for _ in sync.sync_metadatatxt(releases):
+                progress.update(1)
 
-        try:
-            r = requests.get(node["download_url"])
-        except:
-            print(node)
-            if r.status_code == 404:
-                print("HTTP 404")
-                continue
-            raise
-
-        data = r.content
-
-        try:
-            with io.BytesIO(data) as f:
-                with zipfile.ZipFile(f, "r") as fz:
-                    meta = fz.read(f"{node_id:s}/metadata.txt").decode("utf-8")
-        except KeyError as e:
-            print(node, 'missing metadata.txt')
-            continue
-
-        with open(meta_fn, "w") as f:
-            f.write(meta)
-
-        # print(f'{REPO_DEFAULT_URL:s}?package_name={node_id:s}&qgis=3.{minor:d}')
-        # r = requests.get(f'{REPO_DEFAULT_URL:s}?package_name={node_id:s}&qgis=3.{minor:d}')
-        # data = r.text
-        #
-        # with open(
-        #     os.path.join(TESTDATA_FLD, f"plugins_3-{minor:02d}_{node_id:s}.xml"), "w"
-        # ) as f:
-        #     f.write(data)
+    for url, e in sync.errors.items():
+        print(url, type(e).__name__, str(e))
+
+    if len(sync.errors) == 0:  # otherwise, files of failed downloads would look stale
+        _prune(set(feeds.values()) | set(releases.keys()))
+    else:
+        print('Errors, stale files not removed')
+
+    stats = sync.stats
+    print(
+        f'{stats["downloaded"]:d} downloaded ({stats["bytes_downloaded"]:d} bytes), '
+        f'{stats["not_modified"]:d} not modified, {stats["skipped"]:d} skipped '
+        f'({stats["bytes_saved"]:d} bytes saved)'
+    )
+
+
+def _prune(fns):
+    "Removes feeds and metadata.txt files which are no longer part of the repository"
+
+    for name in sorted(os.listdir(TESTDATA_FLD)):
+        fn = os.path.join(TESTDATA_FLD, name)
+        if name.startswith(("plugins_", "metadata_")) and fn not in fns:
+            print(f'Removing stale {name:s}')
+            os.remove(fn)
+
+
+def _meta_fn(release):
+
+    return os.path.join(
+        TESTDATA_FLD, f"metadata_{release['id'].value:s}_{release['version'].value.original:s}.txt"
+    )
 
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -79,20 +79,22 @@ setup(
     setup_requires=[],
     install_requires=["typeguard", "xmltodict",],
     extras_require={
+        "harvest": ["aiohttp",],
         "dev": [
+            "aiohttp",
             "black",
             "coverage",
             "pytest",
             "pytest-cov",
             "python-language-server[all]",
-            "requests",
             "setuptools",
+            "tqdm",
             "twine",
             "wheel",
         ]
     },
     zip_safe=False,
-    entry_points={},
+    entry_points={"console_scripts": ["qgspluginmeta = qgspluginmeta._core.cli:main",],},
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Environment :: MacOS X",
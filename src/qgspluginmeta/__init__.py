@@ -28,8 +28,76 @@ specific language governing rights and limitations under the License.
 # EXPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from ._core.error import *
-from ._core.field import QgsPluginMetadataField
-from ._core.metadata import QgsPluginMetadata
-from ._core.version import QgsVersion
-from ._core.repo import import_xml, export_xml, _split_xml
+import importlib as _importlib
+import sys as _sys
+
+from ._core.error import *  # no dependencies
+
+_EXPORTS = {
+    "QgsPluginMetadataField": "field",
+    "QgsPluginMetadata": "metadata",
+    "QgsVersion": "version",
+    "import_xml": "repo",
+    "import_metadatatxts": "repo",
+    "export_xml": "repo",
+    "_split_xml": "repo",
+    "QgsPluginXmlParser": "stream",
+    "import_xml_async": "stream",
+    "QgsPluginZipScanner": "scan",
+    "QgsPluginHarvester": "harvest",
+    "QgsPluginSync": "sync",
+    "QgsPluginProfiler": "profiling",
+    "get_footprint": "footprint",
+    "QgsPluginRepository": "repository",
+    "QgsPluginSearchIndex": "search",
+    "QgsPluginFacets": "facets",
+    "QgsPluginLatestView": "latest",
+    "QgsPluginMetadataFrozen": "frozen",
+    "merge": "merge",
+    "QgsPluginLinter": "lint",
+    "QgsPluginQuarantine": "quarantine",
+    "QgsPluginSnapshotStore": "snapshots",
+    "QgsPluginReleaseHistory": "history",
+    "QgsPluginDependencyResolver": "dependencies",
+    "QgsPluginShardedRepository": "shards",
+    "QgsPluginSharedRepository": "rcu",
+    "QgsPluginRepositorySnapshot": "rcu",
+}  # name: module in `_core`, imported on first access
+
+__all__ = [
+    "QgsBoolValueError",
+    "QgsVersionValueError",
+    "QgsPluginDependencyError",
+    "QgsPluginDependencyCycleError",
+    *(name for name in _EXPORTS.keys() if not name.startswith("_")),
+]
+
+
+def __getattr__(name):
+    "Imports exports from `_core` on first access (PEP 562), keeps `import qgspluginmeta` cheap"
+
+    if name not in _EXPORTS.keys():
+        raise AttributeError(f"module {__name__:s} has no attribute {name:s}")
+
+    value = getattr(
+        _importlib.import_module(f"._core.{_EXPORTS[name]:s}", __name__), name
+    )
+    globals()[name] = value  # no further calls for this name
+
+    return value
+
+
+def __dir__():
+    "Exports and dunders, not the helpers of the lazy import"
+
+    return sorted(
+        name
+        for name in set(globals().keys()) | set(_EXPORTS.keys())
+        if name not in ("_importlib", "_sys", "_EXPORTS")
+    )
+
+
+if _sys.version_info < (3, 7):  # no module-level __getattr__
+    for _name in _EXPORTS.keys():
+        __getattr__(_name)
+    del _name
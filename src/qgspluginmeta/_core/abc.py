@@ -45,3 +45,7 @@ class QgsPluginMetadataFieldABC(abc.ABC):
 
 class QgsVersionABC(abc.ABC):
     pass
+
+
+class QgsPluginRepositoryABC(abc.ABC):
+    pass
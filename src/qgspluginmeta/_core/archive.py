@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/archive.py: Reading plugin zip archives
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import io
+import mmap
+import typing
+import zipfile
+
+from typeguard import typechecked
+
+from .const import METADATATXT_FN
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class _BufferIO(io.RawIOBase):
+    """
+    Read-only, seekable file object on top of a buffer, e.g. `mmap.mmap`
+
+    Unlike `io.BytesIO`, this never copies the entire buffer.
+    """
+
+    def __init__(self, buffer: typing.Union[bytes, bytearray, memoryview, mmap.mmap]):
+
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def readable(self) -> bool:
+
+        return True
+
+    def seekable(self) -> bool:
+
+        return True
+
+    def tell(self) -> int:
+
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence: {whence:d}")
+
+        if position < 0:
+            raise ValueError("negative seek position")
+
+        self._position = position
+        return self._position
+
+    def readinto(self, target: typing.Any) -> int:
+
+        chunk = self._view[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+
+        return len(chunk)
+
+    def close(self):
+
+        self._view.release()
+        super().close()
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+def read_zip_metadatatxt(
+    zip_file: typing.Any, plugin_id: typing.Union[None, str] = None
+) -> typing.Tuple[str, str]:
+    """
+    Reads `metadata.txt` from a plugin zip file, returns plugin id and metadata.txt string
+
+    `zip_file` can be a path, a seekable binary file object or a buffer like `bytes` or
+    `mmap.mmap`. Only the zip's central directory and the `metadata.txt` member are read.
+    If not given, the plugin id is inferred from the top-level folder.
+    """
+
+    if isinstance(zip_file, (bytes, bytearray, memoryview, mmap.mmap)):
+        with _BufferIO(zip_file) as f:
+            return read_zip_metadatatxt(f, plugin_id=plugin_id)
+
+    with zipfile.ZipFile(zip_file, "r") as fz:
+        if plugin_id is None:
+            plugin_id = _zip_plugin_id(fz)
+        member = f"{plugin_id:s}/{METADATATXT_FN:s}"
+        try:
+            metadatatxt_string = fz.read(member).decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise ValueError(f"{member:s} in zip file is not valid UTF-8: {str(e):s}")
+
+    return plugin_id, metadatatxt_string
+
+
+@typechecked
+def _zip_plugin_id(fz: zipfile.ZipFile) -> str:
+    "Name of the one top-level folder containing a metadata.txt file"
+
+    plugin_ids = {
+        name.split("/")[0]
+        for name in fz.namelist()
+        if name.count("/") == 1 and name.endswith(f"/{METADATATXT_FN:s}")
+    }
+
+    if len(plugin_ids) == 0:
+        raise KeyError(f"no {METADATATXT_FN:s} in any top-level folder of zip file")
+    if len(plugin_ids) > 1:
+        raise ValueError(
+            f"{METADATATXT_FN:s} in more than one top-level folder of zip file"
+        )
+
+    return plugin_ids.pop()
@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/cli.py: Command line interface
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import argparse
+from collections import deque
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import typing
+
+from typeguard import typechecked
+
+from .const import (
+    CLI_CHUNK_SIZE,
+    CLI_FORMATS,
+    CLI_XML_IGNORED_FIELDS,
+    LINT_RULES,
+    METADATATXT_FN,
+    XML_CHUNK_SIZE,
+    XML_RELEASE_TAG,
+)
+from .metadata import QgsPluginMetadata
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES: INPUT
+# Only the entry point is type-checked, the record pipeline is too hot for it.
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _format(path, fmt, reading):
+
+    if fmt is not None:
+        return fmt
+    if path == "-":
+        raise ValueError(
+            f'format of {"stdin" if reading else "stdout":s} requires {"--from" if reading else "--to":s}'
+        )
+    if os.path.isdir(path):
+        return "txt"
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xml":
+        return "xml"
+    if ext in (".jsonl", ".json"):
+        return "jsonl"
+    if ext == "" and not reading:
+        return "txt"
+
+    raise ValueError(f'can not guess format of "{path:s}"')
+
+
+@contextlib.contextmanager
+def _open(path, mode):
+
+    if path != "-":
+        with open(path, mode) as f:
+            yield f
+        return
+
+    stream = sys.stdin if "r" in mode else sys.stdout
+    yield stream.buffer if "b" in mode else stream
+
+
+def _read_xml(path):
+
+    from .stream import QgsPluginXmlParser  # only on first use, for startup time
+
+    parser = QgsPluginXmlParser(raw=True)
+
+    with _open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(XML_CHUNK_SIZE), b""):
+            yield from parser.feed(chunk)
+
+    yield from parser.close()
+
+
+def _read_jsonl(path):
+
+    with _open(path, "r") as f:
+        for line in f:
+            if len(line.strip()) > 0:
+                yield json.loads(line)
+
+
+def _read_txt(path):
+
+    for root, dirs, fns in os.walk(path):
+        dirs.sort()
+        for fn in sorted(fns):
+            if fn == METADATATXT_FN:
+                plugin_id = os.path.basename(root)
+            elif fn.startswith("metadata_") and fn.endswith(".txt"):
+                plugin_id = fn[len("metadata_") : -len(".txt")].rsplit("_", 1)[0]
+            else:
+                continue
+            with open(os.path.join(root, fn), "r", encoding="utf-8") as f:
+                yield plugin_id, f.read()
+
+
+_READERS = {
+    "xml": _read_xml,
+    "jsonl": _read_jsonl,
+    "txt": _read_txt,
+}
+
+
+def _jsonl_as_metadatatxt(row):
+    "Plugin id and metadata.txt string of a JSON line, for linting"
+
+    cp = QgsPluginMetadata._make_configparser()
+    cp["general"] = {key: value for key, value in row.items() if key != "id"}
+
+    with io.StringIO() as f:
+        cp.write(f)
+        return row.get("id", ""), f.getvalue()
+
+
+def _from_record(fmt, record):
+
+    if fmt == "xml":
+        return QgsPluginMetadata.from_xmldict(record)
+    if fmt == "jsonl":
+        return QgsPluginMetadata(**record)
+
+    return QgsPluginMetadata.from_metadatatxt(*record)
+
+
+def _from_records(fmt, records):
+    "Runs in worker process: meta data object or exception per record"
+
+    results = []
+
+    for record in records:
+        try:
+            results.append((_from_record(fmt, record), None))
+        except Exception as e:
+            results.append((None, e))
+
+    return results
+
+
+def _chunks(records):
+
+    chunk = []
+
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == CLI_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+
+    if len(chunk) > 0:
+        yield chunk
+
+
+def _metadata(fmt, records, jobs, quarantine):
+    "Meta data objects in input order, parsed by `jobs` processes with bounded look-ahead"
+
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor  # only if needed
+
+    with contextlib.ExitStack() as stack:
+        pool = (
+            None
+            if jobs == 1
+            else stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+        )
+        pending = deque()
+
+        for chunk in _chunks(records):
+            if pool is None:
+                pending.append((chunk, _from_records(fmt, chunk)))
+            else:
+                pending.append((chunk, pool.submit(_from_records, fmt, chunk)))
+            if len(pending) < 2 * jobs:
+                continue
+            yield from _unpack(fmt, *pending.popleft(), quarantine)
+
+        while len(pending) > 0:
+            yield from _unpack(fmt, *pending.popleft(), quarantine)
+
+
+def _unpack(fmt, chunk, results, quarantine):
+
+    if not isinstance(results, list):
+        results = results.result()
+
+    for record, (meta, exception) in zip(chunk, results):
+        if exception is None:
+            yield meta
+            continue
+        if quarantine is None:
+            raise exception
+        quarantine._add(
+            record,
+            exception,
+            record=_jsonl_as_metadatatxt(record) if fmt == "jsonl" else None,
+        )
+
+
+def _filter(metas, qgis_version, ids, tags):
+
+    ids = None if ids is None else frozenset(ids)
+    tags = None if tags is None else frozenset(tag.casefold() for tag in tags)
+
+    for meta in metas:
+        if ids is not None and meta["id"].value not in ids:
+            continue
+        if qgis_version is not None and not meta.is_compatible(qgis_version):
+            continue
+        if tags is not None:
+            meta_tags = meta["tags"].value if "tags" in meta.keys() else None
+            if meta_tags is None or tags.isdisjoint(
+                tag.strip().casefold() for tag in meta_tags
+            ):
+                continue
+        yield meta
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES: OUTPUT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _write_xml(path, metas):
+
+    import xmltodict  # only on first use, for startup time
+
+    with _open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<plugins>\n')
+        for meta in metas:
+            f.write(
+                xmltodict.unparse(
+                    {XML_RELEASE_TAG: meta.as_xmldict()},
+                    full_document=False,
+                    pretty=True,
+                )
+            )
+            f.write("\n")
+        f.write("</plugins>\n")
+
+
+def _write_jsonl(path, metas):
+
+    with _open(path, "w") as f:
+        for meta in metas:
+            f.write(json.dumps(meta.as_dict(), ensure_ascii=False))
+            f.write("\n")
+
+
+def _write_txt(path, metas):
+
+    if path == "-":
+        raise ValueError("txt output requires a folder")
+
+    os.makedirs(path, exist_ok=True)
+
+    for meta in metas:
+        plugin_id = meta["id"].value
+        version = meta["version"].value_string.replace(" ", "-").replace("_", "-")
+        fn = os.path.join(path, f"metadata_{plugin_id:s}_{version:s}.txt")
+        with open(fn, "w", encoding="utf-8") as f:
+            f.write(meta.as_metadatatxt())
+
+
+_WRITERS = {
+    "xml": _write_xml,
+    "jsonl": _write_jsonl,
+    "txt": _write_txt,
+}
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES: COMMANDS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class _Counter:
+    "Counts items passing through"
+
+    def __init__(self):
+
+        self.count = 0
+
+    def __call__(self, items):
+
+        for item in items:
+            self.count += 1
+            yield item
+
+
+def _releases(args, counter, quarantine):
+
+    fmt = _format(args.input, args.input_format, reading=True)
+
+    return _filter(
+        _metadata(fmt, counter(_READERS[fmt](args.input)), args.jobs, quarantine),
+        args.qgis_version if args.command == "convert" else None,
+        args.id,
+        args.tag,
+    )
+
+
+def _convert(args, counter, quarantine):
+
+    fmt = _format(args.output, args.output_format, reading=False)
+    _WRITERS[fmt](args.output, _releases(args, counter, quarantine))
+
+    return 0
+
+
+def _latest(args, counter, quarantine):
+
+    from .latest import QgsPluginLatestView  # only on first use, for startup time
+
+    fmt = _format(args.output, args.output_format, reading=False)
+    view = QgsPluginLatestView(qgis_version=args.qgis_version)
+
+    for meta in _releases(args, counter, quarantine):
+        view.add(meta)
+
+    _WRITERS[fmt](args.output, view.releases(stable=args.stable))
+
+    return 0
+
+
+def _validate(args, counter, quarantine):
+
+    from .lint import QgsPluginLinter  # only on first use, for startup time
+
+    fmt = _format(args.input, args.input_format, reading=True)
+    records = counter(_READERS[fmt](args.input))
+    if fmt == "jsonl":
+        records = (_jsonl_as_metadatatxt(row) for row in records)
+
+    ignored_fields = list(args.ignore or [])
+    if fmt == "xml":
+        ignored_fields.extend(CLI_XML_IGNORED_FIELDS)
+
+    linter = QgsPluginLinter(
+        rules=args.rule, ignored_fields=ignored_fields, workers=args.jobs
+    )
+    failed = False
+
+    for report in linter.lint(records):
+        failed = failed or len(report["findings"]) > 0
+        if args.all or len(report["findings"]) > 0:
+            sys.stdout.write(json.dumps(report, ensure_ascii=False))
+            sys.stdout.write("\n")
+
+    if args.stats:
+        for rule, count in linter.counts.items():
+            sys.stderr.write(f"findings[{rule:s}]: {count:d}\n")
+
+    return 1 if failed else 0
+
+
+_COMMANDS = {
+    "convert": _convert,
+    "latest": _latest,
+    "validate": _validate,
+}
+
+
+def _parser():
+
+    parser = argparse.ArgumentParser(
+        prog="qgspluginmeta", description="Handling metadata from QGIS plugins"
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    for name, description in (
+        ("convert", "convert and filter releases"),
+        ("latest", "latest release per plugin"),
+        ("validate", "lint records, findings as JSON lines"),
+    ):
+        command = commands.add_parser(name, help=description)
+        command.add_argument("input", help='file or folder, "-" for stdin')
+        if name != "validate":
+            command.add_argument("output", help='file or folder, "-" for stdout')
+        command.add_argument(
+            "--from", dest="input_format", choices=CLI_FORMATS, help="input format"
+        )
+        command.add_argument(
+            "-j", "--jobs", type=int, default=1, help="worker processes (default: 1)"
+        )
+        command.add_argument(
+            "--stats", action="store_true", help="report throughput on stderr"
+        )
+        if name == "validate":
+            command.add_argument(
+                "--rule", action="append", choices=LINT_RULES, help="(repeatable)"
+            )
+            command.add_argument(
+                "--ignore",
+                action="append",
+                help="ignored required field (repeatable), email is ignored for xml",
+            )
+            command.add_argument(
+                "--all",
+                action="store_true",
+                help="also report records without findings",
+            )
+            continue
+        command.add_argument(
+            "--to", dest="output_format", choices=CLI_FORMATS, help="output format"
+        )
+        command.add_argument("--qgis-version", help="only releases compatible with it")
+        command.add_argument(
+            "--id", action="append", help="only this plugin (repeatable)"
+        )
+        command.add_argument(
+            "--tag", action="append", help="only this tag (repeatable)"
+        )
+        command.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="skip invalid records instead of aborting, summary on stderr",
+        )
+        if name == "latest":
+            command.add_argument(
+                "--stable",
+                action="store_true",
+                help="ignore pre-release versions (e.g. 1.0-beta), by version string",
+            )
+
+    return parser
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ENTRY POINT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+def main(argv: typing.Union[None, typing.List[str]] = None) -> int:
+    "Console entry point `qgspluginmeta`, returns exit code"
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    counter = _Counter()
+    quarantine = None
+    if getattr(args, "skip_invalid", False):
+        from .quarantine import QgsPluginQuarantine  # only if needed
+
+        quarantine = QgsPluginQuarantine()
+    start = time.perf_counter()
+
+    try:
+        code = _COMMANDS[args.command](args, counter, quarantine)
+    except (OSError, KeyError, ValueError) as e:  # KeyError: e.g. missing XML elements
+        message = str(e.args[0] if isinstance(e, KeyError) and len(e.args) > 0 else e)
+        if isinstance(e, KeyError) and " " not in message:  # just the key
+            message = f'"{message:s}" missing'
+        sys.stderr.write(f"qgspluginmeta {args.command:s}: {message:s}\n")
+        return 2
+
+    if quarantine is not None and len(quarantine) > 0:
+        for name, count in quarantine.summary().items():
+            sys.stderr.write(f"skipped[{name:s}]: {count:d}\n")
+
+    if args.stats:
+        seconds = time.perf_counter() - start
+        sys.stderr.write(
+            f"records: {counter.count:d}, seconds: {seconds:.3f}, "
+            f"records/s: {counter.count / max(seconds, 1e-9):.1f}\n"
+        )
+
+    return code
@@ -53,3 +53,97 @@ VERSION_DELIMITERS = (
     "_",
     " ",  # TODO commas, i.e. `,`?
 )
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# XML
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+XML_RELEASE_TAG = "pyqgis_plugin"
+XML_ATTR_PREFIX = "@"
+XML_CDATA_KEY = "#text"
+XML_ID_KEYS = (
+    "@version",
+    "version",
+    "file_name",
+)  # always required for determining and validating a release's id
+XML_CHUNK_SIZE = 2 ** 16
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ZIP
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+METADATATXT_FN = "metadata.txt"
+HASH_BLOCK_SIZE = 2 ** 20
+SCAN_MANIFEST_VERSION = 1
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HTTP
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+REPO_DEFAULT_URL = "https://plugins.qgis.org/plugins/plugins.xml"
+HTTP_RETRY_STATUS = (
+    429,
+    500,
+    502,
+    503,
+    504,
+)
+SYNC_STATE_VERSION = 1
+SYNC_STATE_SAVE_INTERVAL = 64  # save state after this many downloads
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# REPOSITORY
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+SEARCH_WEIGHTS = {
+    "name": 8,
+    "tags": 4,
+    "description": 2,
+    "about": 1,
+}  # i18n fields in SPEC, ranking weights per token occurrence
+SEARCH_TOKEN_PATTERN = r"\w+"
+FACET_FIELDS = (
+    "tags",
+    "author",
+    "experimental",
+    "deprecated",
+    "server",
+    "hasProcessingProvider",
+    "qgisMinimumVersion",
+)
+MERGE_POLICIES = (
+    "xml",
+    "txt",
+    "report",
+)  # which value wins if plugins.xml and metadata.txt disagree, "report": neither
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# LINT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+LINT_RULES = (
+    "structure",  # records import_xml / from_metadatatxt can not read at all
+    "required_fields",
+    "bool_values",
+    "version_values",
+    "field_values",  # unparsable values of other known fields
+    "qgis_version_range",
+    "version_history",  # across records: versions must grow with create_date per plugin
+)
+LINT_CHUNK_SIZE = 256  # records per worker task
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLI
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+CLI_FORMATS = (
+    "xml",  # plugins.xml
+    "jsonl",  # one `as_dict` object per line
+    "txt",  # folder of metadata_<id>_<version>.txt or <id>/metadata.txt files
+)
+CLI_XML_IGNORED_FIELDS = ("email",)  # required, but never part of plugins.xml
+CLI_CHUNK_SIZE = 256  # records per worker task with --jobs
+SNAPSHOT_DIGEST_SIZE = 16  # bytes of BLAKE2b fingerprints of raw XML releases
+HISTORY_KEYFRAME_INTERVAL = 16  # releases per full copy in a release history
+HISTORY_MIN_SPLICE = 16  # shared prefix plus suffix (characters) worth a splice
+SHARD_BATCH_SIZE = 256  # records per message to a shard worker process
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/dependencies.py: Plugin dependency resolution
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .error import QgsPluginDependencyCycleError, QgsPluginDependencyError
+from .latest import QgsPluginLatestView
+from .version import QgsVersion
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginDependencyResolver:
+    """
+    Install sets of plugins: a release plus the releases of all its (transitive) dependencies
+
+    Dependencies (`plugin_dependencies`) refer to plugins by name like in QGIS' plugin
+    installer, plugin ids are accepted as well. Unpinned dependencies resolve to the newest
+    (stable) release compatible with `qgis_version`, pinned ones (`name==version`) to exactly
+    that version. Solutions and failures are memoized per plugin and pin, so resolving every
+    plugin of a repository solves every sub-graph once. Can be attached to a repository,
+    changes drop the memo.
+
+    Mutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        releases: typing.Iterable[QgsPluginMetadataABC] = tuple(),
+        qgis_version: typing.Union[None, str] = None,
+        stable: bool = False,
+    ):
+
+        self._qgis_version = qgis_version
+        self._stable = stable
+
+        self._latest = QgsPluginLatestView(qgis_version=qgis_version)
+        self._versions = {}  # id -> {normalized version: release}
+        self._names = {}  # plugin name -> {id: number of releases}
+        self._memo = {}  # (id, normalized pin or None) -> {id: release} or error
+
+        for release in releases:
+            self.add(release)
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginDependencyResolver plugins={len(self._versions):d} memo={len(self._memo):d}>"
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @staticmethod
+    def _fields(release):
+        "Plugin id, normalized version and name (or `None`) of a release"
+
+        fields = release._fields
+        if fields["version"]._value is None:
+            raise ValueError("release has no version")
+        name = fields["name"]._value if "name" in fields.keys() else None
+
+        return release._id, str(fields["version"]._value), name
+
+    def _plugin_id(self, name):
+
+        if name in self._versions.keys():
+            return name
+
+        ids = self._names.get(name, {})
+        if len(ids) == 0:
+            raise QgsPluginDependencyError(f'plugin "{name:s}" is unknown')
+        if len(ids) > 1:
+            raise QgsPluginDependencyError(
+                f'plugin name "{name:s}" is ambiguous: {", ".join(sorted(ids.keys())):s}'
+            )
+
+        return next(iter(ids.keys()))
+
+    def _select(self, plugin_id, pin):
+
+        if pin is None:
+            release = self._latest.latest(plugin_id, stable=self._stable)
+            if release is None:
+                raise QgsPluginDependencyError(
+                    f'plugin "{plugin_id:s}" has no compatible release'
+                )
+            return release
+
+        release = self._versions.get(plugin_id, {}).get(pin, None)
+        if release is None:
+            raise QgsPluginDependencyError(
+                f'plugin "{plugin_id:s}" has no release "{pin:s}"'
+            )
+        if self._qgis_version is not None and not release.is_compatible(
+            self._qgis_version
+        ):
+            raise QgsPluginDependencyError(
+                f'release "{pin:s}" of plugin "{plugin_id:s}" is not compatible'
+            )
+
+        return release
+
+    def _solve(self, key, path):
+        "Install set for (id, pin) in install order, `path` holds the keys being solved (cycles)"
+
+        solution = self._memo.get(key, None)
+        if isinstance(solution, QgsPluginDependencyError):
+            raise solution.with_traceback(None)
+        if solution is not None:
+            return solution
+
+        if key in path.keys():
+            cycle = [plugin_id for plugin_id, _ in path.keys()]
+            cycle = cycle[cycle.index(key[0]) :] + [key[0]]
+            raise QgsPluginDependencyCycleError(
+                f'dependency cycle: {" -> ".join(cycle):s}'
+            )
+
+        path[key] = None
+        try:
+            solution = self._solve_release(key[0], self._select(*key), path)
+        except QgsPluginDependencyError as error:
+            self._memo[key] = error
+            raise
+        finally:
+            path.pop(key)
+
+        self._memo[key] = solution
+
+        return solution
+
+    def _solve_release(self, plugin_id, release, path):
+
+        selected = {}  # id -> release, in install order
+
+        field = release._fields.get("plugin_dependencies", None)  # `fields` projection
+        dependencies = None if field is None else field._value
+        for name, pin in () if dependencies is None else dependencies:
+            key = (self._plugin_id(name), None if pin is None else str(pin))
+            for dependency_id, dependency in self._solve(key, path).items():
+                if selected.setdefault(dependency_id, dependency) is not dependency:
+                    raise QgsPluginDependencyError(
+                        f'plugin "{plugin_id:s}" needs conflicting releases of "{dependency_id:s}"'
+                    )
+
+        if selected.setdefault(plugin_id, release) is not release:
+            raise QgsPluginDependencyError(
+                f'plugin "{plugin_id:s}" needs another release of itself'
+            )
+
+        return selected  # memoized, never modified
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def add(self, release: QgsPluginMetadataABC):
+        "Tracks a release, replaces a tracked release with identical id and version"
+
+        plugin_id, version, name = self._fields(release)
+
+        if version in self._versions.get(plugin_id, {}).keys():
+            self.remove(self._versions[plugin_id][version])
+
+        self._latest.add(release)
+        self._versions.setdefault(plugin_id, {})[version] = release
+        if name is not None:
+            ids = self._names.setdefault(name, {})
+            ids[plugin_id] = ids.get(plugin_id, 0) + 1
+
+        self._memo.clear()
+
+    @typechecked
+    def remove(self, release: QgsPluginMetadataABC):
+        "Stops tracking a release"
+
+        plugin_id, version, name = self._fields(release)
+
+        versions = self._versions.get(plugin_id, {})
+        if versions.get(version, None) is not release:
+            return
+
+        self._latest.remove(release)
+        versions.pop(version)
+        if len(versions) == 0:
+            self._versions.pop(plugin_id)
+        if name is not None:
+            ids = self._names[name]
+            ids[plugin_id] -= 1
+            if ids[plugin_id] == 0:
+                ids.pop(plugin_id)
+            if len(ids) == 0:
+                self._names.pop(name)
+
+        self._memo.clear()
+
+    @typechecked
+    def resolve(
+        self, plugin: str, version: typing.Union[None, str] = None
+    ) -> typing.List[QgsPluginMetadataABC]:
+        """
+        Install set of a plugin (id or name) in install order, dependencies first,
+        the newest compatible release unless `version` is given. Raises
+        `QgsPluginDependencyError` (`QgsPluginDependencyCycleError` for cycles).
+        """
+
+        pin = None if version is None else str(QgsVersion.from_pluginversion(version))
+
+        return list(self._solve((self._plugin_id(plugin), pin), {}).values())
+
+    @typechecked
+    def resolve_all(
+        self,
+    ) -> typing.Dict[
+        str, typing.Union[typing.List[QgsPluginMetadataABC], QgsPluginDependencyError]
+    ]:
+        "Install sets of the newest compatible release of every plugin by id, errors instead of raising"
+
+        solutions = {}
+
+        for plugin_id in sorted(self._versions.keys()):
+            if self._latest.latest(plugin_id, stable=self._stable) is None:
+                continue
+            try:
+                solutions[plugin_id] = list(self._solve((plugin_id, None), {}).values())
+            except QgsPluginDependencyError as error:
+                solutions[plugin_id] = error
+
+        return solutions
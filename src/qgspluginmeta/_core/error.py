@@ -35,3 +35,11 @@ class QgsBoolValueError(ValueError):
 
 class QgsVersionValueError(ValueError):
     pass
+
+
+class QgsPluginDependencyError(ValueError):
+    pass
+
+
+class QgsPluginDependencyCycleError(QgsPluginDependencyError):
+    pass
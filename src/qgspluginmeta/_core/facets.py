@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/facets.py: Faceted aggregation over plugin releases
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .const import FACET_FIELDS
+from .repository import QgsPluginRepository
+from .version import QgsVersion
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginFacets:
+    """
+    Counts of plugin releases by tag, author, flags and minimum QGIS version
+
+    Every release occupies one bit. Per facet value, a bitset (`int`) of releases and a
+    counter are maintained incrementally, so combined queries are bitwise operations.
+    Tags are case folded, versions are original strings, unset flags use SPEC defaults.
+    Can be attached to a repository.
+
+    Mutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    @typechecked
+    def __init__(self, releases: typing.Iterable[QgsPluginMetadataABC] = tuple()):
+
+        self._slots = {}  # key -> slot
+        self._releases = []  # slot -> release or None
+        self._free = []  # unused slots
+        self._values = []  # slot -> {facet: tuple of values}
+        self._all = 0  # bitset of used slots
+
+        self._bits = {facet: {} for facet in FACET_FIELDS}  # facet -> value -> bitset
+        self._counts = {facet: {} for facet in FACET_FIELDS}  # facet -> value -> count
+
+        self._ranges = {}  # compatibility range -> bitset
+        self._compatible = {}  # (QGIS version, compatibility range) -> bool
+
+        for release in releases:
+            self.add(release)
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginFacets releases={len(self):d}>"
+
+    def __len__(self) -> int:
+
+        return len(self._slots)
+
+    @staticmethod
+    def _facet_values(
+        release: QgsPluginMetadataABC,
+    ) -> typing.Dict[str, typing.Tuple[typing.Any, ...]]:
+
+        values = {}
+
+        for facet in FACET_FIELDS:
+            if facet not in release.keys():
+                values[facet] = tuple()
+                continue
+            field = release[facet]
+            value = field.value if field.value_set else field.default_value
+            if value is None:
+                values[facet] = tuple()
+            elif facet == "tags":
+                values[facet] = tuple(
+                    sorted({tag.strip().casefold() for tag in value} - {""})
+                )
+            elif isinstance(value, QgsVersion):
+                values[facet] = (value.original,)
+            else:
+                values[facet] = (value,)
+
+        return values
+
+    @staticmethod
+    def _update(
+        bits: typing.Dict, counts: typing.Dict, value: typing.Any, bit: int, delta: int
+    ):
+
+        bits[value] = bits.get(value, 0) ^ bit
+        counts[value] = counts.get(value, 0) + delta
+
+        if counts[value] == 0:
+            bits.pop(value)
+            counts.pop(value)
+
+    def _compatible_bits(self, qgis_version: str) -> int:
+
+        bits = 0
+
+        for compatibility_range, range_bits in self._ranges.items():
+            key = (qgis_version, compatibility_range)
+            compatible = self._compatible.get(key, None)
+            if compatible is None:
+                compatible = self._compatible[key] = self._in_range(
+                    qgis_version, compatibility_range
+                )
+            if compatible:
+                bits |= range_bits
+
+        return bits
+
+    @staticmethod
+    def _in_range(
+        qgis_version: str,
+        compatibility_range: typing.Tuple[
+            typing.Tuple[int, ...], typing.Tuple[int, ...]
+        ],
+    ) -> bool:
+
+        current = tuple(
+            int(element)
+            for element in QgsVersion.from_qgisversion(
+                qgis_version, fix_plugin_compatibility=True
+            )
+        )
+        minimum, maximum = compatibility_range
+
+        return minimum <= current <= maximum
+
+    @staticmethod
+    def _iter_slots(bits: int) -> typing.Generator[int, None, None]:
+
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def add(self, release: QgsPluginMetadataABC):
+        "Counts a release, replaces a counted release with identical id and version"
+
+        key = QgsPluginRepository.key(release)
+
+        if key in self._slots.keys():
+            self.remove(release)
+
+        if len(self._free) > 0:
+            slot = self._free.pop()
+        else:
+            slot = len(self._releases)
+            self._releases.append(None)
+            self._values.append(None)
+
+        bit = 1 << slot
+        values = self._facet_values(release)
+        compatibility_range = (
+            release.compatibility_range()
+            if "qgisMinimumVersion" in release.keys()
+            else None  # not projected, like an unknown range
+        )
+
+        self._slots[key] = slot
+        self._releases[slot] = release
+        self._values[slot] = (values, compatibility_range)
+        self._all |= bit
+
+        for facet, facet_values in values.items():
+            for value in facet_values:
+                self._update(self._bits[facet], self._counts[facet], value, bit, 1)
+        if compatibility_range is not None:
+            self._ranges[compatibility_range] = (
+                self._ranges.get(compatibility_range, 0) | bit
+            )
+
+    @typechecked
+    def remove(self, release: QgsPluginMetadataABC):
+        "Drops a release from all counts"
+
+        slot = self._slots.pop(QgsPluginRepository.key(release))
+        bit = 1 << slot
+        values, compatibility_range = self._values[slot]
+
+        for facet, facet_values in values.items():
+            for value in facet_values:
+                self._update(self._bits[facet], self._counts[facet], value, bit, -1)
+        if compatibility_range is not None:
+            self._ranges[compatibility_range] ^= bit
+            if self._ranges[compatibility_range] == 0:
+                self._ranges.pop(compatibility_range)
+
+        self._releases[slot] = None
+        self._values[slot] = None
+        self._free.append(slot)
+        self._all ^= bit
+
+    @typechecked
+    def select(
+        self, qgis_version: typing.Union[None, str] = None, **criteria: typing.Any
+    ) -> int:
+        """
+        Returns the bitset of releases matching all criteria
+
+        Criteria are facet names with a value or a tuple of alternative values,
+        e.g. `select(tags="raster", deprecated=False, qgis_version="3.28")`.
+        """
+
+        bits = self._all
+
+        for facet, value in criteria.items():
+            if facet not in self._bits.keys():
+                raise KeyError(f'unknown facet "{facet:s}"')
+            alternatives = value if isinstance(value, tuple) else (value,)
+            if facet == "tags":
+                alternatives = tuple(tag.casefold() for tag in alternatives)
+            facet_bits = 0
+            for alternative in alternatives:
+                facet_bits |= self._bits[facet].get(alternative, 0)
+            bits &= facet_bits
+
+        if qgis_version is not None:
+            bits &= self._compatible_bits(qgis_version)
+
+        return bits
+
+    @typechecked
+    def count(
+        self, qgis_version: typing.Union[None, str] = None, **criteria: typing.Any
+    ) -> int:
+        "Number of releases matching all criteria"
+
+        return bin(self.select(qgis_version=qgis_version, **criteria)).count("1")
+
+    @typechecked
+    def counts(
+        self,
+        facet: str,
+        qgis_version: typing.Union[None, str] = None,
+        **criteria: typing.Any,
+    ) -> typing.Dict[typing.Any, int]:
+        "Counts per value of a facet, among releases matching all criteria, largest first"
+
+        if facet not in self._counts.keys():
+            raise KeyError(f'unknown facet "{facet:s}"')
+
+        if qgis_version is None and len(criteria) == 0:
+            counts = self._counts[facet]  # maintained incrementally
+        else:
+            bits = self.select(qgis_version=qgis_version, **criteria)
+            counts = {
+                value: bin(value_bits & bits).count("1")
+                for value, value_bits in self._bits[facet].items()
+            }
+
+        return {
+            value: count
+            for value, count in sorted(
+                counts.items(), key=lambda item: (-item[1], str(item[0]))
+            )
+            if count > 0
+        }
+
+    @typechecked
+    def releases(self, bits: int) -> typing.List[QgsPluginMetadataABC]:
+        "Releases in a bitset returned by `select`"
+
+        return [self._releases[slot] for slot in self._iter_slots(bits)]
@@ -220,6 +220,44 @@ class QgsPluginMetadataField(QgsPluginMetadataFieldABC):
     # PRE-CONSTRUCTOR
     # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+    @staticmethod
+    def _template(
+        name,
+        dtype,
+        name_xml=None,
+        default_value=None,
+        importer=None,
+        exporter=None,
+        is_required=False,
+        i18n=False,
+        known=True,
+        comment="",
+    ):
+        "Attributes of a field without value, for `_from_template` (not type-checked, hot)"
+
+        return dict(
+            _name=name,
+            _name_xml=name if name_xml is None else name_xml,
+            _dtype=dtype,
+            _importer=importer,
+            _exporter=exporter,
+            _is_required=is_required,
+            _known=known,
+            _i18n=i18n,
+            _comment=comment,
+            _default_value=default_value,
+        )
+
+    @classmethod
+    def _from_template(cls, template, value):
+        "Builds a field around an already validated value, skips all checks (not type-checked, hot)"
+
+        field = cls.__new__(cls)
+        field.__dict__.update(template)
+        field._value = value
+
+        return field
+
     @classmethod
     def from_unknown(cls, name: str, value: typing.Any) -> QgsPluginMetadataFieldABC:
 
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/footprint.py: Deep memory footprint of meta data objects
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import sys
+import types
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC, QgsVersionABC
+from .frozen import QgsPluginMetadataFrozen
+from .spec import SPEC
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+FOOTPRINT_CATEGORIES = ("containers", "fields", "strings", "versions", "tags", "other")
+
+_SHARED_TYPES = (
+    type,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.ModuleType,
+)
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _shared_ids() -> typing.Set[int]:
+    "Objects owned by the spec or the interpreter, not by meta data objects"
+
+    shared = {id(None), id(True), id(False)}
+
+    for field in SPEC:
+        shared.add(id(field))
+        shared.update(id(value) for value in field.keys())
+        shared.update(id(value) for value in field.values())
+
+    return shared
+
+
+def _deep_sizeof(obj: typing.Any, seen: typing.Set[int]) -> int:
+    "Size of `obj` and everything it references, each object counted once"
+
+    if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(
+            _deep_sizeof(key, seen) + _deep_sizeof(value, seen)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif not isinstance(obj, (str, bytes, int, float)):
+        if hasattr(obj, "__dict__"):
+            size += _deep_sizeof(vars(obj), seen)
+        for name in getattr(type(obj), "__slots__", tuple()):
+            if hasattr(obj, name):
+                size += _deep_sizeof(getattr(obj, name), seen)
+
+    return size
+
+
+def _shallow_sizeof(obj: typing.Any, seen: typing.Set[int]) -> int:
+    "Size of `obj` and its attribute dict, not of its attributes"
+
+    seen.add(id(obj))
+
+    if not hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj)
+
+    seen.add(id(vars(obj)))
+
+    return sys.getsizeof(obj) + sys.getsizeof(vars(obj))
+
+
+def _spec_category(field: typing.Dict[str, typing.Any]) -> str:
+
+    if field["name"] == "tags":
+        return "tags"
+    if field["dtype"] is str:
+        return "strings"
+    if issubclass(field["dtype"], QgsVersionABC):
+        return "versions"
+    return "other"  # e.g. bools, plugin_dependencies
+
+
+_FIELD_CATEGORIES = {field["name"]: _spec_category(field) for field in SPEC}
+
+
+def _value_category(name: str, value: typing.Any) -> str:
+    "Category by field name from the spec, by value type for unknown fields"
+
+    if name in _FIELD_CATEGORIES.keys():
+        return _FIELD_CATEGORIES[name]
+    if isinstance(value, str):
+        return "strings"
+    return "other"
+
+
+@typechecked
+def get_footprint(
+    metadata: typing.Union[
+        QgsPluginMetadataABC,
+        QgsPluginMetadataFrozen,
+        typing.Iterable[QgsPluginMetadataABC],
+        typing.Iterable[QgsPluginMetadataFrozen],
+        typing.Mapping[typing.Any, QgsPluginMetadataABC],
+        typing.Mapping[typing.Any, QgsPluginMetadataFrozen],
+    ],
+) -> typing.Dict[str, typing.Any]:
+    """
+    Reports the deep memory footprint of meta data objects in bytes
+
+    `metadata` can be a single meta data object, a list like returned by `import_xml` or
+    a mapping (repository) of meta data objects, all of them also of frozen snapshots
+    (which have no field objects). Objects shared by several releases are
+    counted once. The result holds the `total`, a breakdown by category and a ranking of
+    fields by memory consumption.
+    """
+
+    if isinstance(metadata, (QgsPluginMetadataABC, QgsPluginMetadataFrozen)):
+        metadata = [metadata]  # before Mapping, snapshots are mappings of values
+    elif isinstance(metadata, typing.Mapping):
+        metadata = metadata.values()
+
+    seen = _shared_ids()
+    categories = {category: 0 for category in FOOTPRINT_CATEGORIES}
+    fields = {}
+    releases = 0
+
+    for meta in metadata:
+        releases += 1
+        if isinstance(meta, QgsPluginMetadataFrozen):
+            categories["containers"] += sum(
+                _shallow_sizeof(container, seen)
+                for container in (meta, meta._names, meta._values, meta._index)
+            )
+            for key, value in zip(meta._names, meta._values):
+                value_size = _deep_sizeof(value, seen)
+                categories["containers"] += _deep_sizeof(key, seen)
+                categories[_value_category(key, value)] += value_size
+                fields[key] = fields.get(key, 0) + value_size
+            continue
+        categories["containers"] += _shallow_sizeof(meta, seen) + _shallow_sizeof(
+            meta._fields, seen
+        )
+        for key, field in meta._fields.items():  # bypasses typechecked accessors
+            field_size = _shallow_sizeof(field, seen) + sum(
+                _deep_sizeof(value, seen)
+                for name, value in vars(field).items()
+                if name not in ("_value", "_default_value")
+            )
+            value_size = _deep_sizeof(field._value, seen) + _deep_sizeof(
+                field._default_value, seen
+            )
+            categories["containers"] += _deep_sizeof(key, seen)
+            categories["fields"] += field_size
+            categories[_value_category(key, field._value)] += value_size
+            fields[key] = fields.get(key, 0) + field_size + value_size
+
+    return {
+        "total": sum(categories.values()),
+        "releases": releases,
+        "categories": categories,
+        "fields": dict(sorted(fields.items(), key=lambda item: item[1], reverse=True)),
+    }
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/frozen.py: Immutable, hashable meta data snapshots
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from collections.abc import Mapping
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC, QgsVersionABC
+from .spec import SPEC, SPEC_BY_NAME
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_ORDER = {field["name"]: position for position, field in enumerate(SPEC)}
+
+_NAMES = {}  # interned canonical tuples of field names, shared by snapshots
+_INDEXES = {}  # canonical tuple of field names -> {name: position}, shared by snapshots
+_LAYOUTS = {}  # tuple of field names -> (canonical names, index, reordering or None)
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginMetadataFrozen(Mapping):
+    """
+    Immutable snapshot of the meta data of one plugin release, see `QgsPluginMetadata.freeze`
+
+    A read-only mapping of field names to values (`None` if not set). Values (strings,
+    `QgsVersion` objects, tag tuples) are shared with the meta data object it was taken
+    from, field name tuples are shared between snapshots. Fields are kept in canonical
+    order (SPEC order, then unknown fields sorted by name), so equality and hash are based
+    on content only. Snapshots can be dict keys and can be shared between threads without
+    locks.
+
+    Immutable.
+    """
+
+    __slots__ = ("_names", "_values", "_index", "_hash")
+
+    def __init__(self, names: typing.Tuple[str, ...], values: typing.Tuple):
+
+        if len(names) != len(values):
+            raise ValueError("names and values do not match")
+
+        layout = _LAYOUTS.get(names, None)
+        if layout is None:
+            layout = self._layout(names)
+        names, index, order = layout
+        if order is not None:
+            values = tuple(values[position] for position in order)
+
+        object.__setattr__(self, "_names", names)
+        object.__setattr__(self, "_values", values)
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "_hash", None)
+
+    def __setattr__(self, name, value):
+
+        raise AttributeError("snapshot is immutable")
+
+    def __delattr__(self, name):
+
+        raise AttributeError("snapshot is immutable")
+
+    def __repr__(self) -> str:
+
+        return f'<QgsPluginMetadataFrozen id="{self["id"]:s}">'
+
+    def __getitem__(self, name):
+
+        return self._values[self._index[name]]
+
+    def __iter__(self):
+
+        return iter(self._names)
+
+    def __len__(self):
+
+        return len(self._names)
+
+    def __contains__(self, name):
+
+        return name in self._index
+
+    def __eq__(self, other):
+
+        if not isinstance(other, QgsPluginMetadataFrozen):
+            return NotImplemented
+        if self is other:
+            return True
+
+        return self._names == other._names and self._content() == other._content()
+
+    def __ne__(self, other):
+
+        equal = self.__eq__(other)
+
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash((self._names, self._content())))
+
+        return self._hash
+
+    def __reduce__(self):
+
+        return type(self), (self._names, self._values)
+
+    @staticmethod
+    def _layout(names: typing.Tuple[str, ...]) -> typing.Tuple:
+        "Canonical order of field names, their index and how to reorder values into it"
+
+        canonical = tuple(
+            sorted(
+                names, key=lambda name: (name not in _ORDER, _ORDER.get(name, 0), name)
+            )
+        )
+        canonical = _NAMES.setdefault(canonical, canonical)
+        index = _INDEXES.get(canonical, None)
+        if index is None:
+            index = _INDEXES[canonical] = {
+                name: position for position, name in enumerate(canonical)
+            }
+        order = (
+            None
+            if canonical == names
+            else tuple(names.index(name) for name in canonical)
+        )
+
+        layout = _LAYOUTS[names] = canonical, index, order
+        return layout
+
+    def _content(self) -> typing.Tuple:
+        "Values, versions as elements plus original string (`QgsVersion` is not hashable)"
+
+        return tuple(self._hashable(value) for value in self._values)
+
+    @classmethod
+    def _hashable(cls, value):
+
+        if isinstance(value, QgsVersionABC):
+            return tuple(value), value.original
+        if type(value) is tuple and len(value) > 0 and type(value[0]) is tuple:
+            return tuple(
+                (name, None if pin is None else cls._hashable(pin))
+                for name, pin in value
+            )  # plugin_dependencies, pins are versions
+
+        return value
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @property
+    def id(self) -> str:
+
+        return self["id"]
+
+    @typechecked
+    def as_dict(self) -> typing.Dict[str, str]:
+        "Export meta data to JSON-serializable dict (strings), like `QgsPluginMetadata.as_dict`"
+
+        exported = {}
+
+        for name, value in zip(self._names, self._values):
+            if value is None:
+                continue
+            exporter = SPEC_BY_NAME.get(name, {}).get("exporter", None)
+            exported[name] = str(value) if exporter is None else exporter(value)
+
+        return exported
+
+    @typechecked
+    def thaw(self) -> QgsPluginMetadataABC:
+        "Mutable meta data object with the content of this snapshot"
+
+        from .metadata import QgsPluginMetadata  # circular
+
+        return QgsPluginMetadata._thaw(self)
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/harvest.py: Asynchronous harvesting of plugins.xml and metadata.txt files
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import asyncio
+import itertools
+import typing
+
+from typeguard import typechecked
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency, see extra "harvest"
+    aiohttp = None
+
+from .abc import QgsPluginMetadataABC
+from .archive import read_zip_metadatatxt
+from .const import HTTP_RETRY_STATUS, REPO_DEFAULT_URL
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class QgsPluginHarvester:
+    """
+    Harvests `plugins.xml` feeds and the `metadata.txt` files of their releases (asyncio)
+
+    All requests share one connection pool, limited in total (`concurrency`) and per host.
+    Connection errors, time-outs and HTTP 429/5xx are retried with exponential backoff.
+    Failed downloads, including HTTP 404 and zip files without `metadata.txt`, are collected
+    in `errors` instead of being raised. Requires `aiohttp`, must be used as an async context
+    manager.
+
+    Mutable.
+    """
+
+    def __init__(
+        self,
+        repo_url: str = REPO_DEFAULT_URL,
+        concurrency: int = 16,
+        limit_per_host: int = 8,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 300.0,
+    ):
+
+        if aiohttp is None:
+            raise ImportError('QgsPluginHarvester requires "aiohttp"')
+        if concurrency < 1 or limit_per_host < 1:
+            raise ValueError('"concurrency" and "limit_per_host" must be at least 1')
+        if retries < 0:
+            raise ValueError('"retries" must not be negative')
+
+        self._repo_url = repo_url
+        self._concurrency = concurrency
+        self._limit_per_host = limit_per_host
+        self._retries = retries
+        self._backoff = backoff
+        self._timeout = timeout
+
+        self._session = None
+        self._errors = {}
+
+    def __repr__(self) -> str:
+
+        return f'<QgsPluginHarvester repo_url="{self._repo_url:s}">'
+
+    async def __aenter__(self) -> "QgsPluginHarvester":
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self._concurrency, limit_per_host=self._limit_per_host
+            ),
+            timeout=aiohttp.ClientTimeout(total=self._timeout),
+        )
+
+        return self
+
+    async def __aexit__(self, *args: typing.Any):
+
+        await self._session.close()
+        self._session = None
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def _retryable(self, e: Exception) -> bool:
+
+        if isinstance(e, aiohttp.ClientResponseError):
+            return e.status in HTTP_RETRY_STATUS
+
+        return isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    async def _request(
+        self, url: str, headers: typing.Union[None, typing.Dict[str, str]] = None
+    ) -> typing.Tuple[int, typing.Mapping[str, str], bytes]:
+        "GET with retries, raises for HTTP errors, returns status, headers and body"
+
+        if self._session is None:
+            raise RuntimeError("harvester is not open, use it as a context manager")
+
+        for attempt in itertools.count():
+            try:
+                async with self._session.get(url, headers=headers) as response:
+                    response.raise_for_status()
+                    return (
+                        response.status,
+                        response.headers,
+                        await response.read(),
+                    )
+            except Exception as e:
+                if attempt >= self._retries or not self._retryable(e):
+                    raise
+            await asyncio.sleep(self._backoff * 2**attempt)
+
+    @staticmethod
+    async def _blocking(func: typing.Callable, *args: typing.Any) -> typing.Any:
+        "Runs blocking work (decompression, file I/O) in the default executor, off the event loop"
+
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _get(self, url: str) -> bytes:
+
+        _, _, data = await self._request(url)
+
+        return data
+
+    async def _run(
+        self, jobs: typing.Iterator[typing.Tuple[str, typing.Awaitable]]
+    ) -> typing.AsyncGenerator[typing.Tuple[str, typing.Any], None]:
+        "Runs (url, awaitable) jobs with bounded concurrency, yields (url, result) as completed"
+
+        pending = {}
+
+        try:
+            while True:
+                for url, job in itertools.islice(
+                    jobs, self._concurrency - len(pending)
+                ):
+                    pending[asyncio.ensure_future(job)] = url
+                if len(pending) == 0:
+                    return
+                done, _ = await asyncio.wait(
+                    pending.keys(), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    url = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        self._errors[url] = e
+                        continue
+                    yield url, result
+        finally:
+            for task in pending.keys():
+                task.cancel()
+
+    async def _get_metadatatxt(self, release: QgsPluginMetadataABC) -> str:
+
+        data = await self._get(release["download_url"].value)
+        _, metadatatxt_string = await self._blocking(
+            read_zip_metadatatxt, data, release["id"].value
+        )
+
+        return metadatatxt_string
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def xml_url(self, qgis_version: str) -> str:
+        "URL of `plugins.xml` for a QGIS version"
+
+        return f"{self._repo_url:s}?qgis={qgis_version:s}"
+
+    async def harvest_xml(
+        self, qgis_versions: typing.Iterable[str]
+    ) -> typing.AsyncGenerator[typing.Tuple[str, str], None]:
+        "Yields tuples of QGIS version and `plugins.xml` string in order of completion"
+
+        urls = {
+            self.xml_url(qgis_version): qgis_version for qgis_version in qgis_versions
+        }
+
+        async for url, data in self._run((url, self._get(url)) for url in urls.keys()):
+            yield urls[url], data.decode("utf-8")
+
+    async def harvest_metadatatxt(
+        self, releases: typing.Iterable[QgsPluginMetadataABC]
+    ) -> typing.AsyncGenerator[typing.Tuple[QgsPluginMetadataABC, str], None]:
+        """
+        Yields tuples of release and `metadata.txt` string in order of completion
+
+        Releases require fields `id` and `download_url`, e.g. from
+        `import_xml(xml_string, fields=("version", "download_url"))`.
+        """
+
+        releases = {release["download_url"].value: release for release in releases}
+
+        async for url, metadatatxt_string in self._run(
+            (url, self._get_metadatatxt(release)) for url, release in releases.items()
+        ):
+            yield releases[url], metadatatxt_string
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # PROPERTIES
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @property
+    def errors(self) -> typing.Dict[str, Exception]:
+        "Failed downloads by URL"
+        return self._errors.copy()
@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/history.py: Delta-compressed release history of one plugin
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC, QgsVersionABC
+from .const import HISTORY_KEYFRAME_INTERVAL, HISTORY_MIN_SPLICE
+from .frozen import QgsPluginMetadataFrozen
+from .spec import SPEC_BY_NAME
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_MISSING = object()
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginReleaseHistory:
+    """
+    All releases of one plugin ordered by version, stored as field-level deltas
+
+    Every `keyframe_interval`-th release is a keyframe holding all values, the others only
+    hold fields which changed against the previous release. Changed strings which share a
+    long prefix and / or suffix with their predecessor (e.g. a growing `changelog`) are
+    stored as splices `[prefix length, suffix length, new middle]`. Unchanged values are
+    shared between reconstructed releases. Reconstructing one release applies at most
+    `keyframe_interval - 1` deltas, iterating all releases applies every delta once.
+
+    Mutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    def __init__(
+        self,
+        releases: typing.Iterable[
+            typing.Union[QgsPluginMetadataABC, QgsPluginMetadataFrozen]
+        ] = (),
+        keyframe_interval: int = HISTORY_KEYFRAME_INTERVAL,
+    ):
+
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+
+        self._interval = keyframe_interval
+        self._clear()
+
+        frozens = [
+            (
+                release
+                if isinstance(release, QgsPluginMetadataFrozen)
+                else release.freeze()
+            )
+            for release in releases
+        ]
+        frozens.sort(key=lambda frozen: frozen["version"])
+
+        for frozen in frozens:
+            self._append(frozen, ordered=True)  # sorted, saves slow comparisons
+
+    def __repr__(self) -> str:
+
+        return f'<QgsPluginReleaseHistory id="{self._id!s}" releases={len(self._entries):d}>'
+
+    def __len__(self) -> int:
+
+        return len(self._entries)
+
+    def __iter__(self) -> typing.Iterator[QgsPluginMetadataFrozen]:
+
+        return self._iter_from(0)
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def _clear(self):
+
+        self._id = None
+        self._versions = []  # QgsVersion per release, ascending
+        # (names, keyframe {name: value} or delta {name: op}) per release
+        self._entries = []
+        self._tail = None  # {name: value} of the last release, for appending
+
+    @staticmethod
+    def _same(old, new):
+
+        if old is new:
+            return True
+        if isinstance(old, QgsVersionABC) and isinstance(new, QgsVersionABC):
+            return old.original == new.original
+        if type(old) is tuple and type(new) is tuple:  # tags, plugin_dependencies
+            hashable = QgsPluginMetadataFrozen._hashable
+            return hashable(old) == hashable(new)
+
+        return type(old) is type(new) and old == new
+
+    @staticmethod
+    def _common_prefix(a, b, limit):
+
+        low, high = 0, limit  # binary search over slice comparisons, which run in C
+        while low < high:
+            middle = (low + high + 1) // 2
+            if a[:middle] == b[:middle]:
+                low = middle
+            else:
+                high = middle - 1
+
+        return low
+
+    @staticmethod
+    def _common_suffix(a, b, limit):
+
+        len_a, len_b = len(a), len(b)
+        low, high = 0, limit
+        while low < high:
+            middle = (low + high + 1) // 2
+            if a[len_a - middle :] == b[len_b - middle :]:
+                low = middle
+            else:
+                high = middle - 1
+
+        return low
+
+    @classmethod
+    def _op(cls, old, new):
+        "Delta operation turning old into new value: a splice (list) or the new value itself"
+
+        if (
+            type(old) is not str
+            or type(new) is not str
+            or len(new) < HISTORY_MIN_SPLICE
+        ):
+            return new
+
+        limit = min(len(old), len(new))
+        prefix = cls._common_prefix(old, new, limit)
+        suffix = cls._common_suffix(old, new, limit - prefix)
+
+        if prefix + suffix < HISTORY_MIN_SPLICE:
+            return new
+
+        return [prefix, suffix, new[prefix : len(new) - suffix]]
+
+    @staticmethod
+    def _apply(names, delta, previous):
+
+        current = {}
+
+        for name in names:
+            op = delta.get(name, _MISSING)
+            if op is _MISSING:
+                current[name] = previous[name]
+            elif type(op) is list:
+                old = previous[name]
+                current[name] = old[: op[0]] + op[2] + old[len(old) - op[1] :]
+            else:
+                current[name] = op
+
+        return current
+
+    def _delta(self, names, values):
+
+        previous = self._tail
+        delta = {}
+
+        for name, value in zip(names, values):
+            old = previous.get(name, _MISSING)
+            if old is _MISSING:
+                delta[name] = value
+            elif not self._same(old, value):
+                delta[name] = self._op(old, value)
+
+        return delta
+
+    def _append(self, frozen, ordered=False):
+
+        if self._id is None:
+            self._id = frozen["id"]
+        elif frozen["id"] != self._id:
+            raise ValueError(
+                f'release of "{frozen["id"]:s}" in history of "{self._id:s}"'
+            )
+
+        version = frozen["version"]
+        if len(self._versions) > 0:
+            last = self._versions[-1]
+            if str(last) == str(version):  # equal, cheaper than `==`
+                raise ValueError(f'version "{version.original:s}" already in history')
+            if not ordered and not last < version:
+                raise ValueError(
+                    f'version "{version.original:s}" is older than "{last.original:s}"'
+                )
+
+        names, values = frozen._names, frozen._values
+
+        tail = dict(zip(names, values))
+        entry = (
+            tail  # never mutated, shared
+            if len(self._entries) % self._interval == 0
+            else self._delta(names, values)
+        )
+
+        self._versions.append(version)
+        self._entries.append((names, entry))
+        self._tail = tail
+
+    def _keyframe(self, index):
+
+        return index - index % self._interval
+
+    def _iter_from(self, index):
+
+        current = None
+
+        for position in range(index, len(self._entries)):
+            names, entry = self._entries[position]
+            if position % self._interval == 0:
+                current = entry
+            else:
+                current = self._apply(names, entry, current)
+            yield QgsPluginMetadataFrozen(names, tuple(current[name] for name in names))
+
+    @staticmethod
+    def _export_value(name, value):
+
+        if value is None or type(value) is list:
+            return value
+        exporter = SPEC_BY_NAME.get(name, {}).get("exporter", None)
+
+        return str(value) if exporter is None else exporter(value)
+
+    @staticmethod
+    def _import_value(name, value):
+
+        if value is None or type(value) is list:
+            return value
+        spec = SPEC_BY_NAME.get(name, None)
+        if spec is None:
+            return value  # unknown fields are strings
+        importer = spec.get("importer", None)
+
+        return spec["dtype"](value) if importer is None else importer(value)
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def add(self, release: typing.Union[QgsPluginMetadataABC, QgsPluginMetadataFrozen]):
+        "Adds a release, appended as delta if it is the newest, otherwise the history is rebuilt"
+
+        frozen = (
+            release
+            if isinstance(release, QgsPluginMetadataFrozen)
+            else release.freeze()
+        )
+
+        if len(self._versions) == 0 or self._versions[-1] < frozen["version"]:
+            self._append(frozen)
+            return
+
+        frozens = list(self._iter_from(0))
+        frozens.append(frozen)
+        rebuilt = type(self)(frozens, self._interval)  # raises before touching self
+
+        self._id, self._versions = rebuilt._id, rebuilt._versions
+        self._entries, self._tail = rebuilt._entries, rebuilt._tail
+
+    @typechecked
+    def release(self, index: int) -> QgsPluginMetadataFrozen:
+        "Reconstructs the release at position `index` (ascending version order, negative from the end)"
+
+        if index < 0:
+            index += len(self._entries)
+        if not 0 <= index < len(self._entries):
+            raise IndexError("release index out of range")
+
+        keyframe = self._keyframe(index)
+        current = self._entries[keyframe][1]
+        for position in range(keyframe + 1, index + 1):
+            names, delta = self._entries[position]
+            current = self._apply(names, delta, current)
+
+        names = self._entries[index][0]
+
+        return QgsPluginMetadataFrozen(names, tuple(current[name] for name in names))
+
+    @typechecked
+    def releases(self, start: int = 0) -> typing.Iterator[QgsPluginMetadataFrozen]:
+        "Reconstructs releases from position `start` on in ascending version order, `thaw` them for editing"
+
+        if start < 0:
+            start = max(0, start + len(self._entries))
+        if start >= len(self._entries):
+            return iter(())
+
+        keyframe = self._keyframe(start)
+        releases = self._iter_from(keyframe)
+        for _ in range(start - keyframe):
+            next(releases)
+
+        return releases
+
+    @property
+    def id(self) -> typing.Union[None, str]:
+        "Plugin id, `None` while empty"
+
+        return self._id
+
+    @property
+    def keyframe_interval(self) -> int:
+
+        return self._interval
+
+    @property
+    def versions(self) -> typing.List[QgsVersionABC]:
+        "Versions of all releases, ascending"
+
+        return self._versions.copy()
+
+    @typechecked
+    def as_json(self) -> str:
+        """
+        Exports the history as compact JSON: keyframes as objects of exported values
+        (unset fields left out), deltas as objects of changed values and splices, plus
+        a list of field names wherever the fields differ from the keys or the previous release
+        """
+
+        entries = []
+        previous_names = None
+
+        for position, (names, entry) in enumerate(self._entries):
+            if position % self._interval == 0:
+                exported = {
+                    name: self._export_value(name, value)
+                    for name, value in entry.items()
+                    if value is not None
+                }
+                item = {"k": exported}
+                if tuple(exported.keys()) != names:
+                    item["n"] = list(names)
+            else:
+                exported = {
+                    name: self._export_value(name, value)
+                    for name, value in entry.items()
+                }
+                item = {"d": exported}
+                if names != previous_names:
+                    item["n"] = list(names)
+            entries.append(item)
+            previous_names = names
+
+        return json.dumps(
+            {"id": self._id, "keyframe_interval": self._interval, "releases": entries},
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    @typechecked
+    def from_json(cls, json_string: str) -> "QgsPluginReleaseHistory":
+        "Loads a history exported by `as_json`"
+
+        data = json.loads(json_string)
+        history = cls(keyframe_interval=data["keyframe_interval"])
+        names = None
+
+        for position, entry in enumerate(data["releases"]):
+            is_keyframe = position % history._interval == 0
+            if is_keyframe != ("k" in entry.keys()):
+                raise ValueError(
+                    f"release {position:d}: keyframes expected at every {history._interval:d}th release"
+                )
+            values = entry["k"] if is_keyframe else entry["d"]
+            names = tuple(
+                entry["n"]
+                if "n" in entry.keys()
+                else values.keys() if is_keyframe else names
+            )
+            imported = {
+                name: cls._import_value(name, value) for name, value in values.items()
+            }
+            if is_keyframe:
+                current = {name: imported.get(name, None) for name in names}
+            else:
+                current = cls._apply(names, imported, history._tail)
+            history._append(
+                QgsPluginMetadataFrozen(names, tuple(current[name] for name in names))
+            )
+
+        if history._id != data["id"]:
+            raise ValueError("id does not match releases")
+
+        return history
+
+    @typechecked
+    def stats(self) -> typing.Dict[str, typing.Union[int, float]]:
+        """
+        Numbers of releases, keyframes, changed fields and splices, plus the size of the
+        plain `as_dict` form (JSON list) against `as_json` in bytes and their ratio
+        """
+
+        deltas = [
+            entry
+            for position, (_, entry) in enumerate(self._entries)
+            if position % self._interval != 0
+        ]
+
+        plain_bytes = len(
+            json.dumps(
+                [release.as_dict() for release in self._iter_from(0)],
+                separators=(",", ":"),
+                ensure_ascii=False,
+            ).encode("utf-8")
+        )
+        stored_bytes = len(self.as_json().encode("utf-8"))
+
+        return {
+            "releases": len(self._entries),
+            "keyframes": len(self._entries) - len(deltas),
+            "changed_fields": sum(len(delta) for delta in deltas),
+            "splices": sum(
+                1 for delta in deltas for op in delta.values() if type(op) is list
+            ),
+            "plain_bytes": plain_bytes,
+            "stored_bytes": stored_bytes,
+            "ratio": plain_bytes / stored_bytes,
+        }
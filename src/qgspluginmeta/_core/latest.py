@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/latest.py: Latest release per plugin, maintained incrementally
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC, QgsVersionABC
+from .repository import QgsPluginRepository
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginLatestView:
+    """
+    Newest release of every plugin, among all and among stable releases
+
+    Releases of a plugin are kept sorted by version, equal versions (e.g. "1.0" and
+    "v1.0") by their original string. Adding or removing one of k releases takes
+    O(log k) version comparisons (the expensive part) plus an O(k) list insert or
+    removal. If `qgis_version` is given, only releases compatible with it are
+    considered. Can be attached to a repository.
+
+    Mutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        releases: typing.Iterable[QgsPluginMetadataABC] = tuple(),
+        qgis_version: typing.Union[None, str] = None,
+    ):
+
+        self._qgis_version = qgis_version
+
+        self._keys = {}  # key -> (version, release) of tracked releases
+        self._all = {}  # id -> ([versions], [releases]), ascending
+        self._stable = {}  # id -> ([versions], [releases]), ascending, stable only
+
+        for release in releases:
+            self.add(release)
+
+    def __repr__(self) -> str:
+
+        return (
+            f"<QgsPluginLatestView plugins={len(self):d} releases={len(self._keys):d}>"
+        )
+
+    def __len__(self) -> int:
+
+        return len(self._all)
+
+    @staticmethod
+    def _bisect(versions: typing.List[QgsVersionABC], version: QgsVersionABC) -> int:
+        "Index of the first version greater than `version` (`bisect_right`), ties by original string"
+
+        low, high = 0, len(versions)
+
+        while low < high:
+            middle = (low + high) // 2
+            if version < versions[middle] or (
+                not versions[middle] < version
+                and version.original < versions[middle].original
+            ):
+                high = middle
+            else:
+                low = middle + 1
+
+        return low
+
+    @classmethod
+    def _insert(
+        cls,
+        groups: typing.Dict,
+        plugin_id: str,
+        version: QgsVersionABC,
+        release: QgsPluginMetadataABC,
+    ):
+
+        versions, releases = groups.setdefault(plugin_id, ([], []))
+        index = cls._bisect(versions, version)
+
+        versions.insert(index, version)
+        releases.insert(index, release)
+
+    @classmethod
+    def _delete(
+        cls,
+        groups: typing.Dict,
+        plugin_id: str,
+        version: QgsVersionABC,
+        release: QgsPluginMetadataABC,
+    ):
+
+        versions, releases = groups[plugin_id]
+        index = cls._bisect(versions, version) - 1  # unique by original string
+
+        versions.pop(index)
+        releases.pop(index)
+        if len(releases) == 0:
+            groups.pop(plugin_id)
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def add(self, release: QgsPluginMetadataABC):
+        "Tracks a release, replaces a tracked release with identical id and version"
+
+        key = QgsPluginRepository.key(release)
+
+        if key in self._keys.keys():
+            self.remove(self._keys[key][1])
+        if self._qgis_version is not None and not release.is_compatible(
+            self._qgis_version
+        ):
+            return
+
+        version = release["version"].value
+        self._keys[key] = (version, release)
+
+        self._insert(self._all, key[0], version, release)
+        if version.stable:
+            self._insert(self._stable, key[0], version, release)
+
+    @typechecked
+    def remove(self, release: QgsPluginMetadataABC):
+        "Stops tracking a release"
+
+        key = QgsPluginRepository.key(release)
+
+        if key not in self._keys.keys():  # e.g. not compatible
+            return
+
+        version, release = self._keys.pop(key)
+
+        self._delete(self._all, key[0], version, release)
+        if version.stable:
+            self._delete(self._stable, key[0], version, release)
+
+    @typechecked
+    def latest(
+        self, plugin_id: str, stable: bool = False
+    ) -> typing.Union[None, QgsPluginMetadataABC]:
+        "Newest (stable) release of a plugin, `None` if there is none"
+
+        groups = self._stable if stable else self._all
+
+        if plugin_id not in groups.keys():
+            return None
+
+        return groups[plugin_id][1][-1]
+
+    @typechecked
+    def releases(self, stable: bool = False) -> typing.List[QgsPluginMetadataABC]:
+        "Newest (stable) release of every plugin, ordered by plugin id"
+
+        groups = self._stable if stable else self._all
+
+        return [groups[plugin_id][1][-1] for plugin_id in sorted(groups.keys())]
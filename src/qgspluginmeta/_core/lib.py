@@ -28,9 +28,14 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import os
+import typing
+
 from typeguard import typechecked
 
+from .abc import QgsVersionABC
 from .error import QgsBoolValueError
+from .version import QgsVersion
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
@@ -68,3 +73,49 @@ def bool_to_str(value: bool, style: str) -> str:
         raise QgsBoolValueError(f'style "{style:s}" is unknown')
 
     return styles[style](value)
+
+
+@typechecked
+def str_to_dependencies(
+    value: str,
+) -> typing.Tuple[typing.Tuple[str, typing.Union[None, QgsVersionABC]], ...]:
+    "Parses `plugin_dependencies` like QGIS: comma separated plugin names, optionally pinned by `==version`"
+
+    dependencies = []
+
+    for item in value.split(","):
+        name, equals, pin = item.partition("==")
+        name, pin = name.strip(), pin.strip()
+        if len(name) == 0 and len(equals) == 0:
+            continue  # e.g. trailing comma
+        if len(name) == 0 or (len(equals) != 0 and (len(pin) == 0 or "==" in pin)):
+            raise ValueError(f'plugin dependency "{item.strip():s}" can not be parsed')
+        dependencies.append(
+            (name, QgsVersion.from_pluginversion(pin) if len(equals) != 0 else None)
+        )
+
+    return tuple(dependencies)
+
+
+@typechecked
+def dependencies_to_str(
+    value: typing.Tuple[typing.Tuple[str, typing.Union[None, QgsVersionABC]], ...],
+) -> str:
+
+    return ",".join(
+        name if pin is None else f"{name:s}=={pin.original:s}" for name, pin in value
+    )
+
+
+@typechecked
+def write_atomic(fn: str, data: typing.Union[str, bytes]):
+    "Writes (strings as UTF-8) through a temporary file which replaces `fn` once complete"
+
+    tmp_fn = f"{fn:s}.part"
+
+    with open(tmp_fn, "wb") as f:
+        f.write(data if isinstance(data, bytes) else data.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_fn, fn)
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/lint.py: Parallel lint engine for meta data records
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .const import LINT_CHUNK_SIZE, LINT_RULES
+from .metadata import QgsPluginMetadata
+from .spec import NAME_XML, SPEC, SPEC_BY_NAME
+from .version import QgsVersion
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# Only the API is type-checked, the internals run in worker processes and are too hot for it.
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _finding(rule, field, message):
+
+    return {"rule": rule, "field": field, "message": message}
+
+
+def _xml_import_fields(xml_dict, findings):
+    "Renames XML keys like `from_xmldict`, but records problems instead of raising"
+
+    xml_dict = dict(xml_dict)
+
+    at_version = xml_dict.pop("@version", None)
+    if at_version != xml_dict.get("version", None):
+        findings.append(
+            _finding(
+                "structure",
+                "version",
+                f'attribute "@version" ({at_version}) and element "version" ({xml_dict.get("version", None)}) differ',
+            )
+        )
+
+    for name, name_xml in NAME_XML.items():
+        if name_xml not in xml_dict.keys():
+            findings.append(
+                _finding("structure", name, f'XML key "{name_xml:s}" is missing')
+            )
+            continue
+        xml_dict[name] = xml_dict.pop(name_xml)
+
+    if "id" in xml_dict.keys():
+        return xml_dict
+
+    file_name = xml_dict.get("file_name", None)
+    version = xml_dict.get("version", None) or ""
+
+    if file_name is None:
+        reason = 'neither "id" nor "file_name" given'
+    elif not file_name.lower().endswith(".zip"):
+        reason = '"file_name" does not end on ".zip"'
+    elif len(version) == 0 or version not in file_name:
+        reason = 'version is not part of "file_name"'
+    else:
+        xml_dict["id"] = file_name[: -1 * (len(".zip") + len(version) + len("."))]
+        return xml_dict
+
+    findings.append(_finding("structure", "id", f"can not determine id: {reason:s}"))
+
+    return xml_dict
+
+
+def _txt_import_fields(plugin_id, metadatatxt_string, findings):
+    "Parses metadata.txt like `from_metadatatxt`, but records problems instead of raising"
+
+    cp = QgsPluginMetadata._make_configparser()
+
+    try:
+        cp.read_string(metadatatxt_string)
+        txt_dict = dict(cp["general"])
+    except Exception as e:
+        findings.append(
+            _finding("structure", None, f"{type(e).__name__:s}: {str(e):s}")
+        )
+        return None
+
+    return dict(txt_dict, id=plugin_id)
+
+
+def _import_fields(record, findings):
+
+    if isinstance(record, dict):
+        return _xml_import_fields(record, findings)
+    if isinstance(record, tuple) and len(record) == 2:
+        return _txt_import_fields(record[0], record[1], findings)
+    if isinstance(record, QgsPluginMetadataABC):
+        return record.as_dict()
+
+    findings.append(
+        _finding(
+            "structure", None, f"unsupported record type {type(record).__name__:s}"
+        )
+    )
+
+    return None
+
+
+def _value_rule(dtype):
+
+    if dtype is bool:
+        return "bool_values"
+    if dtype is QgsVersion:
+        return "version_values"
+
+    return "field_values"
+
+
+def _lint_record(record, ignored_fields):
+    "Applies per-record rules, returns findings and the plugin's (id, version, create date)"
+
+    findings = []
+    import_fields = _import_fields(record, findings)
+
+    if import_fields is None:
+        return findings, None
+
+    values = {}
+    invalid = set()
+
+    for key, value_str in import_fields.items():
+        if value_str is None or len(value_str.strip()) == 0:
+            continue
+        spec = SPEC_BY_NAME.get(key, None)
+        if spec is None:
+            values[key] = value_str
+            continue
+        try:
+            importer = spec.get("importer", None)
+            value = (
+                spec["dtype"](value_str) if importer is None else importer(value_str)
+            )
+            if not isinstance(value, spec["dtype"]):
+                raise TypeError(f"expected {spec['dtype'].__name__:s}")
+        except Exception as e:
+            invalid.add(key)
+            findings.append(
+                _finding(
+                    _value_rule(spec["dtype"]),
+                    key,
+                    f'"{value_str:s}" - {type(e).__name__:s}: {str(e):s}',
+                )
+            )
+            continue
+        values[key] = value
+
+    for spec in SPEC:
+        name = spec["name"]
+        if not spec.get("is_required", False) or name in ignored_fields:
+            continue
+        if name in values.keys():
+            continue
+        if name in invalid:
+            reason = "value can not be parsed"
+        elif import_fields.get(name, None) is not None:
+            reason = "value is empty"
+        else:
+            reason = "field is absent"
+        findings.append(_finding("required_fields", name, reason))
+
+    minimum = values.get("qgisMinimumVersion", None)
+    maximum = values.get("qgisMaximumVersion", None)
+    if minimum is not None and maximum is not None and maximum < minimum:
+        findings.append(
+            _finding(
+                "qgis_version_range",
+                "qgisMaximumVersion",
+                f"qgisMaximumVersion {maximum.original:s} is lower than qgisMinimumVersion {minimum.original:s}",
+            )
+        )
+
+    plugin_id = values.get("id", None)
+    version = values.get("version", None)
+    if plugin_id is None or version is None:
+        return findings, None
+
+    return findings, (plugin_id, version, import_fields.get("create_date", None))
+
+
+def _lint_chunk(start, records, rules, ignored_fields):
+    "Runs in worker process: one report and history entry per record"
+
+    results = []
+
+    for offset, record in enumerate(records):
+        findings, entry = _lint_record(record, ignored_fields)
+        results.append(
+            (
+                {
+                    "index": start + offset,
+                    "id": None if entry is None else entry[0],
+                    "version": None if entry is None else entry[1].original,
+                    "findings": [
+                        finding for finding in findings if finding["rule"] in rules
+                    ],
+                },
+                entry,
+            )
+        )
+
+    return results
+
+
+def _version_history(history):
+    "Findings for releases whose version does not grow with their create date (or input order)"
+
+    reports = []
+
+    for plugin_id, entries in history.items():
+        entries.sort(key=lambda entry: (entry[2] is None, entry[2] or "", entry[0]))
+        for previous, current in zip(entries[:-1], entries[1:]):
+            if current[1] > previous[1]:
+                continue
+            if current[1] == previous[1] and current[2] == previous[2]:
+                continue  # same release listed twice
+            reports.append(
+                {
+                    "index": current[0],
+                    "id": plugin_id,
+                    "version": current[1].original,
+                    "findings": [
+                        _finding(
+                            "version_history",
+                            "version",
+                            f"version {current[1].original:s} does not follow {previous[1].original:s}",
+                        )
+                    ],
+                }
+            )
+
+    reports.sort(key=lambda report: report["index"])
+
+    return reports
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class QgsPluginLinter:
+    """
+    Runs a configurable set of lint rules over many meta data records in a process pool
+
+    Records are raw XML dicts (e.g. from `_split_xml`), tuples of plugin id and metadata.txt
+    string, or meta data objects. Problems become findings instead of exceptions. Rules are
+    named in `LINT_RULES`; `email` is e.g. not exposed in plugins.xml and can be added to
+    `ignored_fields`.
+
+    Mutable.
+    """
+
+    def __init__(
+        self,
+        rules: typing.Union[None, typing.Iterable[str]] = None,
+        ignored_fields: typing.Union[None, typing.Iterable[str]] = None,
+        workers: typing.Union[None, int] = None,
+        chunk_size: int = LINT_CHUNK_SIZE,
+        max_pending: typing.Union[None, int] = None,
+    ):
+
+        self._rules = frozenset(LINT_RULES if rules is None else rules)
+        self._ignored_fields = frozenset(
+            () if ignored_fields is None else ignored_fields
+        )
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._chunk_size = chunk_size
+        self._max_pending = (
+            max_pending if max_pending is not None else 4 * self._workers
+        )
+
+        unknown = self._rules - frozenset(LINT_RULES)
+        if len(unknown) > 0:
+            raise ValueError(f'unknown rules: {", ".join(sorted(unknown)):s}')
+        if self._workers < 1:
+            raise ValueError('"workers" must be at least 1')
+        if self._chunk_size < 1:
+            raise ValueError('"chunk_size" must be at least 1')
+        if self._max_pending < 1:
+            raise ValueError('"max_pending" must be at least 1')
+
+        self._counts = {}
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginLinter rules={len(self._rules):d} workers={self._workers:d}>"
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def _chunks(
+        self, records: typing.Iterable[typing.Any]
+    ) -> typing.Iterator[typing.Tuple[int, typing.List]]:
+
+        chunk = []
+        start = 0
+
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == self._chunk_size:
+                yield start, chunk
+                start += len(chunk)
+                chunk = []
+
+        if len(chunk) > 0:
+            yield start, chunk
+
+    def _count(self, report: typing.Dict[str, typing.Any]):
+
+        for finding in report["findings"]:
+            self._counts[finding["rule"]] = self._counts.get(finding["rule"], 0) + 1
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def lint(
+        self, records: typing.Iterable[typing.Any]
+    ) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+        """
+        Yields per-record reports (`index`, `id`, `version`, `findings`) as worker chunks complete
+
+        Every record gets one report from the per-record rules, in order of completion.
+        Findings of `version_history` need all records and follow once all chunks are done,
+        as additional reports for the affected records only.
+        """
+
+        self._counts.clear()
+
+        history = {}
+        chunks = self._chunks(records)
+        pending = set()
+        exhausted = False
+
+        with ProcessPoolExecutor(max_workers=self._workers) as pool:
+            while not exhausted or len(pending) > 0:
+                while not exhausted and len(pending) < self._max_pending:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    pending.add(
+                        pool.submit(
+                            _lint_chunk,
+                            chunk[0],
+                            chunk[1],
+                            self._rules,
+                            self._ignored_fields,
+                        )
+                    )
+                if len(pending) == 0:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for report, entry in future.result():
+                        if entry is not None:
+                            history.setdefault(entry[0], []).append(
+                                (report["index"], entry[1], entry[2])
+                            )
+                        self._count(report)
+                        yield report
+
+        if "version_history" not in self._rules:
+            return
+
+        for report in _version_history(history):
+            self._count(report)
+            yield report
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # PROPERTIES
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @property
+    def counts(self) -> typing.Dict[str, int]:
+        "Number of findings per rule of last run"
+        return self._counts.copy()
+
+    @property
+    def rules(self) -> typing.FrozenSet[str]:
+        return self._rules
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/merge.py: Bulk merge of plugins.xml and metadata.txt records
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC, QgsVersionABC
+from .const import MERGE_POLICIES
+from .metadata import QgsPluginMetadata
+from .repository import QgsPluginRepository
+from .spec import SPEC_BY_NAME
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# Only the API is type-checked, the internals are too hot for it.
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _key(record):
+    "Same as QgsPluginRepository.key, bypasses typechecked accessors"
+
+    version = record._fields["version"]._value if "version" in record._fields else None
+    if version is None:
+        raise ValueError("release has no version")
+
+    return record._id, version.original
+
+
+def _comparable(value):
+
+    if isinstance(value, QgsVersionABC):
+        return QgsVersionABC, value.original
+    if type(value) is tuple and len(value) > 0 and type(value[0]) is tuple:
+        return tuple((name, _comparable(pin)) for name, pin in value)  # dependencies
+
+    return value
+
+
+def _merge_pair(xml_record, txt_record, policy):
+    "New meta data object sharing the values of both records"
+
+    values = {}
+    conflicts = {}
+
+    for record in (xml_record, txt_record):
+        if record is None:
+            continue
+        for name, field in record._fields.items():
+            value = field._value
+            current = values.get(name, None)
+            if current is None:
+                values[name] = value
+                continue
+            if value is None or value is current:
+                continue
+            if _comparable(current) == _comparable(value):
+                continue
+            conflicts[name] = (current, value)
+            if policy == "txt":
+                values[name] = value
+            elif policy == "report" and name in SPEC_BY_NAME.keys():
+                values[name] = None
+            elif policy == "report":
+                del values[name]  # unknown fields have no type without a value
+
+    return (
+        QgsPluginMetadata._from_values(tuple(values.keys()), tuple(values.values())),
+        conflicts,
+    )
+
+
+def _merge_hashed(xml_records, txt_index, policy, outer):
+
+    matched = set()
+
+    for xml_record in xml_records:
+        key = _key(xml_record)
+        txt_record = txt_index[key] if key in txt_index else None
+        if outer and txt_record is not None:
+            matched.add(key)
+        yield _merge_pair(xml_record, txt_record, policy)
+
+    if not outer:
+        return
+
+    for txt_record in (
+        txt_index.values() if isinstance(txt_index, typing.Mapping) else txt_index
+    ):
+        if _key(txt_record) not in matched:
+            yield _merge_pair(None, txt_record, policy)
+
+
+def _sorted_keys(records, name):
+
+    last = None
+
+    for record in records:
+        key = _key(record)
+        if last is not None and key <= last:
+            raise ValueError(f"{name:s} are not sorted by unique (id, version): {key}")
+        last = key
+        yield key, record
+
+
+def _merge_sorted(xml_records, txt_records, policy, outer):
+
+    xml_iter = _sorted_keys(xml_records, "xml_records")
+    txt_iter = _sorted_keys(txt_records, "txt_records")
+
+    xml_key, xml_record = next(xml_iter, (None, None))
+    txt_key, txt_record = next(txt_iter, (None, None))
+
+    while xml_key is not None:
+        if txt_key is None or xml_key < txt_key:
+            yield _merge_pair(xml_record, None, policy)
+            xml_key, xml_record = next(xml_iter, (None, None))
+        elif xml_key == txt_key:
+            yield _merge_pair(xml_record, txt_record, policy)
+            xml_key, xml_record = next(xml_iter, (None, None))
+            txt_key, txt_record = next(txt_iter, (None, None))
+        else:
+            if outer:
+                yield _merge_pair(None, txt_record, policy)
+            txt_key, txt_record = next(txt_iter, (None, None))
+
+    while outer and txt_key is not None:
+        yield _merge_pair(None, txt_record, policy)
+        txt_key, txt_record = next(txt_iter, (None, None))
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# API
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+def merge(
+    xml_records: typing.Iterable[QgsPluginMetadataABC],
+    txt_records: typing.Union[
+        typing.Iterable[QgsPluginMetadataABC],
+        typing.Mapping[typing.Tuple[str, str], QgsPluginMetadataABC],
+    ],
+    policy: str = "xml",
+    sorted_input: bool = False,
+    outer: bool = False,
+) -> typing.Iterator[
+    typing.Tuple[QgsPluginMetadataABC, typing.Dict[str, typing.Tuple]]
+]:
+    """
+    Joins plugins.xml and metadata.txt records on (id, version), yields merged records and conflicts
+
+    Merged records are new meta data objects sharing (not copying) the values of both
+    inputs. If both set a field to different values, `policy` decides: `xml` or `txt`
+    wins, or with `report` the field is left unset (unknown fields are left out).
+    Conflicts are yielded along with every merged record as a dict of field names to
+    (XML value, txt value).
+
+    `txt_records` can be a mapping (e.g. a `QgsPluginRepository`) keyed by (id, version)
+    - XML records are then streamed against it. With `sorted_input`, both sources are
+    streamed, they must be sorted by (id, version). Otherwise, txt records are hashed first.
+    XML records without metadata.txt are passed through, txt-only records only if `outer` is set.
+    """
+
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f'unknown policy "{policy:s}"')
+
+    if isinstance(txt_records, (typing.Mapping, QgsPluginRepository)):
+        return _merge_hashed(xml_records, txt_records, policy, outer)
+
+    if sorted_input:
+        return _merge_sorted(xml_records, txt_records, policy, outer)
+
+    return _merge_hashed(
+        xml_records,
+        {_key(record): record for record in txt_records},
+        policy,
+        outer,
+    )
@@ -28,15 +28,116 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from configparser import ConfigParser
 import io
+import re
 import typing
 
 from typeguard import typechecked
 
+from . import profiling
 from .abc import QgsPluginMetadataABC, QgsPluginMetadataFieldABC
-from .spec import SPEC, NAME_XML
+from .const import XML_ID_KEYS
+from .spec import SPEC, SPEC_BY_NAME, NAME_XML
 from .field import QgsPluginMetadataField
+from .frozen import QgsPluginMetadataFrozen
+from .version import QgsVersion
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_SPEC_TEMPLATES = {
+    field["name"]: QgsPluginMetadataField._template(**field) for field in SPEC
+}
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES: IMPORT
+# Not type-checked, the import path is too hot for it - the public constructors check their input.
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _projection(fields):
+    """
+    Normalizes a field projection - `id` and `version` are always part of it
+
+    `version` identifies a release next to `id` (see `XML_ID_KEYS`), repositories and views key on it.
+    """
+
+    if fields is None:
+        return None
+
+    return frozenset(fields) | {"id", "version"}
+
+
+def _xml_keys(fields):
+    "Translates a field projection into the XML keys required for it"
+
+    return frozenset(NAME_XML.get(name, name) for name in fields) | frozenset(
+        XML_ID_KEYS
+    )
+
+
+def _xml_id(xml_dict):
+    "Plugin id of an XML dict, derived from `file_name` if there is no `id`"
+
+    if "id" in xml_dict.keys():
+        return xml_dict["id"]
+
+    if "file_name" not in xml_dict.keys():
+        raise KeyError(
+            'Neither "id" nor "file_name" in XML meta data - no way to determine plugin id'
+        )
+    if not xml_dict["file_name"].lower().endswith(".zip"):
+        raise ValueError('Unusual value for "file_name", does not end on ".zip"')
+    if xml_dict["version"] not in xml_dict["file_name"]:
+        raise ValueError('Version is not part of "file_name"')
+
+    return xml_dict["file_name"][
+        : -1 * (len(".zip") + len(xml_dict["version"]) + len("."))
+    ]
+
+
+def _populate(meta, import_fields, fields):
+    "Builds the fields of `meta`, only the ones in projection `fields` if given"
+
+    meta._fields = {
+        name: QgsPluginMetadataField._from_template(template, None)
+        for name, template in _SPEC_TEMPLATES.items()
+        if fields is None or name in fields
+    }  # SPEC fields without value, as `QgsPluginMetadataField(**field)` but unchecked
+
+    profiler = profiling.PROFILER
+
+    for key in import_fields.keys():
+        if fields is not None and key not in fields:
+            continue
+        if import_fields[key] is None:
+            continue
+        if len(import_fields[key].strip()) == 0:
+            continue
+        token = None if profiler is None else profiler.start()
+        if key not in meta._fields.keys():
+            meta._fields[key] = QgsPluginMetadataField.from_unknown(
+                key, import_fields[key]
+            )
+        else:
+            meta._fields[key].value_string = import_fields[
+                key
+            ]  # Import of values of known fields and type cast happens here!
+        if profiler is not None:
+            profiler.stop(f"field_import:{key:s}", token)
+
+    meta._id = meta._fields["id"].value
+
+
+def _from_projection(cls, import_fields, fields):
+    "Meta data object with only the fields in projection `fields`"
+
+    meta = cls.__new__(cls)
+    _populate(meta, import_fields, fields)
+
+    return meta
+
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # CLASS: META DATA
@@ -56,27 +157,40 @@ class QgsPluginMetadata(QgsPluginMetadataABC):
         `import_fields` is a dict of keys (field names, type `str`) and values (field values, all type `str`).
         """
 
-        self._fields = {field["name"]: QgsPluginMetadataField(**field) for field in SPEC}
+        _populate(self, import_fields, None)
 
-        for key in import_fields.keys():
-            if import_fields[key] is None:
-                continue
-            if len(import_fields[key].strip()) == 0:
-                continue
-            if key not in self._fields.keys():
-                self._fields[key] = QgsPluginMetadataField.from_unknown(
-                    key, import_fields[key]
-                )
-            else:
-                self._fields[key].value_string = import_fields[
-                    key
-                ]  # Import of values of known fields and type cast happens here!
+    def __repr__(self) -> str:
+
+        return f'<QgsPluginMetadata id="{self._id:s}">'
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        "Pickle support, e.g. for process pools: only values are pickled"
+
+        return {name: field.value for name, field in self._fields.items()}
+
+    def __setstate__(self, state: typing.Dict[str, typing.Any]):
+        "Pickle support: rebuilds fields from SPEC without re-importing strings"
 
+        self._fields = self._build_fields(state.keys(), state.values())
         self._id = self._fields["id"].value
 
-    def __repr__(self) -> str:
+    @staticmethod
+    def _build_fields(names, values):
+        "Fields around already validated values (not type-checked, hot)"
 
-        return f'<QgsPluginMetadata id="{self._id:s}">'
+        return {
+            name: QgsPluginMetadataField._from_template(
+                (
+                    _SPEC_TEMPLATES[name]
+                    if name in _SPEC_TEMPLATES.keys()
+                    else QgsPluginMetadataField._template(
+                        name, type(value), known=False
+                    )
+                ),
+                value,
+            )
+            for name, value in zip(names, values)
+        }
 
     def __getitem__(self, name: str) -> QgsPluginMetadataFieldABC:
 
@@ -117,6 +231,88 @@ class QgsPluginMetadata(QgsPluginMetadataABC):
 
         return True
 
+    def freeze(self) -> QgsPluginMetadataFrozen:
+        "Immutable, hashable snapshot sharing all values with this meta data object"
+
+        return QgsPluginMetadataFrozen(
+            tuple(self._fields.keys()),
+            tuple(field._value for field in self._fields.values()),
+        )
+
+    @classmethod
+    def _from_values(cls, names, values):
+        "Meta data object around already validated values (not type-checked, hot)"
+
+        meta = cls.__new__(cls)
+        meta._fields = cls._build_fields(names, values)
+        meta._id = meta._fields["id"]._value
+
+        return meta
+
+    @classmethod
+    def _thaw(cls, frozen):
+        "Mutable meta data object from a snapshot (not type-checked, hot)"
+
+        return cls._from_values(frozen._names, frozen._values)
+
+    def compatibility_range(
+        self,
+    ) -> typing.Union[
+        None, typing.Tuple[typing.Tuple[int, ...], typing.Tuple[int, ...]]
+    ]:
+        """
+        Minimum and maximum QGIS version as tuples of three integers, `None` if unknown
+
+        Follows QGIS' plugin installer: Missing elements of the minimum are 0, of the
+        maximum 99. Without a maximum, the minimum's major version `.99` is used.
+        """
+
+        if "qgisMinimumVersion" not in self._fields.keys():
+            raise KeyError(
+                '"qgisMinimumVersion" is not part of this meta data (not projected)'
+            )
+        if not self._fields["qgisMinimumVersion"].value_set:
+            return None
+
+        minimum = self._fields["qgisMinimumVersion"].value.original
+        maximum = (
+            self._fields["qgisMaximumVersion"].value.original
+            if "qgisMaximumVersion" in self._fields.keys()
+            and self._fields["qgisMaximumVersion"].value_set
+            else f'{minimum.split(".")[0]:s}.99'
+        )
+
+        return self._version_tuple(minimum, 0), self._version_tuple(maximum, 99)
+
+    def is_compatible(self, qgis_version: str) -> bool:
+        "Is this release compatible with a QGIS version (e.g. `3.28`), like in QGIS' plugin installer"
+
+        compatibility_range = self.compatibility_range()
+
+        if compatibility_range is None:
+            return False
+
+        minimum, maximum = compatibility_range
+        current = self._version_tuple(
+            str(
+                QgsVersion.from_qgisversion(qgis_version, fix_plugin_compatibility=True)
+            ),
+            0,
+        )
+
+        return minimum <= current <= maximum
+
+    @staticmethod
+    def _version_tuple(version_str: str, fill: int) -> typing.Tuple[int, ...]:
+
+        elements = [
+            int(element)
+            for element in re.sub(r"[^0-9.]+", "", version_str).split(".")
+            if len(element) > 0
+        ][:3]
+
+        return tuple(elements + [fill] * (3 - len(elements)))
+
     def update(self, other: QgsPluginMetadataABC):
         "Similar to dict.update, update this metadata with content from other metadata"
 
@@ -134,6 +330,8 @@ class QgsPluginMetadata(QgsPluginMetadataABC):
     @staticmethod
     def _make_configparser():
 
+        from configparser import ConfigParser  # only on first use, for startup time
+
         cp = ConfigParser(
             interpolation=None,  # TODO ok? Because of e.g. tuflow.3.0.4.zip (containing `%` in changelog)
             strict=False,  # TODO ok? Because of e.g. Sentinel-2 Download 3.5 (field `email` twice)
@@ -165,7 +363,8 @@ class QgsPluginMetadata(QgsPluginMetadataABC):
         xml_dict["@version"] = xml_dict["version"]
 
         for name, name_xml in NAME_XML.items():
-            xml_dict[name_xml] = xml_dict.pop(name)
+            if name in xml_dict.keys():  # may be missing if projected
+                xml_dict[name_xml] = xml_dict.pop(name)
 
         return xml_dict
 
@@ -191,10 +390,20 @@ class QgsPluginMetadata(QgsPluginMetadataABC):
 
     @classmethod
     def from_xmldict(
-        cls, xml_dict: typing.Dict[str, typing.Union[str, None]],
+        cls,
+        xml_dict: typing.Dict[str, typing.Union[str, None]],
+        fields: typing.Union[None, typing.Iterable[str]] = None,
     ) -> QgsPluginMetadataABC:
-        "Fixes an XML dict from xmltodict and returns a meta data object"
+        """
+        Fixes an XML dict from xmltodict and returns a meta data object
+
+        If `fields` is given, only those fields (plus `id` and `version`) are imported.
+        """
+
+        profiler = profiling.PROFILER
+        token = None if profiler is None else profiler.start()
 
+        fields = _projection(fields)
         xml_dict = xml_dict.copy()
 
         if xml_dict["@version"] != xml_dict["version"]:
@@ -202,30 +411,37 @@ class QgsPluginMetadata(QgsPluginMetadataABC):
         xml_dict.pop("@version")
 
         for name, name_xml in NAME_XML.items():
+            if fields is not None and name not in fields:
+                xml_dict.pop(name_xml, None)
+                continue
             xml_dict[name] = xml_dict.pop(name_xml)
 
         if "id" not in xml_dict.keys():
-            if "file_name" not in xml_dict.keys():
-                raise KeyError(
-                    'Neither "id" nor "file_name" in XML meta data - no way to determine plugin id'
-                )
-            if not xml_dict["file_name"].lower().endswith(".zip"):
-                raise ValueError(
-                    'Unusual value for "file_name", does not end on ".zip"'
-                )
-            if xml_dict["version"] not in xml_dict["file_name"]:
-                raise ValueError('Version is not part of "file_name"')
-            xml_dict["id"] = xml_dict["file_name"][
-                : -1 * (len(".zip") + len(xml_dict["version"]) + len("."))
-            ]
+            xml_dict["id"] = _xml_id(xml_dict)
 
-        return cls(**xml_dict)
+        if profiler is not None:
+            profiler.stop("key_rename", token)
+
+        if fields is None:
+            return cls(**xml_dict)
+
+        return _from_projection(cls, xml_dict, fields)
 
     @classmethod
     def from_metadatatxt(
-        cls, plugin_id: str, metadatatxt_string: str
+        cls,
+        plugin_id: str,
+        metadatatxt_string: str,
+        fields: typing.Union[None, typing.Iterable[str]] = None,
     ) -> QgsPluginMetadataABC:
-        "Parses a metadata.txt string and returns a meta data object"
+        """
+        Parses a metadata.txt string and returns a meta data object
+
+        If `fields` is given, only those fields (plus `id` and `version`) are imported.
+        """
+
+        profiler = profiling.PROFILER
+        token = None if profiler is None else profiler.start()
 
         cp = cls._make_configparser()
 
@@ -242,10 +458,41 @@ class QgsPluginMetadata(QgsPluginMetadataABC):
             )
 
         try:
-            fields = dict(general)
+            txt_dict = dict(general)
         except Exception as e:
             raise ValueError(
                 f'failed to convert section "general" from metadata.txt to dict: {str(e):s}'
             )
 
-        return cls(id=plugin_id, **fields)
+        if profiler is not None:
+            profiler.stop("metadatatxt_parse", token)
+
+        txt_dict["id"] = plugin_id
+        fields = _projection(fields)
+        if fields is None:
+            return cls(**txt_dict)
+
+        return _from_projection(cls, txt_dict, fields)
+
+    @classmethod
+    def from_zipfile(
+        cls,
+        zip_file: typing.Any,
+        plugin_id: typing.Union[None, str] = None,
+        fields: typing.Union[None, typing.Iterable[str]] = None,
+    ) -> QgsPluginMetadataABC:
+        """
+        Reads metadata.txt from a plugin zip file and returns a meta data object
+
+        `zip_file` can be a path, a seekable binary file object or a buffer like `bytes` or
+        `mmap.mmap`. Only the zip's central directory and the `metadata.txt` member are read.
+        If not given, the plugin id is inferred from the top-level folder.
+        """
+
+        from .archive import read_zip_metadatatxt  # only on first use, for startup time
+
+        plugin_id, metadatatxt_string = read_zip_metadatatxt(
+            zip_file, plugin_id=plugin_id
+        )
+
+        return cls.from_metadatatxt(plugin_id, metadatatxt_string, fields=fields)
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/parser.py: Streaming plugins.xml parser
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from collections import deque
+import typing
+from xml.parsers import expat
+
+from typeguard import typechecked
+
+from .const import XML_ATTR_PREFIX, XML_CDATA_KEY, XML_RELEASE_TAG
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class ReleaseDictParser:
+    """
+    Incremental parser for `plugins.xml`, produces one dict per `pyqgis_plugin` element
+
+    Release dicts are structured exactly like the output of xmltodict. If `keys` is given,
+    only release attributes and elements with matching XML names (e.g. `@version`,
+    `qgis_minimum_version`) are collected - everything else is skipped while parsing.
+
+    Mutable. Only the API is type-checked, the expat callbacks are too hot for it.
+    """
+
+    @typechecked
+    def __init__(self, keys: typing.Union[None, typing.FrozenSet[str]] = None):
+
+        self._keys = keys
+
+        self._depth = 0  # depth of current element, root is 1, releases are 2
+        self._skip_depth = 0  # depth of skipped element if inside one, else 0
+        self._stack = []  # (item, data) of parents of current element
+        self._item = None
+        self._data = []
+
+        self._releases = deque()
+
+        self._parser = expat.ParserCreate()
+        self._parser.ordered_attributes = True
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start_element
+        self._parser.EndElementHandler = self._end_element
+        self._parser.CharacterDataHandler = self._characters
+        self._parser.EntityDeclHandler = self._forbid_entities
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def _wanted(self, key: str) -> bool:
+
+        return self._keys is None or key in self._keys
+
+    def _start_element(self, name: str, attrs: typing.List[str]):
+
+        self._depth += 1
+
+        if self._skip_depth > 0 or self._depth < 2:
+            return
+        if (self._depth == 2 and name != XML_RELEASE_TAG) or (
+            self._depth == 3 and not self._wanted(name)
+        ):
+            self._skip_depth = self._depth
+            return
+
+        self._stack.append((self._item, self._data))
+        self._item = {
+            f"{XML_ATTR_PREFIX:s}{key:s}": value
+            for key, value in zip(attrs[0::2], attrs[1::2])
+            if self._depth > 2 or self._wanted(f"{XML_ATTR_PREFIX:s}{key:s}")
+        } or None
+        self._data = []
+
+    def _end_element(self, name: str):
+
+        depth = self._depth
+        self._depth -= 1
+
+        if self._skip_depth > 0:
+            if depth == self._skip_depth:
+                self._skip_depth = 0
+            return
+        if depth < 2:
+            return
+
+        data = "".join(self._data).strip() or None
+        item = self._item
+        self._item, self._data = self._stack.pop()
+
+        if item is not None and data is not None:
+            item = self._push(item, XML_CDATA_KEY, data)
+
+        if depth == 2:
+            self._releases.append(item if item is not None else {})
+        else:
+            self._item = self._push(
+                self._item, name, item if item is not None else data
+            )
+
+    def _characters(self, data: str):
+
+        if self._skip_depth > 0 or self._depth < 2:
+            return
+
+        self._data.append(data)
+
+    @staticmethod
+    def _push(
+        item: typing.Union[None, typing.Dict], key: str, value: typing.Any
+    ) -> typing.Dict:
+
+        if item is None:
+            item = {}
+
+        if key not in item.keys():
+            item[key] = value
+        elif isinstance(item[key], list):
+            item[key].append(value)
+        else:
+            item[key] = [item[key], value]
+
+        return item
+
+    @staticmethod
+    def _forbid_entities(*args: typing.Any):
+
+        raise ValueError("entities are disabled")
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def feed(self, chunk: typing.Union[str, bytes]):
+        "Parse the next chunk of the document, chunks may end anywhere"
+
+        self._parser.Parse(chunk, False)
+
+    def close(self):
+        "Signal the end of the document"
+
+        self._parser.Parse(b"", True)
+
+    @typechecked
+    def pop_releases(self) -> typing.Generator[typing.Dict, None, None]:
+        "Yield (and forget) all releases completed so far"
+
+        while len(self._releases) > 0:
+            yield self._releases.popleft()
+
+
+class AmpersandFilter:
+    """
+    Incremental fix for lonely ampersands in front of the parser, `& ` becomes `&amp; `
+
+    Chunks are either all `str` or all bytes-like. A trailing `&` is held back until the
+    next chunk, so a `& ` spanning two chunks is fixed as well.
+
+    Mutable.
+    """
+
+    def __init__(self):
+
+        self._lonely, self._fixed, self._carry = None, None, None
+
+    def feed(
+        self, chunk: typing.Union[str, bytes, bytearray, memoryview]
+    ) -> typing.Union[str, bytes]:
+        "Returns the fixed chunk, possibly one character short"
+
+        if self._carry is None:
+            if isinstance(chunk, str):
+                self._lonely, self._fixed, self._carry = "& ", "&amp; ", ""
+            else:
+                self._lonely, self._fixed, self._carry = b"& ", b"&amp; ", b""
+
+        chunk = self._carry + chunk
+        if chunk.endswith(self._lonely[:1]):
+            chunk, self._carry = chunk[:-1], chunk[-1:]
+        else:
+            self._carry = self._carry[:0]
+
+        return chunk.replace(
+            self._lonely, self._fixed
+        )  # From plugin installer: Fix lonely ampersands in metadata
+
+    def close(self) -> typing.Union[str, bytes]:
+        "Returns whatever was held back"
+
+        carry = self._carry if self._carry is not None else b""
+        self._carry = None
+
+        return carry
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/profiling.py: Opt-in profiling of import stages
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import time
+import tracemalloc
+import typing
+
+import typeguard
+from typeguard import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+PROFILER = None  # Active profiler - hooks in hot paths only check this for `None`
+
+TYPEGUARD_HOOKS = ("_CallMemo", "check_argument_types", "check_return_type")
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginProfiler:
+    """
+    Records counts, cumulative wall time and (optionally) allocated memory per import stage
+
+    Used as a context manager, one profiler can be active at a time. Stages nest,
+    e.g. `typeguard` time is also part of the `field_import:*` stages.
+    """
+
+    @typechecked
+    def __init__(self, trace_allocations: bool = False, trace_typeguard: bool = True):
+
+        self._trace_allocations = trace_allocations
+        self._trace_typeguard = trace_typeguard
+
+        self._stages = {}  # stage name -> [count, time, allocated]
+        self._started_tracemalloc = False
+        self._typeguard_hooks = {}
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginProfiler stages={len(self._stages):d}>"
+
+    def __enter__(self):
+
+        global PROFILER
+
+        if PROFILER is not None:
+            raise RuntimeError("another profiler is already active")
+
+        if self._trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self._trace_typeguard:
+            self._hook_typeguard()
+
+        PROFILER = self
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        global PROFILER
+
+        PROFILER = None
+
+        self._unhook_typeguard()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HOOKS
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def start(self):
+        "Returns a token for `stop`"
+
+        return (
+            time.perf_counter(),
+            tracemalloc.get_traced_memory()[0] if self._trace_allocations else 0,
+        )
+
+    def stop(self, stage, token):
+        "Adds the time (and memory) since `start` to a stage"
+
+        elapsed = time.perf_counter() - token[0]
+        allocated = (
+            tracemalloc.get_traced_memory()[0] - token[1]
+            if self._trace_allocations
+            else 0
+        )
+
+        stats = self._stages.get(stage, None)
+        if stats is None:
+            stats = self._stages[stage] = [0, 0.0, 0]
+
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += allocated
+
+    def _timed(self, stage, func):
+
+        def wrapper(*args, **kwargs):
+            token = self.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop(stage, token)
+
+        return wrapper
+
+    def _hook_typeguard(self):
+        "typeguard's `@typechecked` wrappers look these up as module globals on every call"
+
+        for name in TYPEGUARD_HOOKS:
+            func = getattr(typeguard, name, None)
+            if func is None:
+                continue
+            self._typeguard_hooks[name] = func
+            setattr(typeguard, name, self._timed("typeguard", func))
+
+    def _unhook_typeguard(self):
+
+        for name, func in self._typeguard_hooks.items():
+            setattr(typeguard, name, func)
+
+        self._typeguard_hooks.clear()
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def as_dict(self) -> typing.Dict[str, typing.Dict[str, typing.Union[int, float]]]:
+        "Export stages to JSON-serializable dict, sorted by cumulative time"
+
+        return {
+            stage: dict(
+                count=count,
+                time=elapsed,
+                **(dict(allocated=allocated) if self._trace_allocations else {}),
+            )
+            for stage, (count, elapsed, allocated) in sorted(
+                self._stages.items(), key=lambda item: item[1][1], reverse=True
+            )
+        }
+
+    @typechecked
+    def as_json(self, indent: typing.Union[None, int] = 2) -> str:
+        "Export stages as JSON string"
+
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def clear(self):
+        "Drops all recorded stages"
+
+        self._stages.clear()
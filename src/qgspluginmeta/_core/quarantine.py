@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/quarantine.py: Quarantine for records failing bulk import
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import typing
+
+from typeguard import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class QgsPluginQuarantine:
+    """
+    Collects records failing a bulk import instead of aborting it
+
+    Pass it as `quarantine` to `import_xml`, `import_metadatatxts` or `QgsPluginZipScanner`.
+    Records are kept as given: raw XML dicts, tuples of plugin id and metadata.txt
+    string, or zip file names. The field responsible for a failure is determined by
+    linting the record, on the slow path only.
+
+    Mutable.
+    """
+
+    def __init__(self):
+
+        self._records = []
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginQuarantine records={len(self._records):d}>"
+
+    def __len__(self) -> int:
+
+        return len(self._records)
+
+    def __iter__(self) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+
+        return iter(list(self._records))
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @staticmethod
+    def _failing_field(
+        record: typing.Any, fields: typing.Union[None, typing.FrozenSet[str]]
+    ) -> typing.Union[None, str]:
+        "First field with a finding (other than a missing required one) that the import looked at"
+
+        from .lint import _lint_record  # process pool machinery, slow path only
+
+        findings, _ = _lint_record(record, frozenset())
+
+        for finding in findings:
+            if finding["rule"] == "required_fields":
+                continue
+            if (
+                fields is not None
+                and finding["field"] not in fields
+                and finding["field"] not in ("id", "version", None)
+            ):
+                continue  # not part of the projection, did not cause the failure
+            return finding["field"]
+
+        return None
+
+    def _add(
+        self,
+        raw: typing.Any,
+        exception: Exception,
+        fields: typing.Union[None, typing.FrozenSet[str]] = None,
+        record: typing.Any = None,
+    ):
+        "`record` is what gets linted for the field name if it differs from `raw`"
+
+        self._records.append(
+            {
+                "raw": raw,
+                "field": self._failing_field(raw if record is None else record, fields),
+                "exception": exception,
+            }
+        )
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def clear(self):
+
+        self._records.clear()
+
+    def summary(self) -> typing.Dict[str, int]:
+        "Number of quarantined records by exception class, most frequent first"
+
+        counts = {}
+        for record in self._records:
+            name = type(record["exception"]).__name__
+            counts[name] = counts.get(name, 0) + 1
+
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # PROPERTIES
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @property
+    def records(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        "Quarantined records as dicts of `raw`, `field` and `exception`"
+        return self._records.copy()
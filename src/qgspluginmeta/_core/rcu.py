@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/rcu.py: Read-copy-update repository for concurrent readers
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import mmap
+import threading
+import typing
+import weakref
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .metadata import QgsPluginMetadata
+from .repo import _split_xml
+from .snapshots import QgsPluginSnapshotStore
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _key(release):
+    "Plugin id and original version string (not type-checked, hot)"
+
+    version = release._fields["version"]._value
+    if version is None:
+        raise ValueError("release has no version")
+
+    return release._id, version.original
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginRepositorySnapshot:
+    """
+    Consistent view of a `QgsPluginSharedRepository` at one generation
+
+    Never changes once published, so it can be read from any number of threads without
+    locks. Release objects and per-plugin release tuples are shared with other generations:
+    do not modify them, `freeze` them or edit a copy.
+
+    Immutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    __slots__ = ("_generation", "_releases", "_ids", "_latest", "__weakref__")
+
+    def __init__(self, generation, releases, ids, latest):
+
+        self._generation = generation
+        self._releases = releases  # key -> release
+        self._ids = ids  # id -> tuple of releases, ascending by version
+        self._latest = latest  # id -> (newest release, newest stable release or None)
+
+    def __repr__(self) -> str:
+
+        return (
+            f"<QgsPluginRepositorySnapshot generation={self._generation:d}"
+            f" releases={len(self._releases):d} plugins={len(self._ids):d}>"
+        )
+
+    def __len__(self):
+
+        return len(self._releases)
+
+    def __iter__(self):
+
+        return iter(self._releases.values())
+
+    def __contains__(self, key):
+
+        return key in self._releases
+
+    def __getitem__(self, key):
+
+        return self._releases[key]
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @property
+    def generation(self) -> int:
+        "Number of the update which published this snapshot, 0 for the initial one"
+
+        return self._generation
+
+    @typechecked
+    def get(
+        self, plugin_id: str, version: str
+    ) -> typing.Union[None, QgsPluginMetadataABC]:
+        "A release by plugin id and original version string, `None` if there is none"
+
+        return self._releases.get((plugin_id, version), None)
+
+    @typechecked
+    def ids(self) -> typing.List[str]:
+        "Plugin ids of all releases"
+
+        return list(self._ids.keys())
+
+    @typechecked
+    def releases(self, plugin_id: str) -> typing.List[QgsPluginMetadataABC]:
+        "All releases of one plugin, ascending by version"
+
+        return list(self._ids.get(plugin_id, ()))
+
+    @typechecked
+    def latest(
+        self, plugin_id: str, stable: bool = False
+    ) -> typing.Union[None, QgsPluginMetadataABC]:
+        "Newest (stable) release of a plugin, `None` if there is none"
+
+        if plugin_id not in self._latest.keys():
+            return None
+
+        return self._latest[plugin_id][1 if stable else 0]
+
+
+class QgsPluginSharedRepository:
+    """
+    Repository for many reader threads and one updating writer (read-copy-update)
+
+    Readers call `snapshot` and get the current `QgsPluginRepositorySnapshot` without taking
+    a lock. Writers are serialized. Each update computes the difference to the current
+    snapshot and builds the next one from it: release and container objects of unchanged
+    plugins are reused, only changed plugins are sorted again. Unchanged records of a
+    re-imported `plugins.xml` are recognized by fingerprint and not parsed again. The new
+    snapshot is published with a single reference swap, an old one is reclaimed once no
+    reader holds it anymore.
+
+    Mutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    @typechecked
+    def __init__(self, releases: typing.Iterable[QgsPluginMetadataABC] = tuple()):
+
+        self._lock = threading.Lock()  # writers only
+        self._fingerprints = {}  # digest of raw XML release dict -> release, current
+        self._alive = weakref.WeakSet()  # published snapshots still referenced
+        self._generation = -1
+        self._current = QgsPluginRepositorySnapshot(-1, {}, {}, {})  # never published
+
+        self._next({_key(release): release for release in releases}, set())
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginSharedRepository generation={self._generation:d} alive={len(self._alive):d}>"
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @staticmethod
+    def _parts(snapshot):
+
+        return snapshot._releases, snapshot._ids, snapshot._latest
+
+    def _publish(self, snapshot):
+
+        self._alive.add(snapshot)
+        self._current = snapshot  # atomic, readers see the old or the new snapshot
+
+    @staticmethod
+    def _group(releases):
+        "Releases of a plugin ascending by version, newest and newest stable release"
+
+        ordered = tuple(
+            sorted(releases, key=lambda release: release._fields["version"]._value)
+        )
+        stable = [
+            release for release in ordered if release._fields["version"]._value.stable
+        ]
+
+        return ordered, (ordered[-1], stable[-1] if len(stable) > 0 else None)
+
+    def _next(self, upserts, removals):
+        "Builds and publishes the next snapshot from a difference to the current one"
+
+        current = self._current
+        releases = current._releases.copy()  # shallow: values are shared
+        ids = current._ids.copy()
+        latest = current._latest.copy()
+
+        changed = {}  # id -> ({key: release} upserts, {keys} removals)
+        for key in removals:
+            releases.pop(key)
+            changed.setdefault(key[0], ({}, set()))[1].add(key)
+        for key, release in upserts.items():
+            releases[key] = release
+            changed.setdefault(key[0], ({}, set()))[0][key] = release
+
+        for plugin_id, (plugin_upserts, plugin_removals) in changed.items():
+            group = {_key(release): release for release in ids.get(plugin_id, ())}
+            for key in plugin_removals:
+                group.pop(key)
+            group.update(plugin_upserts)
+            if len(group) == 0:
+                ids.pop(plugin_id)
+                latest.pop(plugin_id)
+            else:
+                ids[plugin_id], latest[plugin_id] = self._group(group.values())
+
+        self._generation += 1
+        self._publish(
+            QgsPluginRepositorySnapshot(self._generation, releases, ids, latest)
+        )
+
+    def _diff(self, releases):
+        "Changed or added releases by key and keys not among `releases` anymore"
+
+        current = self._current._releases
+        upserts, seen = {}, set()
+
+        for release in releases:
+            key = _key(release)
+            seen.add(key)
+            published = current.get(key, None)
+            if published is release:
+                continue
+            if published is not None and published.freeze() == release.freeze():
+                continue  # unchanged content, keep the published object
+            upserts[key] = release
+
+        return upserts, current.keys() - seen
+
+    @staticmethod
+    def _stats(upserts, removals, current):
+
+        changed = sum(1 for key in upserts.keys() if key in current)
+
+        return {
+            "added": len(upserts) - changed,
+            "changed": changed,
+            "removed": len(removals),
+        }
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def snapshot(self) -> QgsPluginRepositorySnapshot:
+        "Current snapshot, lock-free (not type-checked, hot)"
+
+        return self._current
+
+    @property
+    def generation(self) -> int:
+        "Number of published updates"
+
+        return self._generation
+
+    @property
+    def alive(self) -> int:
+        "Number of snapshots not reclaimed yet, including the current one"
+
+        return len(self._alive)
+
+    @typechecked
+    def update(
+        self, releases: typing.Iterable[QgsPluginMetadataABC]
+    ) -> typing.Dict[str, int]:
+        "Replaces the content with `releases`, publishes a new snapshot if anything changed"
+
+        with self._lock:
+            upserts, removals = self._diff(releases)
+            stats = self._stats(upserts, removals, self._current._releases)
+            if len(upserts) > 0 or len(removals) > 0:
+                self._fingerprints = {}  # may refer to replaced releases
+                self._next(upserts, removals)
+
+        return stats
+
+    @typechecked
+    def update_xml(
+        self,
+        xml_string: typing.Union[str, bytes, bytearray, memoryview, mmap.mmap],
+    ) -> typing.Dict[str, int]:
+        """
+        Replaces the content with the releases of a `plugins.xml` document, only records
+        which differ from the previous import are parsed. Nothing is published if parsing fails.
+        """
+
+        with self._lock:
+            fingerprints = {}  # by key, None if the feed holds differing records for it
+            releases = []
+            for release_dict in _split_xml(xml_string):
+                fingerprint = QgsPluginSnapshotStore._fingerprint(release_dict)
+                release = self._fingerprints.get(fingerprint, None)
+                if release is None:
+                    release = QgsPluginMetadata.from_xmldict(release_dict)
+                key = _key(release)
+                if fingerprints.get(key, fingerprint) != fingerprint:
+                    fingerprint = None  # only one of them gets published
+                fingerprints[key] = fingerprint
+                releases.append(release)
+
+            upserts, removals = self._diff(releases)
+            stats = self._stats(upserts, removals, self._current._releases)
+            if len(upserts) > 0 or len(removals) > 0:
+                self._next(upserts, removals)
+            current = self._current._releases
+            self._fingerprints = {
+                fingerprint: current[key]  # the published, maybe older object
+                for key, fingerprint in fingerprints.items()
+                if fingerprint is not None
+            }
+
+        return stats
+
+    @typechecked
+    def apply(
+        self,
+        add: typing.Iterable[QgsPluginMetadataABC] = tuple(),
+        remove: typing.Iterable[typing.Tuple[str, str]] = tuple(),
+    ) -> typing.Dict[str, int]:
+        "Adds or replaces and removes (by id and version) releases, publishes a new snapshot"
+
+        with self._lock:
+            current = self._current._releases
+            upserts = {_key(release): release for release in add}
+            removals = set(remove)
+            for key in removals:
+                if key not in current.keys() or key in upserts.keys():
+                    raise KeyError(f"{key!r} is not a release to be removed")
+            stats = self._stats(upserts, removals, current)
+            if len(upserts) > 0 or len(removals) > 0:
+                self._fingerprints = {}
+                self._next(upserts, removals)
+
+        return stats
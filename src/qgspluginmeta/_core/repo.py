@@ -28,13 +28,16 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import mmap
 import typing
 
 from .abc import QgsPluginMetadataABC
-from .metadata import QgsPluginMetadata
+from .const import XML_CHUNK_SIZE
+from .metadata import _projection, QgsPluginMetadata
+from .quarantine import QgsPluginQuarantine
+from .stream import QgsPluginXmlParser
 
 from typeguard import typechecked
-import xmltodict
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
@@ -42,20 +45,73 @@ import xmltodict
 
 
 @typechecked
-def import_xml(xml_string: str) -> typing.List[QgsPluginMetadataABC]:
+def import_xml(
+    xml_string: typing.Union[str, bytes, bytearray, memoryview, mmap.mmap],
+    fields: typing.Union[None, typing.Iterable[str]] = None,
+    quarantine: typing.Union[None, QgsPluginQuarantine] = None,
+) -> typing.List[QgsPluginMetadataABC]:
     """
-    Expects a (UTF-8) string containing an entire XML document (`plugins.xml`)
+    Expects a string or (UTF-8) bytes-like object containing an entire XML document (`plugins.xml`)
+
+    If `fields` is given, only those fields (plus `id` and `version`) are parsed and imported.
+    If `quarantine` is given, failing releases are moved there instead of raising.
+    """
+
+    fields = _projection(fields)
+
+    if quarantine is None:
+        return [
+            QgsPluginMetadata.from_xmldict(release_dict, fields=fields)
+            for release_dict in _split_xml(xml_string, fields=fields)
+        ]
+
+    releases = []
+
+    for release_dict in _split_xml(xml_string, fields=fields):
+        try:
+            releases.append(QgsPluginMetadata.from_xmldict(release_dict, fields=fields))
+        except Exception as e:
+            quarantine._add(release_dict, e, fields)
+
+    return releases
+
+
+@typechecked
+def import_metadatatxts(
+    metadatatxts: typing.Iterable[typing.Tuple[str, str]],
+    fields: typing.Union[None, typing.Iterable[str]] = None,
+    quarantine: typing.Union[None, QgsPluginQuarantine] = None,
+) -> typing.List[QgsPluginMetadataABC]:
+    """
+    Expects tuples of plugin id and metadata.txt string
+
+    If `fields` is given, only those fields (plus `id` and `version`) are imported.
+    If `quarantine` is given, failing records are moved there instead of raising.
     """
 
-    return [
-        QgsPluginMetadata.from_xmldict(release_dict)
-        for release_dict in _split_xml(xml_string)
-    ]
+    fields = _projection(fields)
+    releases = []
+
+    for plugin_id, metadatatxt_string in metadatatxts:
+        try:
+            releases.append(
+                QgsPluginMetadata.from_metadatatxt(
+                    plugin_id, metadatatxt_string, fields=fields
+                )
+            )
+        except Exception as e:
+            if quarantine is None:
+                raise
+            quarantine._add((plugin_id, metadatatxt_string), e, fields)
+
+    return releases
 
 
 @typechecked
 def export_xml(metadata: typing.List[QgsPluginMetadataABC]) -> str:
 
+    import xmltodict  # only on first use, for startup time
+
     return xmltodict.unparse(
         {
             "plugins": {
@@ -66,20 +122,36 @@ def export_xml(metadata: typing.List[QgsPluginMetadataABC]) -> str:
     )
 
 
+def _xml_chunks(
+    xml_string: typing.Union[str, bytes, bytearray, memoryview, mmap.mmap],
+) -> typing.Generator[typing.Union[str, memoryview], None, None]:
+    "Yields slices of an XML document, only one chunk of bytes input is copied at a time"
+
+    if isinstance(xml_string, str):
+        for offset in range(0, len(xml_string), XML_CHUNK_SIZE):
+            yield xml_string[offset : offset + XML_CHUNK_SIZE]
+        return
+
+    with memoryview(xml_string).cast("B") as view:  # released to allow closing an mmap
+        for offset in range(0, len(view), XML_CHUNK_SIZE):
+            yield view[offset : offset + XML_CHUNK_SIZE]
+
+
 @typechecked
-def _split_xml(xml_string: str) -> typing.Generator[typing.Dict, None, None]:
+def _split_xml(
+    xml_string: typing.Union[str, bytes, bytearray, memoryview, mmap.mmap],
+    fields: typing.Union[None, typing.Iterable[str]] = None,
+) -> typing.Generator[typing.Dict, None, None]:
     """
-    Expects a (UTF-8) string containing an entire XML document (`plugins.xml`)
+    Expects a string or (UTF-8) bytes-like object containing an entire XML document (`plugins.xml`)
+
+    Releases are yielded while parsing. If `fields` is given, elements not required
+    for those fields are skipped by the parser. The document is never copied as a whole.
     """
 
-    xml_string = xml_string.replace(
-        "& ", "&amp; "
-    )  # From plugin installer: Fix lonely ampersands in metadata
-    tree = xmltodict.parse(xml_string)
+    parser = QgsPluginXmlParser(fields=fields, raw=True)
 
-    if not isinstance(tree["plugins"]["pyqgis_plugin"], list):  # just one
-        yield dict(tree["plugins"]["pyqgis_plugin"])
-        return
+    for chunk in _xml_chunks(xml_string):
+        yield from parser.feed(chunk)
 
-    for release_dict in tree["plugins"]["pyqgis_plugin"]:  # more than one
-        yield dict(release_dict)
+    yield from parser.close()
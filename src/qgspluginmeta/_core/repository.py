@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/repository.py: Collection of plugin releases with incrementally updated views
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC, QgsPluginRepositoryABC
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class QgsPluginRepository(QgsPluginRepositoryABC):
+    """
+    Collection of plugin releases, unique by plugin id and version
+
+    Views (e.g. a search index) attached to the repository are kept up to date: They
+    receive every added and removed release through their `add` and `remove` methods.
+
+    Mutable.
+    """
+
+    def __init__(
+        self,
+        releases: typing.Iterable[QgsPluginMetadataABC] = tuple(),
+    ):
+
+        self._releases = {}  # (id, version) -> release
+        self._ids = {}  # id -> {version: release}
+        self._views = []
+
+        for release in releases:
+            self.add(release)
+
+    def __repr__(self) -> str:
+
+        return (
+            f"<QgsPluginRepository releases={len(self):d} plugins={len(self._ids):d}>"
+        )
+
+    def __len__(self) -> int:
+
+        return len(self._releases)
+
+    def __iter__(self) -> typing.Iterator[QgsPluginMetadataABC]:
+
+        return iter(list(self._releases.values()))
+
+    def __contains__(self, key: typing.Tuple[str, str]) -> bool:
+
+        return key in self._releases.keys()
+
+    def __getitem__(self, key: typing.Tuple[str, str]) -> QgsPluginMetadataABC:
+
+        if key not in self._releases.keys():
+            raise KeyError('"key" is not a release in this repository')
+
+        return self._releases[key]
+
+    @staticmethod
+    def key(release: QgsPluginMetadataABC) -> typing.Tuple[str, str]:
+        "Plugin id and original version string of a release"
+
+        if not release["version"].value_set:
+            raise ValueError("release has no version")
+
+        return release["id"].value, release["version"].value.original
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def add(self, release: QgsPluginMetadataABC):
+        "Adds a release, replaces an existing release with identical id and version"
+
+        key = self.key(release)
+
+        if key in self._releases.keys():
+            self.remove(*key)
+
+        self._releases[key] = release
+        self._ids.setdefault(key[0], {})[key[1]] = release
+
+        for view in self._views:
+            view.add(release)
+
+    def remove(self, plugin_id: str, version: str) -> QgsPluginMetadataABC:
+        "Removes and returns a release"
+
+        release = self._releases.pop((plugin_id, version))
+
+        versions = self._ids[plugin_id]
+        versions.pop(version)
+        if len(versions) == 0:
+            self._ids.pop(plugin_id)
+
+        for view in self._views:
+            view.remove(release)
+
+        return release
+
+    def ids(self) -> typing.List[str]:
+        "Plugin ids of all releases"
+
+        return list(self._ids.keys())
+
+    def releases(self, plugin_id: str) -> typing.List[QgsPluginMetadataABC]:
+        "All releases of one plugin"
+
+        return list(self._ids.get(plugin_id, {}).values())
+
+    def attach(self, view: typing.Any) -> typing.Any:
+        "Feeds all releases into a view, keeps it updated and returns it"
+
+        for release in self._releases.values():
+            view.add(release)
+        self._views.append(view)
+
+        return view
+
+    def detach(self, view: typing.Any):
+        "Stops updating a view"
+
+        self._views.remove(view)
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/scan.py: Parallel bulk scanner for folders of plugin zip files
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import hashlib
+import json
+import os
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .archive import read_zip_metadatatxt
+from .const import HASH_BLOCK_SIZE, SCAN_MANIFEST_VERSION
+from .lib import write_atomic
+from .metadata import _projection, QgsPluginMetadata
+from .quarantine import QgsPluginQuarantine
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+def _hash_file(fn: str) -> str:
+
+    h = hashlib.sha256()
+
+    with open(fn, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            h.update(block)
+
+    return h.hexdigest()
+
+
+@typechecked
+def _scan_zipfile(
+    zip_fn: str,
+    known_hash: typing.Union[None, str],
+    fields: typing.Union[None, typing.FrozenSet[str]],
+) -> typing.Tuple[str, typing.Union[None, QgsPluginMetadataABC]]:
+    "Runs in worker process: returns hash and meta data, meta data is None if hash is known"
+
+    zip_hash = _hash_file(zip_fn)
+
+    if zip_hash == known_hash:
+        return zip_hash, None
+
+    return zip_hash, QgsPluginMetadata.from_zipfile(zip_fn, fields=fields)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class QgsPluginZipScanner:
+    """
+    Scans a folder (recursively) for plugin zip files and reads their meta data in parallel
+
+    Per-file errors are collected in `errors` instead of being raised, and are also moved
+    to `quarantine` if given. If a manifest file is given, files unchanged since the last
+    scan (by size and mtime, else by content hash) are skipped and listed in `skipped`.
+
+    Mutable.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        manifest_fn: typing.Union[None, str] = None,
+        workers: typing.Union[None, int] = None,
+        max_pending: typing.Union[None, int] = None,
+        fields: typing.Union[None, typing.Iterable[str]] = None,
+        quarantine: typing.Union[None, QgsPluginQuarantine] = None,
+    ):
+
+        if not os.path.isdir(path):
+            raise ValueError(f'"{path:s}" is not a folder')
+
+        self._path = path
+        self._manifest_fn = manifest_fn
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._max_pending = (
+            max_pending if max_pending is not None else 4 * self._workers
+        )
+        self._fields = _projection(fields)
+        self._quarantine = quarantine
+
+        if self._workers < 1:
+            raise ValueError('"workers" must be at least 1')
+        if self._max_pending < 1:
+            raise ValueError('"max_pending" must be at least 1')
+
+        self._errors = {}
+        self._skipped = []
+
+    def __repr__(self) -> str:
+
+        return f'<QgsPluginZipScanner path="{self._path:s}">'
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def _zip_fns(self) -> typing.Generator[str, None, None]:
+
+        for root, dirs, fns in os.walk(self._path):
+            dirs.sort()
+            for fn in sorted(fns):
+                if fn.lower().endswith(".zip"):
+                    yield os.path.join(root, fn)
+
+    def _quarantine_zipfile(self, zip_fn: str, exception: Exception):
+
+        if self._quarantine is None:
+            return
+
+        try:
+            record = read_zip_metadatatxt(zip_fn)  # for determining the failing field
+        except Exception:
+            record = None
+
+        self._quarantine._add(zip_fn, exception, self._fields, record=record)
+
+    def _load_manifest(self) -> typing.Dict[str, typing.Dict]:
+
+        if self._manifest_fn is None or not os.path.exists(self._manifest_fn):
+            return {}
+
+        with open(self._manifest_fn, "r") as f:
+            manifest = json.load(f)
+
+        if manifest.get("version", None) != SCAN_MANIFEST_VERSION:
+            return {}
+
+        return manifest["files"]
+
+    def _save_manifest(self, files: typing.Dict[str, typing.Dict]):
+
+        if self._manifest_fn is None:
+            return
+
+        write_atomic(
+            self._manifest_fn,
+            json.dumps({"version": SCAN_MANIFEST_VERSION, "files": files}),
+        )
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def scan(
+        self,
+    ) -> typing.Generator[typing.Tuple[str, QgsPluginMetadataABC], None, None]:
+        "Yields tuples of zip file name and meta data in order of completion"
+
+        self._errors.clear()
+        self._skipped.clear()
+
+        manifest = self._load_manifest()
+        files = {}
+        todo = []
+
+        for zip_fn in self._zip_fns():
+            key = os.path.relpath(zip_fn, self._path)
+            stat = os.stat(zip_fn)
+            entry = manifest.get(key, None)
+            if (
+                entry is not None
+                and entry["size"] == stat.st_size
+                and entry["mtime_ns"] == stat.st_mtime_ns
+            ):
+                files[key] = entry
+                self._skipped.append(zip_fn)
+                continue
+            todo.append((zip_fn, key, stat, None if entry is None else entry["sha256"]))
+
+        todo.reverse()  # pop from the end, keep walk order
+        pending = {}
+
+        try:
+            with ProcessPoolExecutor(max_workers=self._workers) as pool:
+                while len(todo) > 0 or len(pending) > 0:
+                    while len(todo) > 0 and len(pending) < self._max_pending:
+                        item = todo.pop()
+                        future = pool.submit(
+                            _scan_zipfile, item[0], item[3], self._fields
+                        )
+                        pending[future] = item
+                    done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        zip_fn, key, stat, _ = pending.pop(future)
+                        try:
+                            zip_hash, meta = future.result()
+                        except Exception as e:
+                            self._errors[zip_fn] = e
+                            self._quarantine_zipfile(zip_fn, e)
+                            continue
+                        files[key] = {
+                            "size": stat.st_size,
+                            "mtime_ns": stat.st_mtime_ns,
+                            "sha256": zip_hash,
+                        }
+                        if meta is None:
+                            self._skipped.append(zip_fn)
+                            continue
+                        yield zip_fn, meta
+        finally:
+            self._save_manifest(files)
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # PROPERTIES
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @property
+    def errors(self) -> typing.Dict[str, Exception]:
+        "Errors of last scan by zip file name"
+        return self._errors.copy()
+
+    @property
+    def skipped(self) -> typing.List[str]:
+        "Unchanged zip files skipped during last scan"
+        return self._skipped.copy()
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/search.py: Full-text search index over i18n fields
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import bisect
+import re
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .const import SEARCH_TOKEN_PATTERN, SEARCH_WEIGHTS
+from .latest import QgsPluginLatestView
+from .repository import QgsPluginRepository
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_TOKEN = re.compile(SEARCH_TOKEN_PATTERN)
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginSearchIndex:
+    """
+    Inverted index over name, tags, description and about of plugin releases
+
+    Tokens are words, case folded. Matches rank by field: name before tags before
+    description before about (see `SEARCH_WEIGHTS`). If `latest_only` is set, only the
+    newest release of every plugin is indexed. Can be attached to a repository.
+
+    Mutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        releases: typing.Iterable[QgsPluginMetadataABC] = tuple(),
+        latest_only: bool = False,
+    ):
+
+        self._postings = {}  # token -> {key: score}
+        self._tokens = []  # sorted vocabulary for prefix matching
+        self._docs = {}  # key -> (release, tokens) of indexed releases
+        self._latest_view = QgsPluginLatestView() if latest_only else None
+        self._latest = {}  # id -> key of indexed release, only if latest_only
+
+        for release in releases:
+            self.add(release)
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginSearchIndex releases={len(self):d} tokens={len(self._tokens):d}>"
+
+    def __len__(self) -> int:
+
+        return len(self._docs)
+
+    @staticmethod
+    @typechecked
+    def tokenize(text: str) -> typing.List[str]:
+        "Splits text into case folded words"
+
+        return _TOKEN.findall(text.casefold())
+
+    def _scores(self, release: QgsPluginMetadataABC) -> typing.Dict[str, int]:
+
+        scores = {}
+
+        for name, weight in SEARCH_WEIGHTS.items():
+            if name not in release.keys() or not release[name].value_set:
+                continue
+            value = release[name].value
+            text = " ".join(value) if isinstance(value, tuple) else value
+            for token in _TOKEN.findall(text.casefold()):
+                scores[token] = scores.get(token, 0) + weight
+
+        return scores
+
+    def _index(self, key: typing.Tuple[str, str], release: QgsPluginMetadataABC):
+
+        scores = self._scores(release)
+
+        for token, score in scores.items():
+            postings = self._postings.get(token, None)
+            if postings is None:
+                postings = self._postings[token] = {}
+                bisect.insort(self._tokens, token)
+            postings[key] = score
+
+        self._docs[key] = (release, tuple(scores.keys()))
+
+    def _unindex(self, key: typing.Tuple[str, str]):
+
+        _, tokens = self._docs.pop(key)
+
+        for token in tokens:
+            postings = self._postings[token]
+            postings.pop(key)
+            if len(postings) == 0:
+                self._postings.pop(token)
+                self._tokens.pop(bisect.bisect_left(self._tokens, token))
+
+    def _reindex_latest(self, plugin_id: str):
+
+        release = self._latest_view.latest(plugin_id)
+        latest = None if release is None else QgsPluginRepository.key(release)
+
+        current = self._latest.pop(plugin_id, None)
+        if current is not None and current != latest and current in self._docs.keys():
+            self._unindex(current)
+
+        if latest is None:
+            return
+
+        if latest not in self._docs.keys():
+            self._index(latest, release)
+        self._latest[plugin_id] = latest
+
+    def _match(
+        self, token: str, prefix: bool
+    ) -> typing.Dict[typing.Tuple[str, str], int]:
+
+        if not prefix:
+            return self._postings.get(token, {})
+
+        matches = {}
+        index = bisect.bisect_left(self._tokens, token)
+        while index < len(self._tokens) and self._tokens[index].startswith(token):
+            for key, score in self._postings[self._tokens[index]].items():
+                if score > matches.get(key, 0):
+                    matches[key] = score
+            index += 1
+
+        return matches
+
+    def _ranked(self, query, prefix, limit):
+        "Keys and scores of releases matching all words of `query`, best matches first"
+
+        tokens = self.tokenize(query)
+        if len(tokens) == 0:
+            return []
+
+        scores = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            matches = self._match(token, prefix)
+            if scores is None:
+                scores = dict(matches)
+            else:
+                scores = {
+                    key: score + matches[key]
+                    for key, score in scores.items()
+                    if key in matches.keys()
+                }
+            if len(scores) == 0:
+                return []
+
+        keys = sorted(scores.keys(), key=lambda key: (-scores[key], key))
+        if limit is not None:
+            keys = keys[:limit]
+
+        return [(key, scores[key]) for key in keys]
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def add(self, release: QgsPluginMetadataABC):
+        "Indexes a release, replaces an indexed release with identical id and version"
+
+        key = QgsPluginRepository.key(release)
+
+        if key in self._docs.keys():
+            self._unindex(key)
+
+        if self._latest_view is None:
+            self._index(key, release)
+            return
+
+        self._latest_view.add(release)
+        self._reindex_latest(key[0])
+
+    @typechecked
+    def remove(self, release: QgsPluginMetadataABC):
+        "Drops a release from the index"
+
+        key = QgsPluginRepository.key(release)
+
+        if self._latest_view is None:
+            self._unindex(key)
+            return
+
+        if key in self._docs.keys():
+            self._unindex(key)
+        self._latest_view.remove(release)
+        self._reindex_latest(key[0])
+
+    @typechecked
+    def search(
+        self,
+        query: str,
+        prefix: bool = False,
+        limit: typing.Union[None, int] = None,
+    ) -> typing.List[QgsPluginMetadataABC]:
+        """
+        Returns releases matching all words of `query`, best matches first
+
+        If `prefix` is set, query words also match longer words starting with them.
+        """
+
+        return [self._docs[key][0] for key, _ in self._ranked(query, prefix, limit)]
@@ -0,0 +1,580 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/shards.py: Repository sharded across worker processes
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import heapq
+import itertools
+import mmap
+import multiprocessing
+import os
+import typing
+import zlib
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .const import SHARD_BATCH_SIZE
+from .facets import QgsPluginFacets
+from .frozen import QgsPluginMetadataFrozen
+from .latest import QgsPluginLatestView
+from .metadata import _projection, _xml_id, QgsPluginMetadata
+from .quarantine import QgsPluginQuarantine
+from .repo import _split_xml
+from .repository import QgsPluginRepository
+from .search import QgsPluginSearchIndex
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES (WORKER)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _encode(release):
+    "Compact, quickly pickled form of a release: shared field name tuple plus typed values"
+
+    frozen = release.freeze()
+
+    return frozen._names, frozen._values
+
+
+def _key(record):
+    "Plugin id and original version string of an encoded release"
+
+    names, values = record
+
+    return values[names.index("id")], values[names.index("version")].original
+
+
+def _decode(record):
+
+    return QgsPluginMetadataFrozen(*record)
+
+
+class _Shard:
+    "State of one worker process: a repository with views attached, methods are the protocol"
+
+    def __init__(self, latest_only):
+
+        self._repository = QgsPluginRepository()
+        self._search = self._repository.attach(
+            QgsPluginSearchIndex(latest_only=latest_only)
+        )
+        self._latest = self._repository.attach(QgsPluginLatestView())
+        self._facets = self._repository.attach(QgsPluginFacets())
+
+    def _add(self, parse, records, quarantine):
+
+        failures = []
+
+        for record in records:
+            try:
+                self._repository.add(parse(record))
+            except Exception as e:
+                if not quarantine:
+                    raise
+                failures.append((record, e))
+
+        return failures
+
+    def add_xmldicts(self, xml_dicts, fields, quarantine):
+
+        return self._add(
+            lambda xml_dict: QgsPluginMetadata.from_xmldict(xml_dict, fields=fields),
+            xml_dicts,
+            quarantine,
+        )
+
+    def add_metadatatxts(self, metadatatxts, fields, quarantine):
+
+        return self._add(
+            lambda item: QgsPluginMetadata.from_metadatatxt(*item, fields=fields),
+            metadatatxts,
+            quarantine,
+        )
+
+    def add_records(self, records):
+
+        for record in records:
+            self._repository.add(QgsPluginMetadata._from_values(*record))
+
+    def remove(self, plugin_id, version):
+
+        return _encode(self._repository.remove(plugin_id, version))
+
+    def get(self, keys):
+
+        releases = self._repository._releases
+
+        return [
+            _encode(releases[key]) if key in releases.keys() else None for key in keys
+        ]
+
+    def releases(self, plugin_id):
+
+        return [
+            _encode(release)
+            for release in sorted(
+                self._repository.releases(plugin_id),
+                key=lambda release: release["version"].value,
+            )
+        ]
+
+    def latest(self, plugin_ids, stable):
+
+        latest = (self._latest.latest(plugin_id, stable) for plugin_id in plugin_ids)
+
+        return [None if release is None else _encode(release) for release in latest]
+
+    def compatible(self, qgis_version, latest, criteria):
+
+        releases = self._facets.releases(
+            self._facets.select(qgis_version=qgis_version, **criteria)
+        )
+        if latest:
+            releases = QgsPluginLatestView(releases).releases()
+
+        return sorted((_key(record), record) for record in map(_encode, releases))
+
+    def count(self, qgis_version, criteria):
+
+        return self._facets.count(qgis_version=qgis_version, **criteria)
+
+    def counts(self, facet, qgis_version, criteria):
+
+        return self._facets.counts(facet, qgis_version=qgis_version, **criteria)
+
+    def search(self, query, prefix, limit):
+
+        docs = self._search._docs
+
+        return [
+            (-score, key, _encode(docs[key][0]))
+            for key, score in self._search._ranked(query, prefix, limit)
+        ]
+
+    def ids(self):
+
+        return sorted(self._repository.ids())
+
+    def size(self):
+
+        return len(self._repository)
+
+
+def _serve(connection, latest_only):
+    "Worker process: answers every request with `(True, result)` or `(False, exception)`"
+
+    shard = _Shard(latest_only)
+
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        method, args = request
+        try:
+            reply = True, getattr(shard, method)(*args)
+        except Exception as e:
+            reply = False, e
+        connection.send(reply)
+
+    connection.close()
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginShardedRepository:
+    """
+    Releases partitioned by plugin id (CRC32) across worker processes, one shard each
+
+    Every shard holds a `QgsPluginRepository` with a search index, a latest view and facets
+    attached. Ingest is parsed inside the shards in parallel, queries are scattered to the
+    shards involved and their results gathered and merged. Shards talk over pipes, releases
+    travel as pickled field name tuples and typed values (see `QgsPluginMetadataFrozen`),
+    so they are not parsed again. Every shard has at most one request in flight.
+    Queries return frozen snapshots, `thaw` them for editing. Not thread-safe, `close` (or use
+    as context manager) to stop the workers.
+
+    Mutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        shards: typing.Union[None, int] = None,
+        latest_only: bool = False,
+        batch_size: int = SHARD_BATCH_SIZE,
+    ):
+
+        shards = (os.cpu_count() or 1) if shards is None else shards
+        if shards < 1:
+            raise ValueError("at least one shard is required")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self._batch_size = batch_size
+        self._connections = []
+        self._workers = []
+
+        for _ in range(shards):
+            connection, worker_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=_serve, args=(worker_connection, latest_only), daemon=True
+            )
+            worker.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._workers.append(worker)
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginShardedRepository shards={len(self._connections):d}>"
+
+    def __len__(self) -> int:
+
+        return sum(self._scatter("size"))
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def _shard(self, plugin_id):
+
+        return zlib.crc32(plugin_id.encode("utf-8")) % len(self._connections)
+
+    def _check(self):
+
+        if len(self._connections) == 0:
+            raise ValueError("sharded repository is closed")
+
+    @staticmethod
+    def _reply(connection):
+
+        success, result = connection.recv()
+        if not success:
+            raise result
+
+        return result
+
+    def _request(self, shard, method, *args):
+
+        self._check()
+        self._connections[shard].send((method, args))
+
+        return self._reply(self._connections[shard])
+
+    def _gather(self, shards):
+        "Replies of shards in order, every reply is received before the first error is raised"
+
+        results, error = [], None
+
+        for shard in shards:
+            try:
+                results.append(self._reply(self._connections[shard]))
+            except Exception as e:
+                results.append(None)
+                error = e if error is None else error
+
+        if error is not None:
+            raise error
+
+        return results
+
+    def _scatter(self, method, *args):
+        "Sends one request to every shard, then gathers the replies"
+
+        self._check()
+        for connection in self._connections:
+            connection.send((method, args))
+
+        return self._gather(range(len(self._connections)))
+
+    def _ingest(self, items, plugin_id, method, args):
+        "Streams items in batches to their shards, one batch in flight per shard"
+
+        self._check()
+        batches = [[] for _ in self._connections]
+        pending = set()
+        results = []
+
+        def flush(shard):
+            if shard in pending:
+                pending.discard(shard)
+                results.extend(self._gather((shard,)))
+            self._connections[shard].send((method, (batches[shard], *args)))
+            pending.add(shard)
+            batches[shard] = []
+
+        try:
+            for item in items:
+                shard = self._shard(plugin_id(item))
+                batches[shard].append(item)
+                if len(batches[shard]) >= self._batch_size:
+                    flush(shard)
+            for shard, batch in enumerate(batches):
+                if len(batch) > 0:
+                    flush(shard)
+        finally:
+            results.extend(self._gather(sorted(pending)))
+
+        return results
+
+    def _quarantine(self, results, quarantine, fields):
+
+        for failures in results:
+            for record, exception in failures:
+                quarantine._add(record, exception, fields)
+
+    @staticmethod
+    def _xml_id(xml_dict):
+
+        try:
+            return _xml_id(xml_dict)
+        except (KeyError, ValueError):
+            return ""  # broken, the shard reports it
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def add(self, releases: typing.Iterable[QgsPluginMetadataABC]):
+        "Adds meta data objects, replaces existing releases with identical id and version"
+
+        self._ingest(
+            (_encode(release) for release in releases),
+            lambda record: record[1][record[0].index("id")],
+            "add_records",
+            (),
+        )
+
+    @typechecked
+    def add_xml(
+        self,
+        xml_string: typing.Union[str, bytes, bytearray, memoryview, mmap.mmap],
+        fields: typing.Union[None, typing.Iterable[str]] = None,
+        quarantine: typing.Union[None, QgsPluginQuarantine] = None,
+    ):
+        """
+        Adds all releases of a `plugins.xml` document, parsed inside the shards
+
+        If `fields` is given, only those fields (plus `id` and `version`) are imported.
+        If `quarantine` is given, failing records are moved there instead of raising.
+        """
+
+        fields = _projection(fields)
+
+        self._quarantine(
+            self._ingest(
+                _split_xml(xml_string, fields=fields),
+                self._xml_id,
+                "add_xmldicts",
+                (fields, quarantine is not None),
+            ),
+            quarantine,
+            fields,
+        )
+
+    @typechecked
+    def add_metadatatxts(
+        self,
+        metadatatxts: typing.Iterable[typing.Tuple[str, str]],
+        fields: typing.Union[None, typing.Iterable[str]] = None,
+        quarantine: typing.Union[None, QgsPluginQuarantine] = None,
+    ):
+        "Adds releases from tuples of plugin id and metadata.txt string, parsed inside the shards"
+
+        fields = _projection(fields)
+
+        self._quarantine(
+            self._ingest(
+                metadatatxts,
+                lambda item: item[0],
+                "add_metadatatxts",
+                (fields, quarantine is not None),
+            ),
+            quarantine,
+            fields,
+        )
+
+    @typechecked
+    def remove(self, plugin_id: str, version: str) -> QgsPluginMetadataFrozen:
+        "Removes and returns a release"
+
+        return _decode(
+            self._request(self._shard(plugin_id), "remove", plugin_id, version)
+        )
+
+    @typechecked
+    def get(
+        self, plugin_id: str, version: str
+    ) -> typing.Union[None, QgsPluginMetadataFrozen]:
+        "A release by plugin id and version, `None` if there is none"
+
+        return self.get_many([(plugin_id, version)])[0]
+
+    @typechecked
+    def get_many(
+        self, keys: typing.Iterable[typing.Tuple[str, str]]
+    ) -> typing.List[typing.Union[None, QgsPluginMetadataFrozen]]:
+        "Releases by plugin id and version (`None` where there is none), one request per shard"
+
+        self._check()
+        keys = list(keys)
+        groups = {}  # shard -> positions
+        for position, (plugin_id, _) in enumerate(keys):
+            groups.setdefault(self._shard(plugin_id), []).append(position)
+
+        for shard, positions in groups.items():
+            self._connections[shard].send(
+                ("get", ([keys[position] for position in positions],))
+            )
+
+        found = [None] * len(keys)
+        for (_, positions), records in zip(groups.items(), self._gather(groups.keys())):
+            for position, record in zip(positions, records):
+                found[position] = None if record is None else _decode(record)
+
+        return found
+
+    @typechecked
+    def releases(self, plugin_id: str) -> typing.List[QgsPluginMetadataFrozen]:
+        "All releases of one plugin, ascending by version"
+
+        return [
+            _decode(record)
+            for record in self._request(self._shard(plugin_id), "releases", plugin_id)
+        ]
+
+    @typechecked
+    def latest(
+        self, plugin_id: str, stable: bool = False
+    ) -> typing.Union[None, QgsPluginMetadataFrozen]:
+        "Newest (stable) release of a plugin, `None` if there is none"
+
+        record = self._request(self._shard(plugin_id), "latest", (plugin_id,), stable)[
+            0
+        ]
+
+        return None if record is None else _decode(record)
+
+    @typechecked
+    def ids(self) -> typing.List[str]:
+        "Plugin ids of all releases, sorted"
+
+        return list(heapq.merge(*self._scatter("ids")))
+
+    @typechecked
+    def compatible(
+        self,
+        qgis_version: typing.Union[None, str] = None,
+        latest: bool = False,
+        **criteria: typing.Any,
+    ) -> typing.List[QgsPluginMetadataFrozen]:
+        """
+        Releases compatible with a QGIS version and matching all facet criteria
+        (see `QgsPluginFacets.select`), ordered by plugin id and version string.
+        If `latest` is set, only the newest matching release of every plugin.
+        """
+
+        return [
+            _decode(record)
+            for _, record in heapq.merge(
+                *self._scatter("compatible", qgis_version, latest, criteria)
+            )
+        ]
+
+    @typechecked
+    def count(
+        self, qgis_version: typing.Union[None, str] = None, **criteria: typing.Any
+    ) -> int:
+        "Number of releases matching all criteria, see `QgsPluginFacets.count`"
+
+        return sum(self._scatter("count", qgis_version, criteria))
+
+    @typechecked
+    def counts(
+        self,
+        facet: str,
+        qgis_version: typing.Union[None, str] = None,
+        **criteria: typing.Any,
+    ) -> typing.Dict[typing.Any, int]:
+        "Counts per value of a facet, largest first, see `QgsPluginFacets.counts`"
+
+        counts = {}
+        for shard_counts in self._scatter("counts", facet, qgis_version, criteria):
+            for value, count in shard_counts.items():
+                counts[value] = counts.get(value, 0) + count
+
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], str(item[0]))))
+
+    @typechecked
+    def search(
+        self,
+        query: str,
+        prefix: bool = False,
+        limit: typing.Union[None, int] = None,
+    ) -> typing.List[QgsPluginMetadataFrozen]:
+        "Releases matching all words of `query`, best matches first, see `QgsPluginSearchIndex.search`"
+
+        matches = heapq.merge(*self._scatter("search", query, prefix, limit))
+
+        return [_decode(record) for _, _, record in itertools.islice(matches, limit)]
+
+    @typechecked
+    def stats(self) -> typing.List[int]:
+        "Number of releases per shard"
+
+        return self._scatter("size")
+
+    def close(self):
+        "Stops the worker processes"
+
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        for connection, worker in zip(self._connections, self._workers):
+            worker.join()
+            connection.close()
+
+        self._connections, self._workers = [], []
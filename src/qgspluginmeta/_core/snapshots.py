@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/snapshots.py: Multi-snapshot store deduplicating releases across feeds
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from array import array
+import hashlib
+import json
+import mmap
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .const import SNAPSHOT_DIGEST_SIZE
+from .frozen import QgsPluginMetadataFrozen
+from .metadata import QgsPluginMetadata
+from .repo import _split_xml, export_xml
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginSnapshotStore:
+    """
+    Holds many snapshots (e.g. `plugins.xml` per QGIS version), stores every distinct release once
+
+    Releases are deduplicated by content (see `QgsPluginMetadataFrozen`) and kept as frozen
+    snapshots in slots. Each snapshot is a bitmap of slots (for membership) plus its slots in
+    input order (for export). For XML input, releases are fingerprinted before parsing, so
+    releases already seen in another feed are not parsed again.
+
+    Mutable. Only the API is type-checked, the internals are too hot for it.
+    """
+
+    def __init__(self):
+
+        self._releases = []  # slot -> QgsPluginMetadataFrozen
+        self._slots = {}  # QgsPluginMetadataFrozen -> slot
+        self._fingerprints = {}  # digest of raw XML release dict -> slot
+        self._snapshots = {}  # name -> (bitmap of slots, array of slots in input order)
+
+    def __repr__(self) -> str:
+
+        return f"<QgsPluginSnapshotStore snapshots={len(self._snapshots):d} releases={len(self._releases):d}>"
+
+    def __len__(self) -> int:
+
+        return len(self._snapshots)
+
+    def __contains__(self, name: str) -> bool:
+
+        return name in self._snapshots.keys()
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @staticmethod
+    def _fingerprint(release_dict):
+
+        return hashlib.blake2b(
+            json.dumps(release_dict, sort_keys=True).encode("utf-8"),
+            digest_size=SNAPSHOT_DIGEST_SIZE,
+        ).digest()
+
+    def _slot(self, frozen):
+
+        slot = self._slots.get(frozen, None)
+
+        if slot is None:
+            slot = self._slots[frozen] = len(self._releases)
+            self._releases.append(frozen)
+
+        return slot
+
+    def _snapshot(self, slots):
+        "Bitmap and input order of slots, built at once (`bits |= 1 << slot` would be quadratic)"
+
+        bitmap = bytearray((len(self._releases) + 7) // 8)
+        order = array("L")
+
+        for slot in slots:
+            byte, bit = slot >> 3, 1 << (slot & 7)
+            if bitmap[byte] & bit:  # identical release twice in one input
+                continue
+            bitmap[byte] |= bit
+            order.append(slot)
+
+        return int.from_bytes(bitmap, "little"), order
+
+    def _get(self, name):
+
+        if name not in self._snapshots.keys():
+            raise KeyError(f'"{name:s}" is not a snapshot in this store')
+
+        return self._snapshots[name]
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def add(self, name: str, releases: typing.Iterable[QgsPluginMetadataABC]):
+        "Adds (or replaces) a snapshot from meta data objects"
+
+        self._snapshots[name] = self._snapshot(
+            [self._slot(release.freeze()) for release in releases]
+        )
+
+    @typechecked
+    def add_xml(
+        self,
+        name: str,
+        xml_string: typing.Union[str, bytes, bytearray, memoryview, mmap.mmap],
+    ):
+        "Adds (or replaces) a snapshot from a `plugins.xml` document, only unseen releases are parsed"
+
+        slots = []
+        for release_dict in _split_xml(xml_string):
+            fingerprint = self._fingerprint(release_dict)
+            slot = self._fingerprints.get(fingerprint, None)
+            if slot is None:
+                slot = self._fingerprints[fingerprint] = self._slot(
+                    QgsPluginMetadata.from_xmldict(release_dict).freeze()
+                )
+            slots.append(slot)
+
+        self._snapshots[name] = self._snapshot(slots)
+
+    @typechecked
+    def remove(self, name: str):
+        "Drops a snapshot, its releases stay stored"
+
+        self._get(name)
+        self._snapshots.pop(name)
+
+    @typechecked
+    def names(self) -> typing.List[str]:
+        "Snapshot names in order of addition"
+
+        return list(self._snapshots.keys())
+
+    @typechecked
+    def releases(self, name: str) -> typing.Iterator[QgsPluginMetadataFrozen]:
+        "Releases of a snapshot in input order (without repeated releases), `thaw` them for editing"
+
+        releases = self._releases
+
+        return (releases[slot] for slot in self._get(name)[1])
+
+    @typechecked
+    def as_xml(self, name: str) -> str:
+        "A snapshot as `plugins.xml` document"
+
+        return export_xml([release.thaw() for release in self.releases(name)])
+
+    @typechecked
+    def snapshots_of(
+        self, release: typing.Union[QgsPluginMetadataABC, QgsPluginMetadataFrozen]
+    ) -> typing.List[str]:
+        "Names of all snapshots containing a release (by content)"
+
+        slot = self._slots.get(
+            (
+                release
+                if isinstance(release, QgsPluginMetadataFrozen)
+                else release.freeze()
+            ),
+            None,
+        )
+
+        if slot is None:
+            return []
+
+        return [name for name, (bits, _) in self._snapshots.items() if bits >> slot & 1]
+
+    @typechecked
+    def count(self, name: str) -> int:
+        "Number of releases in a snapshot"
+
+        return len(self._get(name)[1])
+
+    @typechecked
+    def stats(self) -> typing.Dict[str, int]:
+        "Numbers of snapshots, releases across all snapshots and distinct (stored) releases"
+
+        return {
+            "snapshots": len(self._snapshots),
+            "releases": sum(len(order) for _, order in self._snapshots.values()),
+            "distinct": len(self._releases),
+        }
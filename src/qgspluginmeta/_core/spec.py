@@ -28,7 +28,12 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from .lib import bool_to_str, str_to_bool
+from .lib import (
+    bool_to_str,
+    dependencies_to_str,
+    str_to_bool,
+    str_to_dependencies,
+)
 from .version import QgsVersion
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -184,6 +189,13 @@ SPEC = (
         "exporter": lambda x: bool_to_str(x, style="truefalse"),
         "name": "server",
     },
+    {
+        "comment": "comma separated plugin names, optionally pinned like name==version",
+        "dtype": tuple,
+        "importer": str_to_dependencies,
+        "exporter": dependencies_to_str,
+        "name": "plugin_dependencies",
+    },
 )
 
 SPEC_DTYPES = tuple({field["dtype"] for field in SPEC})
@@ -192,3 +204,7 @@ NAME_XML = {
     for field in SPEC
     if field.get('name_xml', None) is not None
 }
+SPEC_BY_NAME = {
+    field['name']: field
+    for field in SPEC
+}
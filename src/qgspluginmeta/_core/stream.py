@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/stream.py: Push parser for plugins.xml arriving in chunks
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import typing
+
+from typeguard import typechecked
+
+from . import profiling
+from .abc import QgsPluginMetadataABC
+from .metadata import _projection, _xml_keys, QgsPluginMetadata
+from .parser import AmpersandFilter, ReleaseDictParser
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class QgsPluginXmlParser:
+    """
+    Push parser for `plugins.xml` documents arriving in chunks, e.g. over a network
+
+    Chunks may end anywhere, also within tags or entities. Every call returns the releases
+    completed so far, as meta data objects (matching `import_xml`) or, if `raw` is set, as
+    release dicts (matching `_split_xml`). If `fields` is given, only those fields (plus `id` and
+    `version`) are parsed and imported.
+
+    Mutable.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        fields: typing.Union[None, typing.Iterable[str]] = None,
+        raw: bool = False,
+    ):
+
+        self._fields = _projection(fields)
+        self._raw = raw
+
+        self._filter = AmpersandFilter()
+        self._parser = ReleaseDictParser(
+            keys=(None if self._fields is None else _xml_keys(self._fields))
+        )
+        self._closed = False
+
+    def __repr__(self) -> str:
+
+        return f'<QgsPluginXmlParser raw={"yes" if self._raw else "no":s} closed={"yes" if self._closed else "no":s}>'
+
+    def _parse(self, chunk: typing.Union[str, bytes]):
+
+        profiler = profiling.PROFILER
+        token = None if profiler is None else profiler.start()
+
+        self._parser.feed(chunk)
+
+        if profiler is not None:
+            profiler.stop("xml_parse", token)
+
+    def _pop_releases(
+        self,
+    ) -> typing.List[typing.Union[typing.Dict, QgsPluginMetadataABC]]:
+
+        if self._raw:
+            return list(self._parser.pop_releases())
+
+        return [
+            QgsPluginMetadata.from_xmldict(release_dict, fields=self._fields)
+            for release_dict in self._parser.pop_releases()
+        ]
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @typechecked
+    def feed(
+        self, chunk: typing.Union[str, bytes, bytearray, memoryview]
+    ) -> typing.List[typing.Union[typing.Dict, QgsPluginMetadataABC]]:
+        "Parse the next chunk of the document, returns releases completed by it"
+
+        if self._closed:
+            raise ValueError("parser is closed")
+
+        profiler = profiling.PROFILER
+        token = None if profiler is None else profiler.start()
+
+        chunk = self._filter.feed(chunk)
+
+        if profiler is not None:
+            profiler.stop("ampersand_rewrite", token)
+
+        self._parse(chunk)
+
+        return self._pop_releases()
+
+    @typechecked
+    def close(self) -> typing.List[typing.Union[typing.Dict, QgsPluginMetadataABC]]:
+        "Signal the end of the document, returns the remaining releases"
+
+        if self._closed:
+            raise ValueError("parser is closed")
+        self._closed = True
+
+        carry = self._filter.close()
+        if len(carry) > 0:
+            self._parse(carry)
+        self._parser.close()
+
+        return self._pop_releases()
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+async def import_xml_async(
+    chunks: typing.AsyncIterable[typing.Union[bytes, bytearray, memoryview]],
+    fields: typing.Union[None, typing.Iterable[str]] = None,
+    raw: bool = False,
+) -> typing.AsyncGenerator[typing.Union[typing.Dict, QgsPluginMetadataABC], None]:
+    """
+    Parses a `plugins.xml` document from an async byte iterator, yields releases as they complete
+
+    E.g. `import_xml_async(response.content.iter_chunked(2 ** 16))` with `aiohttp`.
+    """
+
+    parser = QgsPluginXmlParser(fields=fields, raw=raw)
+
+    async for chunk in chunks:
+        for release in parser.feed(chunk):
+            yield release
+
+    for release in parser.close():
+        yield release
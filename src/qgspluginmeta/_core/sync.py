@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    src/qgspluginmeta/_core/sync.py: Incremental, resumable refresh of plugins.xml and metadata.txt files
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import os
+import typing
+
+from typeguard import typechecked
+
+from .abc import QgsPluginMetadataABC
+from .archive import read_zip_metadatatxt
+from .const import SYNC_STATE_SAVE_INTERVAL, SYNC_STATE_VERSION
+from .harvest import QgsPluginHarvester
+from .lib import write_atomic
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class QgsPluginSync:
+    """
+    Incremental, resumable refresh of `plugins.xml` and `metadata.txt` files on disk
+
+    ETag and Last-Modified of every URL are kept in a state file and sent along as
+    conditional requests, so unchanged feeds are not downloaded again. `metadata.txt` files
+    of releases are only fetched if missing. Files are written atomically and the state is
+    saved regularly, so an interrupted sync resumes cleanly. `stats` reports downloaded
+    bytes and bytes saved versus a full fetch. Keyword arguments are passed on to
+    `QgsPluginHarvester`, must be used as an async context manager.
+
+    Mutable.
+    """
+
+    def __init__(self, state_fn: str, **harvester_kwargs: typing.Any):
+
+        self._state_fn = state_fn
+        self._harvester = QgsPluginHarvester(**harvester_kwargs)
+
+        self._state = self._load_state()
+        self._unsaved = 0
+        self._stats = {
+            "downloaded": 0,
+            "not_modified": 0,
+            "skipped": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+        }
+
+    def __repr__(self) -> str:
+
+        return f'<QgsPluginSync state_fn="{self._state_fn:s}">'
+
+    async def __aenter__(self) -> "QgsPluginSync":
+
+        await self._harvester.__aenter__()
+
+        return self
+
+    async def __aexit__(self, *args: typing.Any):
+
+        self._save_state()
+        await self._harvester.__aexit__(*args)
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # HELPER
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    def _load_state(self) -> typing.Dict[str, typing.Dict]:
+
+        if not os.path.exists(self._state_fn):
+            return {}
+
+        with open(self._state_fn, "r") as f:
+            state = json.load(f)
+
+        if state.get("version", None) != SYNC_STATE_VERSION:
+            return {}
+
+        return state["urls"]
+
+    def _save_state(self):
+
+        write_atomic(
+            self._state_fn,
+            json.dumps({"version": SYNC_STATE_VERSION, "urls": self._state}),
+        )
+        self._unsaved = 0
+
+    def _downloaded(self, url: str, headers: typing.Mapping[str, str], size: int):
+
+        self._state[url] = {"size": size}
+        if "ETag" in headers:  # case-insensitive
+            self._state[url]["etag"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            self._state[url]["last_modified"] = headers["Last-Modified"]
+
+        self._stats["downloaded"] += 1
+        self._stats["bytes_downloaded"] += size
+
+        self._unsaved += 1
+        if self._unsaved >= SYNC_STATE_SAVE_INTERVAL:
+            self._save_state()
+
+    def _saved(self, url: str, stat: str):
+
+        self._stats[stat] += 1
+        self._stats["bytes_saved"] += self._state.get(url, {}).get("size", 0)
+
+    async def _sync_xml(self, url: str, fn: str) -> bool:
+
+        entry = self._state.get(url, {})
+        headers = {}
+
+        if os.path.exists(fn):
+            if "etag" in entry.keys():
+                headers["If-None-Match"] = entry["etag"]
+            if "last_modified" in entry.keys():
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        status, response_headers, data = await self._harvester._request(
+            url, headers=headers
+        )
+
+        if status == 304:
+            self._saved(url, "not_modified")
+            return False
+
+        await self._harvester._blocking(write_atomic, fn, data)
+        self._downloaded(url, response_headers, len(data))
+
+        return True
+
+    async def _sync_metadatatxt(self, release: QgsPluginMetadataABC, fn: str) -> bool:
+
+        url = release["download_url"].value
+
+        _, headers, data = await self._harvester._request(url)
+        _, metadatatxt_string = await self._harvester._blocking(
+            read_zip_metadatatxt, data, release["id"].value
+        )
+
+        await self._harvester._blocking(write_atomic, fn, metadatatxt_string)
+        self._downloaded(url, headers, len(data))
+
+        return True
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # API
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    async def sync_xml(
+        self, feeds: typing.Dict[str, str]
+    ) -> typing.AsyncGenerator[typing.Tuple[str, str, bool], None]:
+        """
+        Refreshes `plugins.xml` files, `feeds` maps QGIS versions to file names
+
+        Yields tuples of QGIS version, file name and whether the file changed.
+        """
+
+        urls = {
+            self._harvester.xml_url(qgis_version): (qgis_version, fn)
+            for qgis_version, fn in feeds.items()
+        }
+
+        async for url, changed in self._harvester._run(
+            (url, self._sync_xml(url, fn)) for url, (_, fn) in urls.items()
+        ):
+            yield urls[url][0], urls[url][1], changed
+
+    async def sync_metadatatxt(
+        self, releases: typing.Dict[str, QgsPluginMetadataABC]
+    ) -> typing.AsyncGenerator[typing.Tuple[QgsPluginMetadataABC, str, bool], None]:
+        """
+        Fetches missing `metadata.txt` files, `releases` maps file names to releases
+
+        Releases require fields `id` and `download_url`. Yields tuples of release, file name
+        and whether the file was fetched (present files come first).
+        """
+
+        todo = {}
+
+        for fn, release in releases.items():
+            url = release["download_url"].value
+            if os.path.exists(fn):
+                self._saved(url, "skipped")
+                yield release, fn, False
+                continue
+            todo[url] = (release, fn)
+
+        async for url, fetched in self._harvester._run(
+            (url, self._sync_metadatatxt(release, fn))
+            for url, (release, fn) in todo.items()
+        ):
+            yield todo[url][0], todo[url][1], fetched
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # PROPERTIES
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+    @property
+    def errors(self) -> typing.Dict[str, Exception]:
+        "Failed downloads by URL"
+        return self._harvester.errors
+
+    @property
+    def stats(self) -> typing.Dict[str, int]:
+        "Counts of downloaded, not modified and skipped files and bytes downloaded and saved"
+        return self._stats.copy()
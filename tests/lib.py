@@ -28,10 +28,47 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import contextlib
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
 import os
+import threading
+import zipfile
 
 from qgspluginmeta import _split_xml
 
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+STANDIN_TXT = """[general]
+name={plugin_id:s}
+qgisMinimumVersion=3.0
+description=Does things
+about=Does things, really
+version={version:s}
+author=Someone
+email=someone@example.org
+repository=https://example.org
+"""
+
+STANDIN_RELEASE = """<pyqgis_plugin name="{plugin_id:s}" version="{version:s}" plugin_id="1">
+<version>{version:s}</version>
+<file_name>{plugin_id:s}.{version:s}.zip</file_name>
+<download_url>{base_url:s}/download/{plugin_id:s}/{version:s}/</download_url>
+<qgis_minimum_version>3.0</qgis_minimum_version>
+</pyqgis_plugin>
+"""
+
+STANDIN_PLUGINS = (
+    ("good_plugin", "1.0"),
+    ("good_plugin", "1.1"),
+    ("flaky_plugin", "0.1"),  # HTTP 503 twice
+    ("missing_plugin", "0.1"),  # HTTP 404
+    ("broken_plugin", "0.1"),  # no metadata.txt
+)
+
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -75,3 +112,95 @@ def get_xml_items():
     for qgis_version, xml in get_xmls():
         for xml_item in _split_xml(xml):
             yield qgis_version, xml_item
+
+
+def make_zip(path, plugin_id, txt, payload_size=0):
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as fz:
+        fz.writestr(f"{plugin_id:s}/__init__.py", "")
+        fz.writestr(f"{plugin_id:s}/payload.bin", os.urandom(payload_size))
+        fz.writestr(f"{plugin_id:s}/metadata.txt", txt)
+        fz.writestr(f"{plugin_id:s}/sub/metadata.txt", "")
+
+    return path
+
+
+@contextlib.contextmanager
+def serve(handle):
+    "Local stand-in HTTP server, `handle(path, headers)` returns status code, body and headers"
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            status, body, headers = handle(self.path, self.headers)
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]:d}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class StandInRepo:
+    "Stand-in for plugins.qgis.org, to be used with `serve`"
+
+    def __init__(self, plugins=STANDIN_PLUGINS):
+        self.base_url = None
+        self.plugins = plugins
+        self.requests = []
+        self.bytes_sent = 0
+
+    def __call__(self, path, headers):
+
+        self.requests.append(path)
+        status, body = self._handle(path)
+
+        etag = f'"{hashlib.sha256(body).hexdigest():s}"'
+        if status == 200 and headers.get("If-None-Match", None) == etag:
+            status, body = 304, b""
+
+        self.bytes_sent += len(body)
+
+        return status, body, {"ETag": etag} if status in (200, 304) else {}
+
+    def _handle(self, path):
+
+        if path.startswith("/plugins/plugins.xml?qgis="):
+            releases = "".join(
+                STANDIN_RELEASE.format(
+                    plugin_id=plugin_id, version=version, base_url=self.base_url
+                )
+                for plugin_id, version in self.plugins
+            )
+            return 200, f"<plugins>\n{releases:s}</plugins>\n".encode("utf-8")
+
+        _, _, plugin_id, version, _ = path.split("/")
+        if plugin_id == "missing_plugin":
+            return 404, b""
+        if plugin_id == "flaky_plugin" and self.requests.count(path) < 3:
+            return 503, b""
+
+        with io.BytesIO() as f:
+            if plugin_id == "broken_plugin":
+                make_zip(f, "other_plugin", "")
+            else:
+                make_zip(
+                    f,
+                    plugin_id,
+                    STANDIN_TXT.format(plugin_id=plugin_id, version=version),
+                )
+            return 200, f.getvalue()
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_cli.py: Command line interface
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import os
+
+from .lib import get_txts, get_xmls
+
+from qgspluginmeta import (
+    export_xml,
+    import_metadatatxts,
+    import_xml,
+    QgsPluginLatestView,
+    QgsPluginQuarantine,
+)
+from qgspluginmeta._core.cli import main
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+DATA_FLD = os.path.join(os.path.dirname(__file__), "data")
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _read_jsonl(fn):
+
+    with open(fn, "r") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture(scope="module")
+def xml_fn(tmp_path_factory):
+    "Small feed, the CLI's own speed is not under test"
+
+    _, xml = sorted(get_xmls())[-1]
+    fn = str(tmp_path_factory.mktemp("cli") / "plugins.xml")
+    with open(fn, "w") as f:
+        f.write(export_xml(import_xml(xml)[:40]))
+
+    return fn
+
+
+@pytest.fixture(scope="module")
+def releases(xml_fn):
+
+    with open(xml_fn, "r") as f:
+        return import_xml(f.read())
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_convert(tmp_path, xml_fn, capsys, releases, jobs):
+
+    jsonl_fn = str(tmp_path / "releases.jsonl")
+    out_fn = str(tmp_path / "releases.xml")
+    txt_fld = str(tmp_path / "txt")
+
+    assert main(["convert", xml_fn, jsonl_fn, "-j", jobs, "--stats"]) == 0
+    assert _read_jsonl(jsonl_fn) == [release.as_dict() for release in releases]
+    assert f"records: {len(releases):d}," in capsys.readouterr().err
+
+    assert main(["convert", jsonl_fn, out_fn, "-j", jobs]) == 0
+    with open(out_fn, "r") as f:
+        assert [release.as_dict() for release in import_xml(f.read())] == [
+            release.as_dict() for release in releases
+        ]
+
+    assert main(["convert", out_fn, txt_fld]) == 0
+    assert main(["convert", txt_fld, "-", "--to", "jsonl"]) == 0
+    assert sorted(
+        (json.loads(line) for line in capsys.readouterr().out.splitlines()),
+        key=lambda row: (row["id"], row["version"]),
+    ) == sorted(
+        (release.as_dict() for release in releases),
+        key=lambda row: (row["id"], row["version"]),
+    )
+
+
+def test_cli_filter(tmp_path, xml_fn, releases):
+
+    jsonl_fn = str(tmp_path / "releases.jsonl")
+    plugin_id = releases[0]["id"].value
+    tag = releases[0]["tags"].value[0].upper()
+
+    assert main(["convert", xml_fn, jsonl_fn, "--id", plugin_id]) == 0
+    assert _read_jsonl(jsonl_fn) == [
+        release.as_dict() for release in releases if release["id"].value == plugin_id
+    ]
+
+    assert (
+        main(["convert", xml_fn, jsonl_fn, "--tag", tag, "--qgis-version", "3.4"]) == 0
+    )
+    assert _read_jsonl(jsonl_fn) == [
+        release.as_dict()
+        for release in releases
+        if tag.lower() in release["tags"].value and release.is_compatible("3.4")
+    ]
+
+    assert main(["convert", xml_fn, jsonl_fn, "--qgis-version", "1.8"]) == 0
+    assert _read_jsonl(jsonl_fn) == []
+
+
+def test_cli_latest(tmp_path, xml_fn, releases):
+
+    jsonl_fn = str(tmp_path / "latest.jsonl")
+
+    assert main(["latest", xml_fn, jsonl_fn, "--stable", "-j", "2"]) == 0
+    assert _read_jsonl(jsonl_fn) == [
+        release.as_dict()
+        for release in QgsPluginLatestView(releases).releases(stable=True)
+    ]
+
+
+def test_cli_invalid(tmp_path, capsys):
+
+    jsonl_fn = str(tmp_path / "releases.jsonl")
+    metadatatxts = [(plugin_id, txt) for plugin_id, _, txt in get_txts()]
+    quarantine = QgsPluginQuarantine()
+    valid = import_metadatatxts(metadatatxts, quarantine=quarantine)
+
+    assert main(["convert", DATA_FLD, jsonl_fn]) == 2
+    assert "can not be converted to bool" in capsys.readouterr().err
+
+    assert main(["convert", DATA_FLD, jsonl_fn, "--skip-invalid", "-j", "2"]) == 0
+    assert len(_read_jsonl(jsonl_fn)) == len(valid)
+    assert f"skipped[QgsBoolValueError]: {len(quarantine):d}" in capsys.readouterr().err
+
+    assert main(["convert", str(tmp_path / "missing.xml"), jsonl_fn]) == 2
+
+    broken_fn = str(tmp_path / "broken.xml")
+    with open(broken_fn, "w") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n<plugins>\n'
+            '<pyqgis_plugin name="Broken" version="1.0"><version>1.0</version>'
+            "</pyqgis_plugin>\n</plugins>\n"
+        )
+    capsys.readouterr()
+    assert main(["convert", broken_fn, jsonl_fn]) == 2
+    assert capsys.readouterr().err == 'qgspluginmeta convert: "@plugin_id" missing\n'
+
+    assert main(["convert", broken_fn, jsonl_fn, "--skip-invalid"]) == 0
+    assert _read_jsonl(jsonl_fn) == []
+    assert "skipped[KeyError]: 1" in capsys.readouterr().err
+
+
+def test_cli_validate(tmp_path, xml_fn, capsys):
+
+    assert main(["validate", DATA_FLD, "--rule", "bool_values", "-j", "2"]) == 1
+    reports = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(reports) > 0
+    assert all(
+        finding["rule"] == "bool_values"
+        for report in reports
+        for finding in report["findings"]
+    )
+
+    assert (
+        main(["validate", xml_fn, "--ignore", "email", "--rule", "required_fields"])
+        == 0
+    )
+    assert capsys.readouterr().out == ""
+
+    assert main(["validate", xml_fn]) == 0  # plugins.xml has no email
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_dependencies.py: Plugin dependencies and their resolution
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from qgspluginmeta import (
+    QgsPluginDependencyCycleError,
+    QgsPluginDependencyError,
+    QgsPluginDependencyResolver,
+    QgsPluginMetadata,
+    QgsPluginRepository,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _release(plugin_id, version, dependencies=None, minimum="3.0", name=None):
+
+    fields = dict(
+        id=plugin_id,
+        version=version,
+        name=plugin_id.upper() if name is None else name,
+        qgisMinimumVersion=minimum,
+    )
+    if dependencies is not None:
+        fields["plugin_dependencies"] = dependencies
+
+    return QgsPluginMetadata(**fields)
+
+
+def _keys(releases):
+
+    return [QgsPluginRepository.key(release) for release in releases]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_dependencies_field():
+
+    release = _release("a", "1.0", " QuickOSM==1.2.0, Meta Search ,")
+    dependencies = release["plugin_dependencies"].value
+
+    assert [name for name, _ in dependencies] == ["QuickOSM", "Meta Search"]
+    assert dependencies[0][1].original == "1.2.0"
+    assert dependencies[1][1] is None
+    assert release.as_dict()["plugin_dependencies"] == "QuickOSM==1.2.0,Meta Search"
+
+    txt_release = QgsPluginMetadata.from_metadatatxt("a", release.as_metadatatxt())
+    assert txt_release.freeze() == release.freeze()
+    assert hash(txt_release.freeze()) == hash(release.freeze())
+
+    for broken in ("==1.0", "QuickOSM==", "QuickOSM==1==2"):
+        with pytest.raises(ValueError):
+            _release("a", "1.0", broken)
+
+
+def test_dependencies_resolve():
+
+    repository = QgsPluginRepository(
+        [
+            _release("a", "1.0", "B,c==1.0"),
+            _release("b", "1.0", "D"),
+            _release("b", "2.0", "C"),
+            _release("c", "1.0"),
+            _release("c", "2.0", minimum="3.20"),
+            _release("d", "1.0"),
+            _release("e", "1.0", "c==2.0"),
+        ]
+    )
+    resolver = repository.attach(QgsPluginDependencyResolver(qgis_version="3.16"))
+
+    assert _keys(resolver.resolve("c")) == [("c", "1.0")]  # 2.0 is not compatible
+    assert _keys(resolver.resolve("A")) == [
+        ("c", "1.0"),
+        ("b", "2.0"),
+        ("a", "1.0"),
+    ]
+    assert _keys(resolver.resolve("b", "1.0")) == [("d", "1.0"), ("b", "1.0")]
+    with pytest.raises(QgsPluginDependencyError):
+        resolver.resolve("e")  # pinned release is not compatible
+    with pytest.raises(QgsPluginDependencyError):
+        resolver.resolve("f")
+
+    repository.add(_release("c", "3.0"))  # drops the memo
+    with pytest.raises(QgsPluginDependencyError):
+        resolver.resolve("a")  # b wants c 3.0, a pins c 1.0
+    repository.remove("c", "3.0")
+    assert _keys(resolver.resolve("a"))[0] == ("c", "1.0")
+
+    solutions = resolver.resolve_all()
+    assert sorted(solutions.keys()) == ["a", "b", "c", "d", "e"]
+    assert isinstance(solutions["e"], QgsPluginDependencyError)
+    assert _keys(solutions["b"]) == [("c", "1.0"), ("b", "2.0")]
+
+
+def test_dependencies_cycle():
+
+    resolver = QgsPluginDependencyResolver(
+        [
+            _release("x", "1.0", "Y"),
+            _release("y", "1.0", "z"),
+            _release("z", "1.0", "x==1.0"),
+            _release("w", "1.0", "X"),
+        ]
+    )
+
+    with pytest.raises(QgsPluginDependencyCycleError):
+        resolver.resolve("w")
+    for plugin_id, solution in resolver.resolve_all().items():
+        assert isinstance(solution, QgsPluginDependencyCycleError), plugin_id
+
+
+def test_dependencies_names():
+
+    resolver = QgsPluginDependencyResolver(
+        [
+            _release("a", "1.0", "Same"),
+            _release("b", "1.0", name="Same"),
+            _release("c", "1.0", "Other"),
+            _release("d", "1.0", name="Other"),
+            _release("e", "1.0", name="Other"),
+            _release("f", "1.0", "g"),
+            _release("g", "1.0-beta"),
+        ],
+        stable=True,
+    )
+
+    assert _keys(resolver.resolve("a")) == [("b", "1.0"), ("a", "1.0")]
+    with pytest.raises(QgsPluginDependencyError):
+        resolver.resolve("c")  # ambiguous name
+    with pytest.raises(QgsPluginDependencyError):
+        resolver.resolve("f")  # no stable release of g
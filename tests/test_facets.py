@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_facets.py: Faceted aggregation and QGIS compatibility
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib import get_xmls
+
+from qgspluginmeta import (
+    import_xml,
+    QgsPluginFacets,
+    QgsPluginMetadata,
+    QgsPluginRepository,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+QGIS_VERSIONS = ("2.18", "3.0", "3.16", "3.28", "3.99", "4.0")
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _release(plugin_id, version, **fields):
+
+    return QgsPluginMetadata(id=plugin_id, version=version, **fields)
+
+
+def _keys(releases):
+
+    return sorted(QgsPluginRepository.key(release) for release in releases)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_compatibility():
+
+    release = _release("a", "1.0", qgisMinimumVersion="3.0")
+
+    assert release.compatibility_range() == ((3, 0, 0), (3, 99, 99))
+    assert [release.is_compatible(version) for version in QGIS_VERSIONS] == [
+        False,
+        True,
+        True,
+        True,
+        False,  # 3.99 is a development version of 4.0
+        False,
+    ]
+
+    release = _release("a", "1.0", qgisMinimumVersion="2.14", qgisMaximumVersion="3.99")
+    assert release.is_compatible("3.28")
+    assert not release.is_compatible("2.8")
+
+    assert _release("a", "1.0").compatibility_range() is None
+    assert not _release("a", "1.0").is_compatible("3.28")
+
+
+def test_facets():
+
+    repository = QgsPluginRepository()
+    facets = repository.attach(QgsPluginFacets())
+
+    repository.add(_release("a", "1.0", tags="Raster, dem", qgisMinimumVersion="3.0"))
+    repository.add(
+        _release("b", "1.0", tags="raster", deprecated="True", qgisMinimumVersion="3.0")
+    )
+    repository.add(
+        _release(
+            "c", "1.0", tags="vector", experimental="True", qgisMinimumVersion="2.0"
+        )
+    )
+
+    assert facets.counts("tags") == {"raster": 2, "dem": 1, "vector": 1}
+    assert facets.counts("deprecated") == {False: 2, True: 1}
+    assert facets.counts("qgisMinimumVersion") == {"3.0": 2, "2.0": 1}
+    assert facets.counts("tags", deprecated=False) == {
+        "dem": 1,
+        "raster": 1,
+        "vector": 1,
+    }
+
+    bits = facets.select(tags="RASTER", deprecated=False, qgis_version="3.28")
+    assert _keys(facets.releases(bits)) == [("a", "1.0")]
+    assert facets.count(tags=("dem", "vector")) == 2
+    assert facets.count(qgis_version="2.18") == 1
+
+    repository.remove("a", "1.0")
+    repository.add(_release("b", "1.0", tags="mesh", qgisMinimumVersion="3.0"))
+
+    assert facets.counts("tags") == {"mesh": 1, "vector": 1}
+    assert facets.counts("deprecated") == {False: 2}
+    assert facets.count(qgis_version="3.28") == 1
+    assert len(facets) == 2
+
+    with pytest.raises(KeyError):
+        facets.select(colour="red")
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_facets_corpus(qgis_version, xml):
+
+    releases = import_xml(xml)
+    facets = QgsPluginFacets(releases)
+
+    tags = {}
+    for release in releases:
+        if not release["tags"].value_set:
+            continue
+        for tag in {tag.strip().casefold() for tag in release["tags"].value} - {""}:
+            tags[tag] = tags.get(tag, 0) + 1
+    assert facets.counts("tags") == dict(
+        sorted(tags.items(), key=lambda item: (-item[1], item[0]))
+    )
+
+    for version in QGIS_VERSIONS:
+        expected = [
+            release
+            for release in releases
+            if release.is_compatible(version)
+            and not release["deprecated"].value
+            and not release["experimental"].value
+        ]
+        bits = facets.select(qgis_version=version, deprecated=False, experimental=False)
+        assert _keys(facets.releases(bits)) == _keys(expected)
+
+    projected = QgsPluginFacets(import_xml(xml, fields=("tags",)))
+    assert projected.counts("tags") == facets.counts("tags")
+    assert projected.select(qgis_version=QGIS_VERSIONS[0]) == 0  # ranges unknown
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_footprint.py: Memory footprint
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib import get_xmls
+
+from qgspluginmeta import get_footprint, import_xml, QgsPluginMetadata
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_footprint_categories():
+
+    plain = QgsPluginMetadata(id="a", version="1.0", tags="raster,dem")
+    dependent = QgsPluginMetadata(
+        id="a",
+        version="1.0",
+        tags="raster,dem",
+        plugin_dependencies="Some Plugin==1.2.3,Other Plugin",
+    )
+
+    footprint, footprint_dependent = get_footprint(plain), get_footprint(dependent)
+
+    assert footprint_dependent["categories"]["tags"] == footprint["categories"]["tags"]
+    assert footprint_dependent["categories"]["other"] > footprint["categories"]["other"]
+    assert footprint_dependent["fields"]["plugin_dependencies"] > 0
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_footprint(qgis_version, xml):
+
+    releases = import_xml(xml)
+    footprint = get_footprint(releases)
+
+    assert footprint["releases"] == len(releases)
+    assert footprint["total"] == sum(footprint["categories"].values())
+    assert (
+        footprint["total"]
+        == sum(footprint["fields"].values()) + footprint["categories"]["containers"]
+    )
+    assert list(footprint["fields"].values()) == sorted(
+        footprint["fields"].values(), reverse=True
+    )
+
+    assert get_footprint(dict(enumerate(releases))) == footprint
+    if len(releases) > 0:
+        assert 0 < get_footprint(releases[0])["total"] < footprint["total"]
+        assert footprint["categories"]["versions"] > 0
+
+    frozen = [release.freeze() for release in releases]
+    footprint_frozen = get_footprint(frozen)
+    assert footprint_frozen["releases"] == len(releases)
+    assert footprint_frozen["categories"]["fields"] == 0
+    assert get_footprint(dict(enumerate(frozen))) == footprint_frozen
+    if len(releases) > 0:
+        assert footprint_frozen["total"] < footprint["total"]
+        assert 0 < get_footprint(frozen[0])["total"] < footprint_frozen["total"]
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_frozen.py: Frozen meta data snapshots
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pickle
+
+from .lib import get_xmls
+
+from qgspluginmeta import import_xml, QgsPluginMetadata, QgsPluginMetadataFrozen
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_frozen():
+
+    meta = QgsPluginMetadata(id="a", version="1.0", tags="raster,dem", unknown="x")
+    frozen = meta.freeze()
+
+    assert isinstance(frozen, QgsPluginMetadataFrozen)
+    assert frozen.id == "a"
+    assert frozen["version"] is meta["version"].value  # shared, not copied
+    assert frozen["tags"] is meta["tags"].value
+    assert frozen["unknown"] == "x"
+    assert frozen["email"] is None
+    assert "email" in frozen and "colour" not in frozen
+    assert list(frozen.keys()) == list(meta.keys())
+    assert frozen.as_dict() == meta.as_dict()
+
+    with pytest.raises(AttributeError):
+        frozen._values = tuple()
+    with pytest.raises(AttributeError):
+        frozen.colour = "red"
+    with pytest.raises(KeyError):
+        frozen["colour"]
+
+    assert frozen == meta.freeze()
+    assert hash(frozen) == hash(meta.freeze())
+    assert frozen._names is meta.freeze()._names
+    assert len({frozen, meta.freeze()}) == 1
+    assert frozen != QgsPluginMetadata(id="a", version="v1.0").freeze()
+    assert frozen != dict(frozen)
+
+    thawed = frozen.thaw()
+    assert isinstance(thawed, QgsPluginMetadata)
+    assert thawed.as_dict() == meta.as_dict()
+    thawed["name"].value = "A"
+    assert frozen["name"] is None
+    assert thawed.freeze() != frozen
+
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_frozen_order():
+
+    a = QgsPluginMetadata(id="x", version="1.0", foo="1", bar="2")
+    b = QgsPluginMetadata(id="x", version="1.0", bar="2", foo="1")
+
+    assert a.as_dict() == b.as_dict()
+    assert a.freeze() == b.freeze()
+    assert hash(a.freeze()) == hash(b.freeze())
+    assert a.freeze()._names is b.freeze()._names
+    assert list(a.freeze().keys())[-2:] == ["bar", "foo"]
+    assert a.freeze().thaw().freeze() == b.freeze()
+
+    c = QgsPluginMetadata(id="x", version="1.0")
+    c.update(QgsPluginMetadata(id="x", version="1.0", foo="1", bar="2"))
+    assert c.freeze() == a.freeze()
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_frozen_corpus(qgis_version, xml):
+
+    releases = import_xml(xml)
+    snapshots = [release.freeze() for release in releases]
+
+    assert [snapshot.as_dict() for snapshot in snapshots] == [
+        release.as_dict() for release in releases
+    ]
+    assert [snapshot.thaw().as_dict() for snapshot in snapshots] == [
+        release.as_dict() for release in releases
+    ]
+    assert [snapshot.thaw().freeze() for snapshot in snapshots] == snapshots
+    assert [pickle.loads(pickle.dumps(release)).as_dict() for release in releases] == [
+        release.as_dict() for release in releases
+    ]
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_harvest.py: Harvest plugins.xml and metadata.txt files from a local stand-in server
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import asyncio
+
+from .lib import StandInRepo, serve
+
+from qgspluginmeta import QgsPluginHarvester, QgsPluginMetadata, import_xml
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+async def _harvest(base_url, qgis_versions):
+
+    xmls, txts = {}, {}
+
+    async with QgsPluginHarvester(
+        repo_url=f"{base_url:s}/plugins/plugins.xml",
+        concurrency=2,
+        limit_per_host=2,
+        backoff=0.01,
+    ) as harvester:
+        async for qgis_version, xml_string in harvester.harvest_xml(qgis_versions):
+            xmls[qgis_version] = xml_string
+        releases = import_xml(
+            xmls[qgis_versions[0]], fields=("version", "download_url")
+        )
+        async for release, txt in harvester.harvest_metadatatxt(releases):
+            txts[(release["id"].value, release["version"].value.original)] = txt
+
+    return xmls, txts, harvester.errors
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_harvest():
+
+    repo = StandInRepo()
+
+    with serve(repo) as base_url:
+        repo.base_url = base_url
+        xmls, txts, errors = asyncio.run(_harvest(base_url, ["3.10", "3.14"]))
+
+    assert set(xmls.keys()) == {"3.10", "3.14"}
+    assert set(txts.keys()) == {
+        ("good_plugin", "1.0"),
+        ("good_plugin", "1.1"),
+        ("flaky_plugin", "0.1"),
+    }
+
+    for (plugin_id, version), txt in txts.items():
+        meta = QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+        assert meta["version"].value.original == version
+
+    assert len(errors) == 2
+    assert isinstance(errors[f"{base_url:s}/download/missing_plugin/0.1/"], Exception)
+    assert isinstance(errors[f"{base_url:s}/download/broken_plugin/0.1/"], KeyError)
+    assert repo.requests.count("/download/flaky_plugin/0.1/") == 3
+    assert repo.requests.count("/download/missing_plugin/0.1/") == 1
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_history.py: Delta-compressed release history
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import random
+
+from .lib import get_xmls
+
+from qgspluginmeta import (
+    import_xml,
+    QgsPluginMetadata,
+    QgsPluginReleaseHistory,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _releases(count):
+
+    releases = []
+    changelog = ""
+
+    for index in range(count):
+        changelog = f"1.{index:d}: fixed issue #{index:d} in the processing provider\n{changelog:s}"
+        fields = dict(
+            id="a",
+            name="A",
+            version=f"1.{index:d}",
+            description="Does things",
+            about="A plugin which does things with layers. " * 4,
+            changelog=changelog,
+            qgisMinimumVersion="3.0" if index < 20 else "3.10",
+            tags="vector,raster" if index % 7 else "vector",
+            experimental="True" if index % 5 == 0 else "False",
+            author="Some Body",
+        )
+        if index >= 10:
+            fields["homepage"] = "https://example.com"
+        releases.append(QgsPluginMetadata(**fields))
+
+    return releases
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.parametrize("keyframe_interval", [1, 4, 16])
+def test_history(keyframe_interval):
+
+    releases = _releases(40)
+    expected = [release.freeze() for release in releases]
+    shuffled = releases.copy()
+    random.Random(0).shuffle(shuffled)
+
+    history = QgsPluginReleaseHistory(shuffled, keyframe_interval=keyframe_interval)
+
+    assert len(history) == 40
+    assert history.id == "a"
+    assert [version.original for version in history.versions] == [
+        f"1.{index:d}" for index in range(40)
+    ]
+    assert list(history) == expected
+    assert [history.release(index) for index in range(40)] == expected
+    assert history.release(-1) == expected[-1]
+    assert history.release(17).thaw().as_dict() == releases[17].as_dict()
+    for start in (0, 3, 16, 39, 40, -5):
+        assert list(history.releases(start)) == expected[start:]
+    with pytest.raises(IndexError):
+        history.release(40)
+
+    loaded = QgsPluginReleaseHistory.from_json(history.as_json())
+    assert loaded.keyframe_interval == keyframe_interval
+    assert list(loaded) == expected
+
+    stats = history.stats()
+    assert stats["releases"] == 40
+    assert stats["keyframes"] == -(-40 // keyframe_interval)
+    if keyframe_interval > 1:
+        assert stats["splices"] > 0
+        assert stats["ratio"] > 2
+
+
+def test_history_add():
+
+    releases = _releases(10)
+    expected = [release.freeze() for release in releases]
+
+    history = QgsPluginReleaseHistory(keyframe_interval=4)
+    assert history.id is None
+    assert list(history) == []
+    for release in releases[5:] + releases[:5]:  # appends, then rebuilds
+        history.add(release)
+    assert list(history) == expected
+
+    with pytest.raises(ValueError):
+        history.add(releases[3])
+    with pytest.raises(ValueError):
+        history.add(QgsPluginMetadata(id="b", version="0.1"))
+    assert list(history) == expected
+
+
+def test_history_corpus():
+
+    for _, xml in get_xmls():
+        histories = {}
+        for release in import_xml(xml):
+            histories.setdefault(release["id"].value, QgsPluginReleaseHistory()).add(
+                release
+            )
+        for history in histories.values():
+            assert list(QgsPluginReleaseHistory.from_json(history.as_json())) == list(
+                history
+            )
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_latest.py: Latest release per plugin
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import random
+
+from .lib import get_xmls
+
+from qgspluginmeta import (
+    import_xml,
+    QgsPluginLatestView,
+    QgsPluginMetadata,
+    QgsPluginRepository,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+VERSIONS = (
+    "0.1",
+    "0.9",
+    "0.10",
+    "1.0-beta",
+    "1.0rc1",
+    "1.0",
+    "1.0.1",
+    "1.1",
+    "2.0-alpha",
+    "2.0",
+)  # ascending
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _release(plugin_id, version, qgis_minimum_version="3.0"):
+
+    return QgsPluginMetadata(
+        id=plugin_id, version=version, qgisMinimumVersion=qgis_minimum_version
+    )
+
+
+def _expected(releases, plugin_id, stable=False, qgis_version=None):
+
+    candidates = [
+        release
+        for release in releases
+        if release["id"].value == plugin_id
+        and (not stable or release["version"].value.stable)
+        and (qgis_version is None or release.is_compatible(qgis_version))
+    ]
+
+    if len(candidates) == 0:
+        return None
+
+    return max(candidates, key=lambda release: release["version"].value)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_latest():
+
+    repository = QgsPluginRepository()
+    view = repository.attach(QgsPluginLatestView())
+    compatible = repository.attach(QgsPluginLatestView(qgis_version="2.18"))
+
+    rng = random.Random(0)
+    releases = [
+        _release(plugin_id, version, rng.choice(("2.0", "3.0")))
+        for plugin_id in ("a", "b", "c")
+        for version in VERSIONS
+    ]
+    rng.shuffle(releases)
+
+    for step, release in enumerate(releases * 2):
+        if step < len(releases):
+            repository.add(release)
+        else:
+            repository.remove(*QgsPluginRepository.key(release))
+        current = list(repository)
+        for plugin_id in ("a", "b", "c"):
+            assert view.latest(plugin_id) is _expected(current, plugin_id)
+            assert view.latest(plugin_id, stable=True) is _expected(
+                current, plugin_id, stable=True
+            )
+            assert compatible.latest(plugin_id) is _expected(
+                current, plugin_id, qgis_version="2.18"
+            )
+
+    assert len(view) == 0
+    assert view.releases() == []
+
+
+def test_latest_replace():
+
+    view = QgsPluginLatestView([_release("a", "1.0"), _release("a", "2.0-beta")])
+
+    assert view.latest("a")["version"].value.original == "2.0-beta"
+    assert view.latest("a", stable=True)["version"].value.original == "1.0"
+    assert view.latest("b") is None
+
+    new = _release("a", "1.0")
+    view.add(new)
+    assert view.latest("a", stable=True) is new
+    assert view.releases(stable=True) == [new]
+
+    view.remove(new)
+    assert view.latest("a", stable=True) is None
+    assert len(view) == 1
+
+
+def test_latest_ties():
+
+    releases = [_release("a", "1.0"), _release("a", "v1.0"), _release("a", "0.9")]
+    assert not releases[0]["version"].value < releases[1]["version"].value
+    assert not releases[1]["version"].value < releases[0]["version"].value
+
+    for order in (releases, releases[::-1], releases[1:] + releases[:1]):
+        view = QgsPluginLatestView(order)
+        assert view.latest("a") is releases[1]  # "v1.0" > "1.0" as strings
+        view.remove(releases[1])
+        assert view.latest("a") is releases[0]
+        view.remove(releases[0])
+        assert view.latest("a") is releases[2]
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_latest_corpus(qgis_version, xml):
+
+    releases = import_xml(xml)
+    view = QgsPluginLatestView(releases)
+
+    for plugin_id in {release["id"].value for release in releases}:
+        expected = _expected(releases, plugin_id)
+        assert view.latest(plugin_id)["version"].value == expected["version"].value
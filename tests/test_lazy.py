@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_lazy.py: Lazy loading of the package's exports
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import subprocess
+import sys
+
+import qgspluginmeta
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _loaded(statement, modules):
+    "Which of `modules` a fresh interpreter has loaded after `statement`"
+
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement:s}; import sys, json; print(json.dumps([name for name in {list(modules)!r} if name in sys.modules]))",
+        ],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    return set(json.loads(proc.stdout))
+
+
+@pytest.mark.parametrize(
+    "statement,loaded,not_loaded",
+    [
+        (
+            "import qgspluginmeta",
+            set(),
+            {"typeguard", "xmltodict", "configparser", "aiohttp", "zipfile"},
+        ),
+        (
+            "from qgspluginmeta import QgsVersion",
+            {"typeguard"},
+            {"xmltodict", "configparser", "aiohttp", "qgspluginmeta._core.metadata"},
+        ),
+        (
+            "from qgspluginmeta import import_xml",
+            {"qgspluginmeta._core.metadata"},
+            {"xmltodict", "configparser", "aiohttp", "qgspluginmeta._core.lint"},
+        ),
+        (
+            "from qgspluginmeta._core.cli import main",
+            {"qgspluginmeta._core.metadata"},
+            {
+                "xmltodict",
+                "concurrent.futures.process",
+                "qgspluginmeta._core.lint",
+                "qgspluginmeta._core.latest",
+                "qgspluginmeta._core.stream",
+            },
+        ),
+    ],
+)
+def test_lazy_imports(statement, loaded, not_loaded):
+
+    assert _loaded(statement, loaded | not_loaded) == loaded
+
+
+def test_lazy_exports():
+
+    assert set(qgspluginmeta.__all__) <= set(dir(qgspluginmeta))
+    for name in qgspluginmeta.__all__:
+        assert getattr(qgspluginmeta, name) is not None
+    assert qgspluginmeta._split_xml is qgspluginmeta._core.repo._split_xml
+
+    with pytest.raises(AttributeError):
+        qgspluginmeta.QgsPluginMetadataTypo
+
+    for name in ("importlib", "sys", "_EXPORTS", "_name"):
+        assert name not in dir(qgspluginmeta)
+    assert not hasattr(qgspluginmeta, "importlib") and not hasattr(qgspluginmeta, "sys")
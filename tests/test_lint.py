@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_lint.py: Parallel lint engine
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib import get_txts, get_xmls
+
+from qgspluginmeta import (
+    _split_xml,
+    import_xml,
+    QgsBoolValueError,
+    QgsPluginLinter,
+    QgsPluginMetadata,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+RELEASE = {
+    "@name": "A",
+    "@plugin_id": "1",
+    "@version": "1.0",
+    "version": "1.0",
+    "description": "d",
+    "about": "a",
+    "author_name": "x",
+    "repository": "https://a.org",
+    "file_name": "a.1.0.zip",
+    "qgis_minimum_version": "3.0",
+    "qgis_maximum_version": "3.99",
+    "experimental": "False",
+    "create_date": "2020-01-01",
+}
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _findings(reports):
+
+    findings = {}
+    for report in reports:
+        for finding in report["findings"]:
+            findings.setdefault(report["index"], set()).add(
+                (finding["rule"], finding["field"])
+            )
+
+    return findings
+
+
+def test_lint_rules():
+
+    records = [
+        RELEASE,
+        dict(RELEASE, experimental="maybe", about=""),
+        dict(RELEASE, qgis_maximum_version="2.18"),
+        dict(
+            RELEASE, **{"@version": "0.9", "version": "0.9", "file_name": "a.0.9.zip"}
+        ),
+        dict(RELEASE, **{"@version": "1.1"}),
+        ("b", "[general]\nname=B\nversion=1.0\nqgisMinimumVersion=x.y\n"),
+        ("c", "no section"),
+        QgsPluginMetadata(id="d", version="1.0", name="D"),
+    ]
+
+    linter = QgsPluginLinter(workers=2, chunk_size=3, ignored_fields=("email",))
+    reports = list(linter.lint(records))
+    findings = _findings(reports)
+
+    assert sorted(report["index"] for report in reports[: len(records)]) == list(
+        range(len(records))
+    )
+    assert 0 not in findings
+    assert findings[1] == {
+        ("bool_values", "experimental"),
+        ("required_fields", "about"),
+    }
+    assert findings[2] == {("qgis_version_range", "qgisMaximumVersion")}
+    assert findings[3] == {("version_history", "version")}  # created with 1.0
+    assert findings[4] == {("structure", "version")}
+    assert ("version_values", "qgisMinimumVersion") in findings[5]
+    assert ("required_fields", "qgisMinimumVersion") in findings[5]
+    assert findings[6] == {("structure", None)}
+    assert ("required_fields", "author") in findings[7]
+    assert linter.counts["version_history"] == 1
+    assert sum(linter.counts.values()) == sum(len(f) for f in findings.values())
+
+    reports = list(QgsPluginLinter(rules=("bool_values",), workers=1).lint(records))
+    assert set().union(*_findings(reports).values()) == {
+        ("bool_values", "experimental")
+    }
+
+    with pytest.raises(ValueError):
+        QgsPluginLinter(rules=("spelling",))
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_lint_corpus(qgis_version, xml):
+
+    releases = import_xml(xml)
+    reports = list(
+        QgsPluginLinter(workers=2, rules=("structure", "bool_values")).lint(
+            _split_xml(xml)
+        )
+    )
+
+    assert len(reports) == len(releases)
+    assert all(len(report["findings"]) == 0 for report in reports)
+    assert [report["id"] for report in sorted(reports, key=lambda r: r["index"])] == [
+        release["id"].value for release in releases
+    ]
+
+
+def test_lint_txts():
+
+    records = [(plugin_id, txt) for plugin_id, _, txt in get_txts()]
+    broken = set()
+    for index, (plugin_id, txt) in enumerate(records):
+        try:
+            QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+        except QgsBoolValueError:
+            broken.add(index)
+
+    findings = _findings(
+        QgsPluginLinter(workers=2, rules=("bool_values",)).lint(records)
+    )
+
+    assert len(broken) > 0
+    assert set(findings.keys()) == broken
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_merge.py: Merging plugins.xml and metadata.txt records
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib import get_xmls
+
+from qgspluginmeta import (
+    import_xml,
+    merge,
+    QgsPluginMetadata,
+    QgsPluginRepository,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _records():
+
+    xml_records = [
+        QgsPluginMetadata(id="a", version="1.0", name="A", homepage="https://a.org"),
+        QgsPluginMetadata(id="b", version="2.0", name="B"),
+    ]
+    txt_records = [
+        QgsPluginMetadata(id="a", version="1.0", name="A!", email="a@a.org"),
+        QgsPluginMetadata(id="c", version="0.1", name="C"),
+    ]
+
+    return xml_records, txt_records
+
+
+@pytest.mark.parametrize("policy,name", [("xml", "A"), ("txt", "A!"), ("report", None)])
+def test_merge_policies(policy, name):
+
+    xml_records, txt_records = _records()
+
+    merged = list(merge(xml_records, txt_records, policy=policy))
+
+    assert [record["id"].value for record, _ in merged] == ["a", "b"]
+    (a, conflicts), (b, no_conflicts) = merged
+    assert conflicts == {"name": ("A", "A!")}
+    assert no_conflicts == {}
+    assert a["name"].value == name
+    assert a["homepage"].value == "https://a.org"
+    assert a["email"].value == "a@a.org"
+    assert a["version"].value is xml_records[0]["version"].value  # shared, not copied
+    assert a["email"].value is txt_records[0]["email"].value
+    assert a is not xml_records[0] and b is not xml_records[1]
+    assert b.as_dict() == xml_records[1].as_dict()
+    assert xml_records[0]["email"].value is None  # inputs untouched
+
+
+def test_merge_report_unknown():
+
+    xml_records = [QgsPluginMetadata(id="a", version="1.0", foo="b", bar="x")]
+    txt_records = [QgsPluginMetadata(id="a", version="1.0", foo="c", bar="x")]
+
+    ((merged, conflicts),) = merge(xml_records, txt_records, policy="report")
+
+    assert conflicts == {"foo": ("b", "c")}
+    assert "foo" not in merged.keys() and "foo" not in merged.as_dict()
+    assert merged["bar"].value == "x"
+
+    ((merged, _),) = merge(xml_records, txt_records, policy="txt")
+    merged["foo"].value = "d"
+    assert merged.as_dict()["foo"] == "d"
+
+
+def test_merge_sources():
+
+    xml_records, txt_records = _records()
+
+    hashed = list(merge(xml_records, txt_records, outer=True))
+    indexed = list(merge(xml_records, QgsPluginRepository(txt_records), outer=True))
+    streamed = list(merge(xml_records, txt_records, sorted_input=True, outer=True))
+
+    assert [record["id"].value for record, _ in hashed] == ["a", "b", "c"]
+    for other in (indexed, streamed):
+        assert [(record.as_dict(), conflicts) for record, conflicts in other] == [
+            (record.as_dict(), conflicts) for record, conflicts in hashed
+        ]
+
+    with pytest.raises(ValueError):
+        list(merge(xml_records[::-1], txt_records, sorted_input=True))
+    with pytest.raises(ValueError):
+        merge(xml_records, txt_records, policy="newest")
+    with pytest.raises(ValueError):
+        merge(xml_records, [QgsPluginMetadata(id="d")])
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_merge_corpus(qgis_version, xml):
+
+    releases = import_xml(xml)
+    txt_records = [release.freeze().thaw() for release in releases]
+    for record in txt_records[::2]:
+        record["about"].value = "changed"
+
+    merged = list(merge(releases, txt_records))
+
+    assert [record.as_dict() for record, _ in merged] == [
+        release.as_dict() for release in releases
+    ]
+    assert sum(1 for _, conflicts in merged if conflicts) == sum(
+        1 for release in releases[::2] if release["about"].value != "changed"
+    )
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_profiling.py: Profiling hooks
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import tracemalloc
+
+from .lib import STANDIN_RELEASE, STANDIN_TXT
+
+from qgspluginmeta import import_xml, QgsPluginMetadata, QgsPluginProfiler
+
+import pytest
+import typeguard
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+XML = "<plugins>{releases:s}</plugins>".format(
+    releases="".join(
+        STANDIN_RELEASE.format(
+            plugin_id=f"plugin{index:d}", version="1.0", base_url="http://localhost"
+        )
+        for index in range(3)
+    )
+)
+
+FIELDS = ("version", "qgisMinimumVersion")  # stand-in releases are minimal
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_profiling_stages():
+
+    hooks = {name: getattr(typeguard, name) for name in ("check_argument_types",)}
+
+    with QgsPluginProfiler() as profiler:
+        releases = import_xml(XML, fields=FIELDS)
+        QgsPluginMetadata.from_metadatatxt("plugin0", STANDIN_TXT)
+
+    assert {name: getattr(typeguard, name) for name in hooks.keys()} == hooks
+
+    stages = profiler.as_dict()
+
+    assert stages["ampersand_rewrite"]["count"] == 1
+    assert stages["xml_parse"]["count"] >= 1
+    assert stages["key_rename"]["count"] == len(releases)
+    assert stages["field_import:version"]["count"] == len(releases) + 1
+    assert stages["metadatatxt_parse"]["count"] == 1
+    assert stages["typeguard"]["count"] > 0
+    assert all(stage["time"] >= 0.0 for stage in stages.values())
+    assert all("allocated" not in stage for stage in stages.values())
+    assert json.loads(profiler.as_json()) == stages
+
+    import_xml(XML, fields=FIELDS)  # disabled, nothing recorded
+    assert profiler.as_dict() == stages
+
+
+def test_profiling_allocations():
+
+    assert not tracemalloc.is_tracing()
+
+    with QgsPluginProfiler(trace_allocations=True, trace_typeguard=False) as profiler:
+        assert tracemalloc.is_tracing()
+        import_xml(XML, fields=FIELDS)
+
+    assert not tracemalloc.is_tracing()
+
+    stages = profiler.as_dict()
+
+    assert "typeguard" not in stages.keys()
+    assert all(isinstance(stage["allocated"], int) for stage in stages.values())
+
+
+def test_profiling_nested():
+
+    with QgsPluginProfiler():
+        with pytest.raises(RuntimeError):
+            with QgsPluginProfiler():
+                pass
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_quarantine.py: Error-tolerant bulk import
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import os
+
+from .lib import get_txts, get_xmls, make_zip
+
+from qgspluginmeta import (
+    import_metadatatxts,
+    import_xml,
+    QgsBoolValueError,
+    QgsPluginQuarantine,
+    QgsPluginZipScanner,
+)
+
+import pytest
+import xmltodict
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+RELEASE = {
+    "@name": "A",
+    "@plugin_id": "1",
+    "@version": "1.0",
+    "version": "1.0",
+    "description": "d",
+    "about": "a",
+    "author_name": "x",
+    "repository": "https://a.org",
+    "file_name": "a.1.0.zip",
+    "qgis_minimum_version": "3.0",
+    "qgis_maximum_version": "3.99",
+    "experimental": "False",
+}
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_quarantine_xml():
+
+    xml = xmltodict.unparse(
+        {
+            "plugins": {
+                "pyqgis_plugin": [
+                    RELEASE,
+                    dict(RELEASE, experimental="maybe"),
+                    dict(RELEASE, **{"@version": "1.1"}),
+                    dict(RELEASE, qgis_minimum_version="three"),
+                    dict(RELEASE, experimental="perhaps"),
+                    dict(
+                        RELEASE,
+                        **{
+                            "@version": "1.2",
+                            "version": "1.2",
+                            "file_name": "a.1.2.zip",
+                        },
+                    ),
+                ]
+            }
+        }
+    )
+
+    with pytest.raises(QgsBoolValueError):
+        import_xml(xml)
+
+    quarantine = QgsPluginQuarantine()
+    releases = import_xml(xml, quarantine=quarantine)
+
+    assert len(releases) == 2
+    assert len(quarantine) == 4
+    assert [record["field"] for record in quarantine] == [
+        "experimental",
+        "version",
+        "qgisMinimumVersion",
+        "experimental",
+    ]
+    assert quarantine.records[0]["raw"]["experimental"] == "maybe"
+    assert quarantine.summary() == {
+        "QgsBoolValueError": 2,
+        "QgsVersionValueError": 1,
+        "ValueError": 1,
+    }
+
+    quarantine.clear()
+    releases = import_xml(xml, fields=("name",), quarantine=quarantine)
+    assert len(releases) == 5
+    assert [record["field"] for record in quarantine] == ["version"]
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_quarantine_xml_corpus(qgis_version, xml):
+
+    quarantine = QgsPluginQuarantine()
+
+    assert [
+        release.as_dict() for release in import_xml(xml, quarantine=quarantine)
+    ] == [release.as_dict() for release in import_xml(xml)]
+    assert len(quarantine) == 0
+
+
+def test_quarantine_txt():
+
+    metadatatxts = [(plugin_id, txt) for plugin_id, _, txt in get_txts()]
+    quarantine = QgsPluginQuarantine()
+
+    with pytest.raises(QgsBoolValueError):
+        import_metadatatxts(metadatatxts)
+
+    releases = import_metadatatxts(metadatatxts, quarantine=quarantine)
+
+    assert len(releases) + len(quarantine) == len(metadatatxts)
+    assert len(quarantine) > 0
+    assert quarantine.summary() == {"QgsBoolValueError": len(quarantine)}
+    assert all(record["field"] is not None for record in quarantine)
+    assert all(record["raw"] in metadatatxts for record in quarantine)
+
+
+def test_quarantine_zip(tmp_path):
+
+    mirror = str(tmp_path)
+    broken = set()
+    for index, (plugin_id, _, txt) in enumerate(get_txts()):
+        zip_fn = make_zip(
+            os.path.join(mirror, f"{plugin_id:s}.{index:d}.zip"), plugin_id, txt
+        )
+        try:
+            import_metadatatxts([(plugin_id, txt)])
+        except QgsBoolValueError:
+            broken.add(zip_fn)
+
+    quarantine = QgsPluginQuarantine()
+    scanner = QgsPluginZipScanner(mirror, workers=2, quarantine=quarantine)
+    list(scanner.scan())
+
+    assert {record["raw"] for record in quarantine} == broken
+    assert all(record["field"] is not None for record in quarantine)
+    assert quarantine.summary() == {"QgsBoolValueError": len(broken)}
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_rcu.py: Read-copy-update repository
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import gc
+import threading
+import weakref
+
+from .lib import get_xmls
+
+from qgspluginmeta import (
+    export_xml,
+    import_xml,
+    QgsPluginLatestView,
+    QgsPluginMetadata,
+    QgsPluginRepository,
+    QgsPluginSharedRepository,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _keys(releases):
+
+    return sorted(QgsPluginRepository.key(release) for release in releases)
+
+
+def _feeds():
+
+    return [xml for _, xml in sorted(get_xmls(), key=lambda item: len(item[1]))[-2:]]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_rcu_xml():
+
+    small, large = _feeds()
+    shared = QgsPluginSharedRepository()
+    assert shared.generation == 0
+    assert len(shared.snapshot()) == 0
+
+    for xml in (small, large, small):
+        stats = shared.update_xml(xml)
+        releases = import_xml(xml)
+        repository = QgsPluginRepository(releases)
+        latest = repository.attach(QgsPluginLatestView())
+        snapshot = shared.snapshot()
+        assert len(snapshot) == len(releases)
+        assert _keys(snapshot) == _keys(releases)
+        assert sorted(snapshot.ids()) == sorted(repository.ids())
+        for plugin_id in repository.ids():
+            assert _keys(snapshot.releases(plugin_id)) == _keys(
+                repository.releases(plugin_id)
+            )
+            for stable in (False, True):
+                expected = latest.latest(plugin_id, stable)
+                found = snapshot.latest(plugin_id, stable)
+                assert (found is None) == (expected is None)
+                if found is not None:
+                    assert found.freeze() == expected.freeze()
+    assert stats["removed"] > 0
+    assert shared.generation == 3
+
+    snapshot = shared.snapshot()
+    assert shared.update_xml(small) == {"added": 0, "changed": 0, "removed": 0}
+    assert shared.snapshot() is snapshot  # nothing published
+    key = next(iter(snapshot._releases.keys()))
+    assert snapshot.get(*key) is snapshot[key]
+    assert snapshot.get("missing", "1.0") is None
+    assert snapshot.latest("missing") is None
+
+
+def test_rcu_reuse():
+
+    releases = import_xml(_feeds()[0])
+    shared = QgsPluginSharedRepository(releases)
+    first = shared.snapshot()
+    assert first.generation == 0
+
+    changed = releases[0].freeze().thaw()
+    changed["description"].value = "changed"
+    copies = [release.freeze().thaw() for release in releases[1:]]  # equal content
+    stats = shared.update([changed] + copies)
+    second = shared.snapshot()
+
+    assert stats == {"added": 0, "changed": 1, "removed": 0}
+    assert second.generation == 1
+    key = QgsPluginRepository.key(changed)
+    assert second[key] is changed
+    assert first[key] is releases[0]
+    assert all(
+        second[k] is first[k] for k in first._releases.keys() if k != key
+    )  # unchanged objects reused
+    plugin_id = releases[1]["id"].value
+    if plugin_id != key[0]:
+        assert second._ids[plugin_id] is first._ids[plugin_id]
+
+    stats = shared.apply(add=[QgsPluginMetadata(id="new", version="1.0")], remove=[key])
+    assert stats == {"added": 1, "changed": 0, "removed": 1}
+    assert key not in shared.snapshot()
+    assert shared.snapshot().latest("new")["version"].value.original == "1.0"
+    with pytest.raises(KeyError):
+        shared.apply(remove=[key])
+    assert shared.generation == 2
+
+
+def test_rcu_duplicates():
+
+    release = import_xml(_feeds()[0])[0]
+    duplicate = release.freeze().thaw()  # same id and version, other content
+    duplicate["description"].value = "changed"
+    key = QgsPluginRepository.key(release)
+
+    for first, second in ((release, duplicate), (duplicate, release)):
+        shared = QgsPluginSharedRepository()
+        shared.update_xml(export_xml([first, second]))
+        for expected in (first, second):
+            shared.update_xml(export_xml([expected]))
+            assert shared.snapshot()[key].freeze() == expected.freeze()
+
+
+def test_rcu_reclaim():
+
+    shared = QgsPluginSharedRepository(import_xml(_feeds()[0]))
+    held = shared.snapshot()
+    reference = weakref.ref(held)
+
+    shared.update_xml(_feeds()[1])
+    gc.collect()
+    assert shared.alive == 2  # a reader still holds the old snapshot
+    assert len(held) < len(shared.snapshot())
+
+    del held
+    gc.collect()
+    assert reference() is None
+    assert shared.alive == 1
+
+
+def test_rcu_threads():
+
+    versions = (
+        [QgsPluginMetadata(id=f"p{index:d}", version="1.0") for index in range(30)],
+        [
+            QgsPluginMetadata(id=f"p{index:d}", version=version)
+            for index in range(20)
+            for version in ("1.0", "2.0")
+        ],
+    )
+    counts = {len(releases) for releases in versions}
+    shared = QgsPluginSharedRepository(versions[0])
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = shared.snapshot()
+            if len(snapshot) not in counts:
+                errors.append(len(snapshot))
+            for plugin_id in snapshot.ids()[:5]:
+                if snapshot.latest(plugin_id) not in snapshot.releases(plugin_id):
+                    errors.append(plugin_id)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for generation in range(1, 9):
+        shared.update(versions[generation % 2])
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
+    assert shared.generation == 8
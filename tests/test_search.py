@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_search.py: Repository and full-text search index
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib import get_xmls
+
+from qgspluginmeta import (
+    import_xml,
+    QgsPluginMetadata,
+    QgsPluginRepository,
+    QgsPluginSearchIndex,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _release(plugin_id, version, name, tags="", description="", about=""):
+
+    return QgsPluginMetadata(
+        id=plugin_id,
+        version=version,
+        name=name,
+        tags=tags,
+        description=description,
+        about=about,
+    )
+
+
+def _ids(releases):
+
+    return [QgsPluginRepository.key(release) for release in releases]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_repository():
+
+    a1 = _release("a", "1.0", "A")
+    a2 = _release("a", "2.0", "A")
+    b1 = _release("b", "1.0", "B")
+    repository = QgsPluginRepository([a1, a2, b1])
+
+    assert len(repository) == 3
+    assert ("a", "2.0") in repository
+    assert repository["b", "1.0"] is b1
+    assert sorted(repository.ids()) == ["a", "b"]
+    assert repository.releases("a") == [a1, a2]
+
+    a2_new = _release("a", "2.0", "A new")
+    repository.add(a2_new)
+    assert len(repository) == 3
+    assert repository["a", "2.0"] is a2_new
+
+    assert repository.remove("b", "1.0") is b1
+    assert repository.ids() == ["a"]
+    with pytest.raises(KeyError):
+        repository.remove("b", "1.0")
+
+
+def test_search_ranking():
+
+    index = QgsPluginSearchIndex(
+        [
+            _release("about", "1.0", "Other", about="Raster things"),
+            _release("name", "1.0", "Raster Tools"),
+            _release("description", "1.0", "Other", description="For RASTER data"),
+            _release("tags", "1.0", "Other", tags="raster,dem"),
+        ]
+    )
+
+    assert _ids(index.search("raster")) == [
+        ("name", "1.0"),
+        ("tags", "1.0"),
+        ("description", "1.0"),
+        ("about", "1.0"),
+    ]
+    assert _ids(index.search("Raster tools")) == [("name", "1.0")]
+    assert _ids(index.search("rast")) == []
+    assert len(index.search("rast", prefix=True)) == 4
+    assert _ids(index.search("ras to", prefix=True)) == [("name", "1.0")]
+    assert _ids(index.search("raster", limit=1)) == [("name", "1.0")]
+    assert index.search("") == []
+
+
+def test_search_incremental():
+
+    repository = QgsPluginRepository()
+    index = repository.attach(QgsPluginSearchIndex())
+    latest = repository.attach(QgsPluginSearchIndex(latest_only=True))
+
+    repository.add(_release("a", "1.0", "Vector"))
+    repository.add(_release("a", "1.10", "Vector Raster"))
+    repository.add(_release("a", "1.9", "Vector Mesh"))
+
+    assert _ids(index.search("vector")) == [("a", "1.0"), ("a", "1.10"), ("a", "1.9")]
+    assert _ids(latest.search("vector")) == [("a", "1.10")]
+    assert latest.search("mesh") == []
+
+    repository.remove("a", "1.10")
+
+    assert index.search("raster") == []
+    assert _ids(latest.search("vector")) == [("a", "1.9")]
+    assert _ids(latest.search("mesh")) == [("a", "1.9")]
+
+    repository.add(_release("a", "1.9", "Vector Point"))
+
+    assert index.search("mesh") == []
+    assert _ids(latest.search("point")) == [("a", "1.9")]
+
+    repository.remove("a", "1.9")
+    repository.remove("a", "1.0")
+    repository.detach(latest)
+
+    assert len(index) == 0
+    assert len(latest) == 0
+    assert index.search("vector", prefix=True) == []
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_search_corpus(qgis_version, xml):
+
+    releases = import_xml(xml)
+    index = QgsPluginSearchIndex(releases)
+
+    for release in releases[:20]:
+        for token in index.tokenize(release["name"].value):
+            expected = {
+                QgsPluginRepository.key(other)
+                for other in releases
+                if any(
+                    token
+                    in index.tokenize(
+                        " ".join(value) if isinstance(value, tuple) else value
+                    )
+                    for value in (
+                        other[name].value
+                        for name in ("name", "tags", "description", "about")
+                        if other[name].value_set
+                    )
+                )
+            }
+            assert set(_ids(index.search(token))) == expected
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_shards.py: Repository sharded across worker processes
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib import get_txts, get_xmls
+
+from qgspluginmeta import (
+    import_metadatatxts,
+    import_xml,
+    QgsBoolValueError,
+    QgsPluginFacets,
+    QgsPluginLatestView,
+    QgsPluginQuarantine,
+    QgsPluginRepository,
+    QgsPluginSearchIndex,
+    QgsPluginShardedRepository,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _keys(releases):
+
+    return [(release["id"], release["version"].original) for release in releases]
+
+
+def _ref_keys(releases):
+
+    return [QgsPluginRepository.key(release) for release in releases]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_shards_xml():
+
+    _, xml = sorted(get_xmls(), key=lambda item: len(item[1]))[-1]
+    releases = import_xml(xml)
+    repository = QgsPluginRepository(releases)
+    index = repository.attach(QgsPluginSearchIndex())
+    latest = repository.attach(QgsPluginLatestView())
+    facets = repository.attach(QgsPluginFacets())
+
+    with QgsPluginShardedRepository(3, batch_size=16) as sharded:
+        sharded.add_xml(xml)
+
+        assert len(sharded) == len(releases)
+        assert sum(sharded.stats()) == len(releases)
+        assert min(sharded.stats()) > 0
+        assert sharded.ids() == sorted(repository.ids())
+
+        keys = _ref_keys(releases[::7]) + [("missing", "1.0")]
+        found = sharded.get_many(keys)
+        assert found[-1] is None
+        assert found[:-1] == [repository[key].freeze() for key in keys[:-1]]
+        assert sharded.get(*keys[0]).thaw().as_dict() == repository[keys[0]].as_dict()
+
+        for release in releases[:20]:
+            query = release["name"].value[:3]
+            for prefix in (False, True):
+                for limit in (None, 5):
+                    assert _keys(sharded.search(query, prefix, limit)) == _ref_keys(
+                        index.search(query, prefix, limit)
+                    )
+
+        plugin_id = releases[0]["id"].value
+        assert _keys(sharded.releases(plugin_id)) == sorted(
+            _ref_keys(repository.releases(plugin_id))
+        )
+        assert sharded.latest(plugin_id) == latest.latest(plugin_id).freeze()
+        assert sharded.latest("missing") is None
+
+        for qgis_version in (None, "3.16", "2.18"):
+            assert _keys(sharded.compatible(qgis_version)) == sorted(
+                _ref_keys(facets.releases(facets.select(qgis_version=qgis_version)))
+            )
+            assert sharded.count(qgis_version, deprecated=False) == facets.count(
+                qgis_version, deprecated=False
+            )
+        assert _keys(sharded.compatible(latest=True)) == _ref_keys(latest.releases())
+        assert sharded.counts("tags") == facets.counts("tags")
+
+        removed = sharded.remove(*keys[0])
+        assert _keys([removed]) == keys[:1]
+        assert sharded.get(*keys[0]) is None
+        with pytest.raises(KeyError):
+            sharded.remove(*keys[0])
+        assert len(sharded) == len(releases) - 1  # still in sync after the error
+
+        sharded.add([repository[keys[0]]])
+        assert sharded.get(*keys[0]) == repository[keys[0]].freeze()
+
+    with pytest.raises(ValueError):
+        len(sharded)
+
+
+def test_shards_txt():
+
+    metadatatxts = [(plugin_id, txt) for plugin_id, _, txt in get_txts()]
+    quarantine = QgsPluginQuarantine()
+    reference = QgsPluginQuarantine()
+    releases = import_metadatatxts(metadatatxts, quarantine=reference)
+    assert len(reference) > 0
+
+    with QgsPluginShardedRepository(2, batch_size=8) as sharded:
+        sharded.add_metadatatxts(metadatatxts, quarantine=quarantine)
+
+        assert len(sharded) == len(releases)
+        assert len(quarantine) == len(reference)
+        assert quarantine.summary() == reference.summary()
+
+        with pytest.raises(QgsBoolValueError):
+            sharded.add_metadatatxts(metadatatxts)  # no quarantine: raises
+        assert len(sharded) == len(releases)
+
+
+def test_shards_fields():
+
+    _, xml = sorted(get_xmls(), key=lambda item: len(item[1]))[-1]
+    releases = import_xml(xml, fields=("name",))
+    metadatatxts = [(plugin_id, txt) for plugin_id, _, txt in get_txts()]
+    quarantine = QgsPluginQuarantine()
+
+    with QgsPluginShardedRepository(2, batch_size=16) as sharded:
+        sharded.add_xml(xml, fields=("name",), quarantine=quarantine)
+
+        assert len(quarantine) == 0
+        assert len(sharded) == len(releases)
+        keys = _ref_keys(releases[::7])
+        assert sharded.get_many(keys) == [release.freeze() for release in releases[::7]]
+        assert all(
+            set(release.keys()) == {"id", "version", "name"}
+            for release in sharded.get_many(keys)
+        )
+        assert sharded.count() == len(releases)
+
+    with QgsPluginShardedRepository(2, batch_size=8) as sharded:
+        sharded.add_metadatatxts(
+            metadatatxts, fields=("qgisMinimumVersion",), quarantine=quarantine
+        )
+
+        assert len(sharded) == len(
+            import_metadatatxts(
+                metadatatxts, fields=("qgisMinimumVersion",), quarantine=quarantine
+            )
+        )
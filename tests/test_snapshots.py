@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_snapshots.py: Multi-snapshot store
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from .lib import get_xmls
+
+from qgspluginmeta import (
+    import_xml,
+    QgsPluginMetadata,
+    QgsPluginMetadataFrozen,
+    QgsPluginSnapshotStore,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_snapshots():
+
+    a1 = QgsPluginMetadata(id="a", version="1.0", name="A")
+    a2 = QgsPluginMetadata(id="a", version="2.0", name="A")
+    b1 = QgsPluginMetadata(id="b", version="1.0", name="B")
+
+    store = QgsPluginSnapshotStore()
+    store.add("3.10", [a1, b1])
+    store.add("3.16", [a2, b1])
+    store.add("3.22", [a2, QgsPluginMetadata(id="b", version="1.0", name="B")])
+
+    assert store.names() == ["3.10", "3.16", "3.22"]
+    assert store.stats() == {"snapshots": 3, "releases": 6, "distinct": 3}
+    assert store.count("3.16") == 2
+    assert [release.as_dict() for release in store.releases("3.10")] == [
+        a1.as_dict(),
+        b1.as_dict(),
+    ]
+    assert all(
+        isinstance(release, QgsPluginMetadataFrozen)
+        for release in store.releases("3.22")
+    )
+    assert store.snapshots_of(b1) == ["3.10", "3.16", "3.22"]
+    assert store.snapshots_of(a2.freeze()) == ["3.16", "3.22"]
+    assert store.snapshots_of(QgsPluginMetadata(id="c", version="1.0")) == []
+
+    store.add("reversed", [b1, a2, a1, b1])  # input order, repeated release once
+    assert [release.as_dict() for release in store.releases("reversed")] == [
+        b1.as_dict(),
+        a2.as_dict(),
+        a1.as_dict(),
+    ]
+    assert store.count("reversed") == 3
+    store.remove("reversed")
+
+    store.remove("3.16")
+    assert "3.16" not in store and len(store) == 2
+    assert store.snapshots_of(b1) == ["3.10", "3.22"]
+    with pytest.raises(KeyError):
+        store.releases("3.16")
+
+
+def test_snapshots_xml():
+
+    feeds = sorted(get_xmls())
+    store = QgsPluginSnapshotStore()
+
+    for name, xml in feeds:
+        store.add_xml(name, xml)
+    store.add_xml("copy", feeds[-1][1])
+
+    stats = store.stats()
+    assert stats["releases"] == sum(store.count(name) for name in store.names())
+    assert stats["distinct"] == len(
+        {release for name in store.names() for release in store.releases(name)}
+    )
+    assert all(
+        copied is original
+        for copied, original in zip(
+            store.releases("copy"), store.releases(feeds[-1][0])
+        )
+    )  # stored once
+
+    for name, xml in feeds:
+        expected = [release.as_dict() for release in import_xml(xml)]
+        assert [r.as_dict() for r in store.releases(name)] == expected  # feed order
+        assert [r.as_dict() for r in import_xml(store.as_xml(name))] == expected
+
+    releases = import_xml(feeds[-1][1])[::-1]
+    store.add("reversed", releases)
+    assert [r.as_dict() for r in import_xml(store.as_xml("reversed"))] == [
+        release.as_dict() for release in releases
+    ]
+    store.remove("reversed")
+
+    release = next(store.releases("copy"))
+    assert store.snapshots_of(release)[-1] == "copy"
+    assert feeds[-1][0] in store.snapshots_of(release)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_sync.py: Incremental refresh against a local stand-in server
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import asyncio
+import os
+
+from .lib import StandInRepo, serve
+
+from qgspluginmeta import QgsPluginMetadata, QgsPluginSync, import_xml
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+async def _sync(base_url, path, interrupt=False):
+
+    feeds = {
+        qgis_version: os.path.join(path, f"plugins_{qgis_version:s}.xml")
+        for qgis_version in ("3.10", "3.14")
+    }
+    releases = {}
+
+    async with QgsPluginSync(
+        os.path.join(path, "state.json"),
+        repo_url=f"{base_url:s}/plugins/plugins.xml",
+        concurrency=1,
+        backoff=0.01,
+    ) as sync:
+        async for _, fn, _ in sync.sync_xml(feeds):
+            with open(fn, "r") as f:
+                for release in import_xml(f.read(), fields=("version", "download_url")):
+                    releases[
+                        os.path.join(
+                            path,
+                            f"metadata_{release['id'].value:s}_{release['version'].value.original:s}.txt",
+                        )
+                    ] = release
+        async for _ in sync.sync_metadatatxt(releases):
+            if interrupt:
+                break
+
+    return sync.stats
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_sync(tmp_path):
+
+    repo = StandInRepo()
+    path = str(tmp_path)
+
+    with serve(repo) as base_url:
+        repo.base_url = base_url
+        stats1 = asyncio.run(_sync(base_url, path, interrupt=True))
+        stats2 = asyncio.run(_sync(base_url, path))
+        requests = len(repo.requests)
+        stats3 = asyncio.run(_sync(base_url, path))
+
+    assert stats1["downloaded"] == 3  # two feeds, interrupted after first release
+    assert stats2["not_modified"] == 2
+    assert stats2["skipped"] == 1
+    assert stats2["downloaded"] == 2
+
+    assert stats3["downloaded"] == 0
+    assert stats3["not_modified"] == 2
+    assert stats3["skipped"] == 3
+    assert stats3["bytes_downloaded"] == 0
+    assert (
+        stats3["bytes_saved"] == stats1["bytes_downloaded"] + stats2["bytes_downloaded"]
+    )
+    assert sorted(path for path in repo.requests[requests:] if "download" in path) == [
+        "/download/broken_plugin/0.1/",
+        "/download/missing_plugin/0.1/",
+    ]  # failed downloads are retried
+
+    fns = sorted(os.listdir(path))
+    assert not any(fn.endswith(".part") for fn in fns)
+    assert fns == [
+        "metadata_flaky_plugin_0.1.txt",
+        "metadata_good_plugin_1.0.txt",
+        "metadata_good_plugin_1.1.txt",
+        "plugins_3.10.xml",
+        "plugins_3.14.xml",
+        "state.json",
+    ]
+
+    meta = QgsPluginMetadata.from_metadatatxt(
+        "good_plugin", open(os.path.join(path, "metadata_good_plugin_1.0.txt")).read()
+    )
+    assert meta["version"].value.original == "1.0"
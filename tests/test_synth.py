@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_synth.py: Synthetic corpus generator
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import io
+import os
+import re
+
+from benchmarks.synth import DEFAULT_PROFILE, generate_txts, generate_xml, make_profile
+
+from qgspluginmeta import import_xml, QgsBoolValueError, QgsPluginMetadata
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+RELEASES = 300
+BROKEN_BOOL = "\nexperimental=maybe\n"
+TXT_FN = r"^metadata_(.+?_[0-9]+)_.+\.txt$"  # plugin ids end in their index
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _profiles():
+
+    return [("default", DEFAULT_PROFILE), ("derived", make_profile())]
+
+
+def _xml(profile, seed):
+
+    f = io.StringIO()
+    generate_xml(f, RELEASES, profile=profile, seed=seed)
+    return f.getvalue().encode("utf-8")
+
+
+def _txts(data_fld, profile, seed):
+
+    generate_txts(data_fld, RELEASES, profile=profile, seed=seed)
+
+    txts = {}
+    for fn in sorted(os.listdir(data_fld)):
+        with open(os.path.join(data_fld, fn), "rb") as f:
+            txts[fn] = f.read()
+    return txts
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.parametrize("name, profile", _profiles())
+def test_synth_xml(name, profile):
+
+    xml = _xml(profile, seed=1)
+
+    assert xml == _xml(profile, seed=1)
+    assert xml != _xml(profile, seed=2)
+
+    releases = import_xml(xml)
+    assert len(releases) == RELEASES
+
+
+@pytest.mark.parametrize("name, profile", _profiles())
+def test_synth_txts(name, profile, tmp_path):
+
+    flds = [tmp_path / "a", tmp_path / "b"]
+    for fld in flds:
+        fld.mkdir()
+
+    txts = _txts(str(flds[0]), profile, seed=1)
+    assert txts == _txts(str(flds[1]), profile, seed=1)
+    assert len(txts) > 0
+
+    for fn, txt in txts.items():
+        plugin_id, txt = re.match(TXT_FN, fn).group(1), txt.decode("utf-8")
+        if BROKEN_BOOL in txt:  # sampled from the corpus on purpose
+            with pytest.raises(QgsBoolValueError):
+                QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+            continue
+        meta = QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+        assert meta["id"].value == plugin_id
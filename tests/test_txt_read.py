@@ -34,6 +34,17 @@ from qgspluginmeta import QgsBoolValueError, QgsPluginMetadata, QgsVersion
 
 import pytest
 
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+BROKEN_BOOL = (
+    ("geometry_paster", "0.1.1"),
+    ("pandora", "2.0.1"),
+    ("qgis-select-by-radius-plus-plugin", "0.1"),
+    ("qgis-select-by-radius-plus-plugin", "0.3"),
+)
+
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # TEST(s)
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -42,12 +53,7 @@ import pytest
 @pytest.mark.parametrize("plugin_id,plugin_version,txt", get_txts())
 def test_txt_read(plugin_id, plugin_version, txt):
 
-    if (plugin_id, plugin_version) in (
-        ("geometry_paster", "0.1.1"),
-        ("pandora", "2.0.1"),
-        ("qgis-select-by-radius-plus-plugin", "0.1"),
-        ("qgis-select-by-radius-plus-plugin", "0.3"),
-    ):
+    if (plugin_id, plugin_version) in BROKEN_BOOL:
         with pytest.raises(QgsBoolValueError):
             meta = QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
         return
@@ -71,3 +77,25 @@ def test_txt_read(plugin_id, plugin_version, txt):
     elif meta2['qgisMaximumVersion'].value_set:
         if meta2['qgisMaximumVersion'].value > QgsVersion.from_qgisversion('3.0.0'):
             assert meta2.required_fields_present()
+
+
+@pytest.mark.parametrize("plugin_id,plugin_version,txt", get_txts())
+def test_txt_read_fields(plugin_id, plugin_version, txt):
+
+    fields = ("version", "qgisMinimumVersion")
+
+    meta = QgsPluginMetadata.from_metadatatxt(plugin_id, txt, fields=fields)
+
+    assert set(meta.keys()) == {"id", *fields}
+    assert meta.required_fields_present()
+
+    if (plugin_id, plugin_version) in BROKEN_BOOL:  # broken, but not in projection
+        return
+
+    assert meta.as_dict() == {
+        key: value
+        for key, value in QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+        .as_dict()
+        .items()
+        if key in meta.keys()
+    }
@@ -28,11 +28,31 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import mmap
+import tempfile
+
 from .lib import get_xmls, get_xml_items
 
-from qgspluginmeta import import_xml, QgsPluginMetadata
+from qgspluginmeta import import_xml, QgsPluginMetadata, QgsPluginRepository, _split_xml
+from qgspluginmeta._core import repo
 
 import pytest
+import xmltodict
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+FIELDS = ("id", "version", "qgisMinimumVersion", "qgisMaximumVersion")
+
+AMPERSANDS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<plugins>
+<pyqgis_plugin name="A & B" version="1.0">
+<description>Q & A &amp; more & & less &amp;&amp; most</description>
+<about>Ümläuts & ß &gt; & </about>
+</pyqgis_plugin>
+</plugins>
+"""
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # TEST(s)
@@ -57,3 +77,79 @@ def test_xml_read(qgis_version, xml):
     releases = import_xml(xml)
 
     assert all((isinstance(release, QgsPluginMetadata) for release in releases))
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_xml_split(qgis_version, xml):
+
+    tree = xmltodict.parse(xml.replace("& ", "&amp; "))
+    release_dicts = tree["plugins"]["pyqgis_plugin"]
+    if not isinstance(release_dicts, list):
+        release_dicts = [release_dicts]
+
+    assert list(_split_xml(xml)) == [
+        dict(release_dict) for release_dict in release_dicts
+    ]
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_xml_read_fields(qgis_version, xml):
+
+    releases = import_xml(xml)
+    releases_projected = import_xml(xml, fields=FIELDS)
+
+    assert len(releases) == len(releases_projected)
+
+    for release, release_projected in zip(releases, releases_projected):
+        assert set(release_projected.keys()) == set(FIELDS)
+        assert release_projected.as_dict() == {
+            key: value for key, value in release.as_dict().items() if key in FIELDS
+        }
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_xml_split_buffers(qgis_version, xml):
+
+    release_dicts = list(_split_xml(xml))
+    xml_bytes = xml.encode("utf-8")
+
+    assert list(_split_xml(xml_bytes)) == release_dicts
+    assert list(_split_xml(bytearray(xml_bytes))) == release_dicts
+    assert list(_split_xml(memoryview(xml_bytes))) == release_dicts
+
+    with tempfile.TemporaryFile() as f:
+        f.write(xml_bytes)
+        f.flush()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            assert list(_split_xml(buffer)) == release_dicts
+            assert len(import_xml(buffer)) == len(release_dicts)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64])
+def test_xml_split_chunks(chunk_size, monkeypatch):
+
+    expected = [
+        dict(
+            xmltodict.parse(AMPERSANDS_XML.replace("& ", "&amp; "))["plugins"][
+                "pyqgis_plugin"
+            ]
+        )
+    ]
+
+    monkeypatch.setattr(repo, "XML_CHUNK_SIZE", chunk_size)
+
+    assert list(_split_xml(AMPERSANDS_XML)) == expected
+    assert list(_split_xml(AMPERSANDS_XML.encode("utf-8"))) == expected
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_xml_read_fields_repository(qgis_version, xml):
+
+    releases = import_xml(xml, fields=("name",))
+    repository = QgsPluginRepository(releases)
+
+    assert len(repository) == len(releases)
+    assert all(set(release.keys()) == {"id", "version", "name"} for release in releases)
+    assert all("file_name" in release.as_xmldict() for release in releases)
+    with pytest.raises(KeyError, match="not projected"):
+        releases[0].is_compatible("3.28")
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_xml_stream.py: Push parser for plugins.xml
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import asyncio
+import random
+
+from .lib import get_xmls
+
+from qgspluginmeta import (
+    import_xml,
+    import_xml_async,
+    QgsPluginXmlParser,
+    _split_xml,
+)
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+ENTITIES_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<plugins>
+<pyqgis_plugin name="A &amp; B" version="1.0">
+<version>1.0</version>
+<file_name>a_b.1.0.zip</file_name>
+<description>Q & A &lt;tag&gt; &#228;&#x00E4; & </description>
+</pyqgis_plugin>
+</plugins>
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _chunks(data, seed, max_size=4096):
+
+    rng = random.Random(seed)
+    offset = 0
+
+    while offset < len(data):
+        size = rng.randint(1, max_size)
+        yield data[offset : offset + size]
+        offset += size
+
+
+def _push(data, seed, **kwargs):
+
+    parser = QgsPluginXmlParser(**kwargs)
+    releases = []
+
+    for chunk in _chunks(data, seed):
+        releases.extend(parser.feed(chunk))
+
+    return releases + parser.close()
+
+
+async def _async_chunks(data, seed):
+
+    for chunk in _chunks(data, seed):
+        await asyncio.sleep(0)
+        yield chunk
+
+
+async def _async_push(data, seed, **kwargs):
+
+    return [
+        release
+        async for release in import_xml_async(_async_chunks(data, seed), **kwargs)
+    ]
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.parametrize("qgis_version,xml", get_xmls())
+def test_xml_stream(qgis_version, xml):
+
+    xml_bytes = xml.encode("utf-8")
+    expected = [release.as_dict() for release in import_xml(xml)]
+
+    assert [release.as_dict() for release in _push(xml_bytes, 0)] == expected
+    assert [release.as_dict() for release in _push(xml, 1)] == expected
+    assert _push(xml_bytes, 2, raw=True) == list(_split_xml(xml))
+    assert _push(xml_bytes, 3, raw=True, fields=("version",)) == list(
+        _split_xml(xml, fields=("version",))
+    )
+
+    releases = asyncio.run(_async_push(xml_bytes, 4))
+    assert [release.as_dict() for release in releases] == expected
+
+
+def test_xml_stream_boundaries():
+
+    xml_bytes = ENTITIES_XML.encode("utf-8")
+    expected = list(_split_xml(xml_bytes))
+
+    assert expected[0]["@name"] == "A & B"
+    assert expected[0]["description"] == "Q & A <tag> ää &"
+
+    for size in range(1, len(xml_bytes) + 1):
+        parser = QgsPluginXmlParser(raw=True)
+        releases = []
+        for offset in range(0, len(xml_bytes), size):
+            releases.extend(parser.feed(xml_bytes[offset : offset + size]))
+        assert releases + parser.close() == expected
+
+
+def test_xml_stream_closed():
+
+    parser = QgsPluginXmlParser()
+    parser.feed(b"<plugins></plugins>")
+
+    assert parser.close() == []
+    with pytest.raises(ValueError):
+        parser.feed(b"")
+    with pytest.raises(ValueError):
+        parser.close()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_zip_read.py: Read metadata txt files from plugin zip files
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import io
+import mmap
+import zipfile
+
+from .lib import get_txts, make_zip
+
+from qgspluginmeta import QgsPluginMetadata
+
+import pytest
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+TXT = """[general]
+name=Some Plugin
+qgisMinimumVersion=3.0
+description=Does things
+about=Does things, really
+version=1.0
+author=Someone
+email=someone@example.org
+repository=https://example.org
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class CountingFile(io.FileIO):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bytes_read = 0
+
+    def readinto(self, b):
+        n = super().readinto(b)
+        self.bytes_read += n
+        return n
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.mark.parametrize("plugin_id,plugin_version,txt", get_txts())
+def test_zip_read(plugin_id, plugin_version, txt, tmp_path):
+
+    path = make_zip(str(tmp_path / "plugin.zip"), plugin_id, txt)
+
+    try:
+        meta_txt = QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+    except ValueError as e:
+        with pytest.raises(type(e)):
+            QgsPluginMetadata.from_zipfile(path)
+        return
+
+    meta_zip = QgsPluginMetadata.from_zipfile(path)
+
+    assert repr(meta_zip) == f'<QgsPluginMetadata id="{plugin_id:s}">'
+    assert meta_zip.as_dict() == meta_txt.as_dict()
+
+
+def test_zip_read_sources(tmp_path):
+
+    path = make_zip(str(tmp_path / "plugin.zip"), "some_plugin", TXT)
+
+    with open(path, "rb") as f:
+        data = f.read()
+        f.seek(0)
+        metas = [
+            QgsPluginMetadata.from_zipfile(path),
+            QgsPluginMetadata.from_zipfile(f),
+            QgsPluginMetadata.from_zipfile(data),
+            QgsPluginMetadata.from_zipfile(memoryview(data)),
+        ]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            metas.append(QgsPluginMetadata.from_zipfile(m))
+
+    assert all(meta.as_dict() == metas[0].as_dict() for meta in metas)
+    assert metas[0]["id"].value == "some_plugin"
+
+
+def test_zip_read_partial(tmp_path):
+
+    payload_size = 2**22
+    path = make_zip(
+        str(tmp_path / "plugin.zip"), "some_plugin", TXT, payload_size=payload_size
+    )
+
+    with CountingFile(path, "r") as f:
+        meta = QgsPluginMetadata.from_zipfile(f)
+        assert f.bytes_read < payload_size // 100
+
+    assert meta["id"].value == "some_plugin"
+
+
+def test_zip_read_plugin_id(tmp_path):
+
+    path = make_zip(str(tmp_path / "plugin.zip"), "some_plugin", TXT)
+
+    meta = QgsPluginMetadata.from_zipfile(path, plugin_id="some_plugin")
+    assert meta["id"].value == "some_plugin"
+
+    with pytest.raises(KeyError):
+        QgsPluginMetadata.from_zipfile(path, plugin_id="other_plugin")
+
+
+def test_zip_read_missing(tmp_path):
+
+    path = str(tmp_path / "plugin.zip")
+    with zipfile.ZipFile(path, "w") as fz:
+        fz.writestr("some_plugin/__init__.py", "")
+
+    with pytest.raises(KeyError):
+        QgsPluginMetadata.from_zipfile(path)
+
+
+def test_zip_read_encoding(tmp_path):
+
+    path = str(tmp_path / "plugin.zip")
+    with zipfile.ZipFile(path, "w") as fz:
+        fz.writestr(
+            "some_plugin/metadata.txt",
+            TXT.replace("Someone", "S\xf6me").encode("latin-1"),
+        )
+
+    with pytest.raises(ValueError, match="some_plugin/metadata.txt") as e:
+        QgsPluginMetadata.from_zipfile(path)
+    assert not isinstance(e.value, UnicodeDecodeError)
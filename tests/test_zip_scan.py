@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+QGIS Plugin Meta
+Handling metadata from QGIS plugins
+https://github.com/qgist/QGIS-Plugin-Meta
+
+    tests/test_zip_scan.py: Scan folders of plugin zip files
+
+    Copyright (C) 2020 QGIST project <info@qgist.org>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the GNU General Public License
+Version 2 ("GPL" or "License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://www.gnu.org/licenses/old-licenses/gpl-2.0.txt
+https://github.com/qgist/QGIS-Plugin-Meta/blob/master/LICENSE
+
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import os
+
+from .lib import get_txts, make_zip
+
+from qgspluginmeta import QgsBoolValueError, QgsPluginMetadata, QgsPluginZipScanner
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# HELPER
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _make_mirror(path):
+
+    expected, broken = {}, set()
+
+    for index, (plugin_id, plugin_version, txt) in enumerate(get_txts()):
+        folder = os.path.join(path, plugin_id[0].lower())
+        os.makedirs(folder, exist_ok=True)
+        zip_fn = make_zip(
+            os.path.join(folder, f"{plugin_id:s}.{index:d}.zip"), plugin_id, txt
+        )
+        try:
+            expected[zip_fn] = QgsPluginMetadata.from_metadatatxt(plugin_id, txt)
+        except QgsBoolValueError:
+            broken.add(zip_fn)
+
+    return expected, broken
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# TEST(s)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_zip_scan(tmp_path):
+
+    mirror = str(tmp_path / "mirror")
+    expected, broken = _make_mirror(mirror)
+
+    scanner = QgsPluginZipScanner(mirror, workers=2, max_pending=3)
+    results = dict(scanner.scan())
+
+    assert set(results.keys()) == set(expected.keys())
+    assert all(
+        results[zip_fn].as_dict() == meta.as_dict() for zip_fn, meta in expected.items()
+    )
+    assert set(scanner.errors.keys()) == broken
+    assert all(isinstance(e, QgsBoolValueError) for e in scanner.errors.values())
+    assert len(scanner.skipped) == 0
+
+
+def test_zip_scan_manifest(tmp_path):
+
+    mirror = str(tmp_path / "mirror")
+    manifest_fn = str(tmp_path / "manifest.json")
+    expected, broken = _make_mirror(mirror)
+
+    scanner = QgsPluginZipScanner(mirror, manifest_fn=manifest_fn, workers=2)
+
+    assert len(list(scanner.scan())) == len(expected)
+    assert len(list(scanner.scan())) == 0
+    assert set(scanner.skipped) == set(expected.keys())
+    assert set(scanner.errors.keys()) == broken  # errors are retried
+
+    touched_fn, changed_fn = sorted(expected.keys())[:2]
+    os.utime(touched_fn, ns=(0, 0))  # same content, different mtime
+    make_zip(changed_fn, "changed_plugin", "[general]\nversion=1.0\n")
+
+    results = dict(scanner.scan())
+
+    assert set(results.keys()) == {changed_fn}
+    assert results[changed_fn]["id"].value == "changed_plugin"
+    assert touched_fn in scanner.skipped